@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Callable, Iterable
 
 from .labels import Label, Lattice, join_labels, make_label
-from .llm import BaseLLM, LLMResponse
+from .llm import BaseLLM, LLMResponse, LLMStream
+from .llm_resilience import LLMCallError
 from .policy import Policy
 from .tools import AgentTools, RetrieveResult
 
@@ -16,6 +19,14 @@ class AgentResult:
     audit: dict[str, object] | None = None
 
 
+class AgentRunError(RuntimeError):
+    """A run whose LLM call failed; `audit` holds what was recorded up to the failure."""
+
+    def __init__(self, message: str, audit: dict[str, object]) -> None:
+        super().__init__(message)
+        self.audit = audit
+
+
 class WebAgent:
     def __init__(
         self,
@@ -35,7 +46,20 @@ class WebAgent:
         user_label: Label,
         urls: Iterable[str],
         scrape_label: Label | None = None,
+        on_text: Callable[[str], None] | None = None,
     ) -> AgentResult:
+        """
+        Scrape `urls`, retrieve what `user_label` may see and answer the prompt.
+
+        With `on_text`, the answer is streamed: chunks are passed to `on_text`
+        as they arrive, but only after the response label has passed the
+        user-output check. Time to first token and throughput are recorded
+        under `llm_stream` in the audit.
+
+        A failed LLM call raises `AgentRunError` (the backend's error is its
+        `__cause__`) with the audit so far, including `llm_elapsed_ms`,
+        `llm_counters` and an `llm_error` entry.
+        """
         audit: dict[str, object] = {
             "user_prompt": user_prompt,
             "user_label": str(user_label),
@@ -45,10 +69,21 @@ class WebAgent:
         scrape_label = scrape_label or make_label(user_label.level, user_label.categories)
         audit["scrape_label"] = str(scrape_label)
 
-        self._tools.scrape_parse_store(
+        batch = self._tools.scrape_parse_store_batch(
             urls=audit["input_urls"],
             scrape_label=scrape_label,
         )
+        # Failed URLs are skipped; the rest of the batch is still answered.
+        audit["scrape_errors"] = [{"url": item.url, "error": item.error} for item in batch.errors]
+        audit["fetch_tiers"] = {item.url: item.fetch_tier for item in batch.stored}
+        audit["scrape_counts"] = batch.scrape_counts
+        audit["open_circuits"] = batch.open_circuits
+        audit["pipeline_stages"] = batch.stage_stats
+        audit["page_loads"] = {
+            item.url: {"load_ms": item.load_ms, "bytes_transferred": item.bytes_transferred}
+            for item in batch.stored
+            if item.load_ms is not None
+        }
 
         retrieved: RetrieveResult = self._tools.retrieve_by_query(
             query=user_prompt,
@@ -86,11 +121,57 @@ class WebAgent:
             }
             if not decision.allowed:
                 raise PermissionError(decision.reason)
-        llm_response: LLMResponse = self._llm.generate(summary_prompt, combined_label)
+        counters_before = Counter(self._llm.counters())
+        if on_text is not None:
+            started = time.perf_counter()
+            try:
+                stream = self._llm.generate_stream(summary_prompt, combined_label)
+            except Exception as e:
+                raise self._llm_failure(e, started, counters_before, audit) from e
+            audit["llm_backend"] = self._llm.name
+            # Outside the guarded calls: a denied label is a policy decision,
+            # not an LLM failure.
+            self._check_user_output(stream.label, audit)
+            try:
+                text = self._relay(stream, on_text, started, audit)
+            except Exception as e:
+                raise self._llm_failure(e, started, counters_before, audit) from e
+            audit["llm_elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            audit["llm_counters"] = dict(self._llm.counters() - counters_before)
+            return AgentResult(text=text, label=stream.label, audit=audit)
+
+        started = time.perf_counter()
+        try:
+            llm_response: LLMResponse = self._llm.generate(summary_prompt, combined_label)
+        except Exception as e:
+            raise self._llm_failure(e, started, counters_before, audit) from e
         audit["llm_backend"] = self._llm.name
-        audit["llm_response_label"] = str(llm_response.label)
+        audit["llm_elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        # Events of this call only, such as cache hits and misses.
+        audit["llm_counters"] = dict(self._llm.counters() - counters_before)
+        self._check_user_output(llm_response.label, audit)
+
+        return AgentResult(text=llm_response.text, label=llm_response.label, audit=audit)
 
-        decision = self._policy.can_send_to_user(llm_response.label)
+    def _llm_failure(
+        self,
+        error: Exception,
+        started: float,
+        counters_before: Counter[str],
+        audit: dict[str, object],
+    ) -> AgentRunError:
+        audit["llm_backend"] = self._llm.name
+        audit["llm_elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        audit["llm_counters"] = dict(self._llm.counters() - counters_before)
+        failure: dict[str, object] = {"error": str(error)}
+        if isinstance(error, LLMCallError):
+            failure.update(kind=error.kind, attempts=error.attempts, elapsed_s=round(error.elapsed_s, 3))
+        audit["llm_error"] = failure
+        return AgentRunError(str(error), audit)
+
+    def _check_user_output(self, response_label: Label, audit: dict[str, object]) -> None:
+        audit["llm_response_label"] = str(response_label)
+        decision = self._policy.can_send_to_user(response_label)
         audit["user_output_decision"] = {
             "allowed": decision.allowed,
             "reason": decision.reason,
@@ -98,7 +179,30 @@ class WebAgent:
         if not decision.allowed:
             raise PermissionError(decision.reason)
 
-        return AgentResult(text=llm_response.text, label=llm_response.label, audit=audit)
+    @staticmethod
+    def _relay(
+        stream: LLMStream,
+        on_text: Callable[[str], None],
+        started: float,
+        audit: dict[str, object],
+    ) -> str:
+        parts: list[str] = []
+        first_at: float | None = None
+        for chunk in stream:
+            if first_at is None:
+                first_at = time.perf_counter()
+            parts.append(chunk)
+            on_text(chunk)
+        finished = time.perf_counter()
+        # Throughput counts from the first token, so it excludes queueing and prompt evaluation.
+        decode_s = finished - first_at if first_at is not None else 0.0
+        audit["llm_stream"] = {
+            "ttft_ms": round((first_at - started) * 1000, 1) if first_at is not None else None,
+            "total_ms": round((finished - started) * 1000, 1),
+            "tokens": stream.tokens,
+            "tokens_per_s": round(stream.tokens / decode_s, 1) if decode_s > 0 else None,
+        }
+        return "".join(parts)
 
     @staticmethod
     def _build_prompt(user_prompt: str, retrieved: RetrieveResult) -> str:
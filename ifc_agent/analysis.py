@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from hashlib import sha256
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def content_hash(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+def tokenize(normalized: str) -> list[str]:
+    """Split already-lowercased text into the alphanumeric terms used for ranking."""
+    return _TOKEN.findall(normalized)
+
+
+@dataclass(frozen=True)
+class AnalyzedText:
+    """
+    One analysis pass over a document's clean text, shared by ingest stages.
+
+    Trust scoring scans `normalized`, the cache key and dedup use
+    `content_hash`, and retrieval ranks against `terms`, so no stage lowercases,
+    tokenizes or hashes the same text again. `length` is the number of terms.
+    """
+
+    normalized: str
+    content_hash: str
+    terms: dict[str, int]
+    length: int
+
+    @classmethod
+    def from_text(cls, text: str) -> "AnalyzedText":
+        normalized = text.lower()
+        # Interned terms are shared across documents instead of duplicated.
+        terms = Counter(map(sys.intern, tokenize(normalized)))
+        return cls(
+            normalized=normalized,
+            content_hash=content_hash(text),
+            terms=dict(terms),
+            length=sum(terms.values()),
+        )
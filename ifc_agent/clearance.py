@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+from .labels import Label, Lattice
+from .policy import Policy
+
+try:
+    # NumPy is optional; without it the index falls back to integer bitmasks.
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - depends on environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class ClearanceIndex:
+    """
+    Column view of document labels for bulk flow checks.
+
+    Levels are kept as lattice indices and categories as a boolean matrix, so
+    the flow mask for a target label is a single array expression instead of a
+    `Lattice.can_flow` call per document. Masks are NumPy bool arrays when
+    NumPy is installed and plain lists of bools otherwise.
+    """
+
+    def __init__(
+        self,
+        lattice: Lattice,
+        document_ids: Iterable[str],
+        labels: Iterable[Label],
+    ) -> None:
+        self._lattice = lattice
+        self._document_ids = list(document_ids)
+        label_list = list(labels)
+        if len(label_list) != len(self._document_ids):
+            raise ValueError("document_ids and labels must have the same length.")
+
+        level_index = {level: idx for idx, level in enumerate(lattice.levels)}
+        self._category_order = sorted({cat for label in label_list for cat in label.categories})
+        category_bit = {cat: idx for idx, cat in enumerate(self._category_order)}
+        level_ids = [level_index[label.level] for label in label_list]
+
+        if np is not None:
+            self._levels = np.asarray(level_ids, dtype=np.intp)
+            matrix = np.zeros((len(label_list), len(self._category_order)), dtype=bool)
+            for row, label in enumerate(label_list):
+                for cat in label.categories:
+                    matrix[row, category_bit[cat]] = True
+            self._categories = matrix
+        else:
+            self._levels = level_ids
+            self._categories = [
+                sum(1 << category_bit[cat] for cat in label.categories)
+                for label in label_list
+            ]
+
+    @classmethod
+    def from_assessments(cls, lattice: Lattice, assessments: Iterable) -> "ClearanceIndex":
+        items = list(assessments)
+        return cls(
+            lattice,
+            [item.document_id for item in items],
+            [item.label for item in items],
+        )
+
+    @property
+    def document_ids(self) -> tuple[str, ...]:
+        return tuple(self._document_ids)
+
+    def __len__(self) -> int:
+        return len(self._document_ids)
+
+    def flow_mask(self, target: Label) -> Sequence[bool]:
+        # Which levels flow into the target is a per-level question, so it is
+        # answered once per lattice level and then broadcast over documents.
+        allowed_levels = [
+            self._lattice.level_flows(level, target.level) for level in self._lattice.levels
+        ]
+        if np is not None:
+            level_ok = np.asarray(allowed_levels, dtype=bool)[self._levels]
+            outside = np.asarray(
+                [cat not in target.categories for cat in self._category_order],
+                dtype=bool,
+            )
+            return level_ok & ~self._categories[:, outside].any(axis=1)
+
+        outside_bits = 0
+        for bit, cat in enumerate(self._category_order):
+            if cat not in target.categories:
+                outside_bits |= 1 << bit
+        return [
+            allowed_levels[level] and not (bits & outside_bits)
+            for level, bits in zip(self._levels, self._categories)
+        ]
+
+    def flow_mask_any(self, targets: Iterable[Label]) -> Sequence[bool]:
+        combined: Sequence[bool] | None = None
+        for target in targets:
+            mask = self.flow_mask(target)
+            if combined is None:
+                combined = mask
+            elif np is not None:
+                combined = combined | mask
+            else:
+                combined = [a or b for a, b in zip(combined, mask)]
+        if combined is None:
+            return np.zeros(len(self), dtype=bool) if np is not None else [False] * len(self)
+        return combined
+
+    def external_llm_mask(self, policy: Policy) -> Sequence[bool]:
+        return self.flow_mask_any(policy.external_llm_allowed)
+
+    def user_output_mask(self, policy: Policy) -> Sequence[bool]:
+        return self.flow_mask(policy.user_output_max)
+
+    def select(self, mask: Sequence[bool]) -> set[str]:
+        return {doc_id for doc_id, keep in zip(self._document_ids, mask) if keep}
+
+    def ids_flowing_to(self, target: Label) -> set[str]:
+        return self.select(self.flow_mask(target))
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import posixpath
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+from .labels import Label, Lattice, join_labels, label_from_json, label_to_json
+from .scraper import ScrapeOutcome
+from .tools import AgentTools, ScrapeStoreResult
+
+_CRAWL_SCHEMES = frozenset({"http", "https", "file"})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str | None:
+    """
+    Canonical form of a crawlable URL, or None for other schemes.
+
+    Scheme and host are lowercased, default ports, credentials and fragments
+    are dropped, and an empty path becomes "/". The query is kept as is.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in _CRAWL_SCHEMES:
+        return None
+    host = (parts.hostname or "").rstrip(".")
+    if scheme != "file" and not host:
+        return None
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = f"[{host}]" if ":" in host else host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def url_host(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def _file_path(url: str) -> str | None:
+    """Normalized local path of a file:// URL, or None for other schemes."""
+    parts = urlsplit(url)
+    if parts.scheme != "file":
+        return None
+    return posixpath.normpath(unquote(parts.path) or "/")
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with no false negatives.
+
+    Sized for `capacity` items at about `error_rate` false positives, using
+    double hashing over one BLAKE2b digest per item.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter needs a positive capacity and an error rate in (0, 1).")
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def add(self, item: str) -> bool:
+        """Add `item`; returns False if it was (probably) already present."""
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        self._count += added
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return ((first + idx * step) % self._size for idx in range(self._hashes))
+
+
+@dataclass(frozen=True)
+class FrontierEntry:
+    url: str
+    depth: int
+    # Label of the page the link was found on; None for seeds.
+    label: Label | None = None
+
+
+class CrawlFrontier:
+    """
+    Crawl queue persisted as an append-only JSONL journal.
+
+    Entries come out shallowest first (BFS), in the order they were queued.
+    Every queued URL is remembered in a Bloom-filter seen-set, so no URL is
+    queued twice; a false positive may skip a URL. Opening an existing journal
+    replays it, so an interrupted crawl resumes: URLs that were taken but not
+    marked done are handed out again.
+    """
+
+    def __init__(self, path: str | Path, seen_capacity: int = 100_000, seen_error_rate: float = 0.001) -> None:
+        self.path = Path(path)
+        self._seen = BloomFilter(seen_capacity, seen_error_rate)
+        self._heap: list[tuple[int, int, str]] = []
+        self._pending: dict[str, FrontierEntry] = {}
+        self._taken: set[str] = set()
+        self._seq = 0
+        self.pages_done = 0
+        self.seed_hosts: set[str] = set()
+        # Directories of file:// seeds; local links never leave them.
+        self.seed_dirs: set[str] = set()
+        if self.path.exists():
+            self._replay()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._journal = self.path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> "CrawlFrontier":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._journal.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, url: str, depth: int, label: Label | None = None) -> bool:
+        """Queue `url` unless it was seen before; returns whether it was queued."""
+        if not self._seen.add(url):
+            return False
+        entry = FrontierEntry(url=url, depth=depth, label=label)
+        self._enqueue(entry)
+        self._write({"event": "push", "url": url, "depth": depth, "label": label_to_json(label) if label is not None else None})
+        return True
+
+    def take(
+        self,
+        limit: int,
+        ready: Callable[[str], bool] = lambda host: True,
+        per_host: int = 1,
+    ) -> list[FrontierEntry]:
+        """
+        Up to `limit` entries, at most `per_host` per host, skipping hosts for
+        which `ready(host)` is false. Skipped entries keep their place.
+        """
+        taken: list[FrontierEntry] = []
+        skipped: list[tuple[int, int, str]] = []
+        per_host_taken: dict[str, int] = {}
+        while self._heap and len(taken) < limit:
+            item = heapq.heappop(self._heap)
+            entry = self._pending.get(item[2])
+            if entry is None or entry.url in self._taken:
+                continue
+            host = url_host(entry.url)
+            if per_host_taken.get(host, 0) >= per_host or not ready(host):
+                skipped.append(item)
+                continue
+            per_host_taken[host] = per_host_taken.get(host, 0) + 1
+            self._taken.add(entry.url)
+            taken.append(entry)
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return taken
+
+    def in_seed_scope(self, url: str, same_host_only: bool = True) -> bool:
+        """
+        Whether a link may be queued: file:// URLs must lie under a seed
+        directory, other URLs on a seed host when `same_host_only` is set.
+        """
+        path = _file_path(url)
+        if path is not None:
+            return any(path.startswith(directory) for directory in self.seed_dirs)
+        return not same_host_only or url_host(url) in self.seed_hosts
+
+    def waiting_hosts(self) -> set[str]:
+        return {url_host(url) for url in self._pending if url not in self._taken}
+
+    def mark_done(self, url: str, ok: bool) -> None:
+        if self._pending.pop(url, None) is None:
+            return
+        self._taken.discard(url)
+        self.pages_done += 1
+        self._write({"event": "done", "url": url, "ok": ok})
+
+    def _enqueue(self, entry: FrontierEntry) -> None:
+        self._pending[entry.url] = entry
+        heapq.heappush(self._heap, (entry.depth, self._seq, entry.url))
+        self._seq += 1
+        if entry.depth == 0:
+            path = _file_path(entry.url)
+            if path is None:
+                self.seed_hosts.add(url_host(entry.url))
+            else:
+                self.seed_dirs.add(posixpath.join(posixpath.dirname(path), ""))
+
+    def _write(self, event: dict) -> None:
+        # One flushed line per event, so a crash loses at most the last one.
+        self._journal.write(json.dumps(event) + "\n")
+        self._journal.flush()
+
+    def _replay(self) -> None:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted write.
+                    continue
+                if event.get("event") == "push":
+                    self._seen.add(event["url"])
+                    label = label_from_json(event["label"]) if event.get("label") else None
+                    self._enqueue(FrontierEntry(event["url"], int(event["depth"]), label))
+                elif event.get("event") == "done" and self._pending.pop(event["url"], None) is not None:
+                    self.pages_done += 1
+
+
+@dataclass(frozen=True)
+class CrawlReport:
+    stored: list[ScrapeStoreResult]
+    errors: list[ScrapeOutcome]
+    # URLs still queued when the crawl stopped (budget reached or interrupted).
+    remaining: int
+
+
+class Crawler:
+    """
+    Breadth-first crawl that feeds `AgentTools.scrape_parse_store_batch`.
+
+    Links are followed up to `max_depth` hops from the seeds and at most
+    `max_pages` pages are fetched over the life of the frontier, including
+    earlier runs. With `same_host_only`, only links to seed hosts are queued.
+    file:// links are always limited to the directories of file:// seeds, so
+    a page cannot pull in arbitrary local files.
+    Each host is fetched at most once per `host_delay_seconds`; with no delay,
+    up to `batch_size` pages of one host go into a batch.
+
+    A page found through a link is scraped with the label of the page that
+    linked to it joined into the scrape label, since choosing to fetch it
+    depends on that page's content.
+    """
+
+    def __init__(
+        self,
+        tools: AgentTools,
+        frontier: CrawlFrontier,
+        lattice: Lattice,
+        max_depth: int = 2,
+        max_pages: int = 100,
+        host_delay_seconds: float = 1.0,
+        same_host_only: bool = True,
+        batch_size: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._tools = tools
+        self._frontier = frontier
+        self._lattice = lattice
+        self._max_depth = max_depth
+        self._max_pages = max_pages
+        self._host_delay = host_delay_seconds
+        self._same_host_only = same_host_only
+        self._batch_size = batch_size
+        self._clock = clock
+        self._sleep = sleep
+        self._next_allowed: dict[str, float] = {}
+
+    def crawl(self, seeds: Iterable[str] = (), scrape_label: Label | None = None) -> CrawlReport:
+        for seed in seeds:
+            url = normalize_url(seed)
+            if url is not None:
+                self._frontier.push(url, 0)
+
+        stored: list[ScrapeStoreResult] = []
+        errors: list[ScrapeOutcome] = []
+        per_host = 1 if self._host_delay > 0 else self._batch_size
+        while len(self._frontier) and self._frontier.pages_done < self._max_pages:
+            now = self._clock()
+            limit = min(self._batch_size, self._max_pages - self._frontier.pages_done)
+            entries = self._frontier.take(limit, lambda host: self._next_allowed.get(host, now) <= now, per_host)
+            if not entries:
+                waits = [self._next_allowed.get(host, now) - now for host in self._frontier.waiting_hosts()]
+                self._sleep(max(0.0, min(waits, default=0.0)))
+                continue
+            for entry in entries:
+                self._next_allowed[url_host(entry.url)] = now + self._host_delay
+
+            for label, group in self._group_by_label(entries, scrape_label).items():
+                batch = self._tools.scrape_parse_store_batch(
+                    [entry.url for entry in group],
+                    scrape_label=label,
+                    collect_links=True,
+                )
+                depths = {entry.url: entry.depth for entry in group}
+                for result in batch.stored:
+                    self._frontier.mark_done(result.url, ok=True)
+                    if depths[result.url] < self._max_depth:
+                        self._queue_links(result, depths[result.url] + 1)
+                for outcome in batch.errors:
+                    self._frontier.mark_done(outcome.url, ok=False)
+                stored.extend(batch.stored)
+                errors.extend(batch.errors)
+        return CrawlReport(stored=stored, errors=errors, remaining=len(self._frontier))
+
+    def _group_by_label(
+        self,
+        entries: list[FrontierEntry],
+        scrape_label: Label | None,
+    ) -> dict[Label | None, list[FrontierEntry]]:
+        groups: dict[Label | None, list[FrontierEntry]] = {}
+        for entry in entries:
+            floors = [label for label in (scrape_label, entry.label) if label is not None]
+            label = join_labels(self._lattice, floors) if floors else None
+            groups.setdefault(label, []).append(entry)
+        return groups
+
+    def _queue_links(self, result: ScrapeStoreResult, depth: int) -> None:
+        for link in result.links:
+            url = normalize_url(link)
+            if url is None:
+                continue
+            if not self._frontier.in_seed_scope(url, self._same_host_only):
+                continue
+            self._frontier.push(url, depth, label=result.label)
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import codecs
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import BinaryIO
+from urllib.parse import urldefrag, urljoin
+
+TRUNCATION_MARKER = "[... truncated ...]"
+DEFAULT_CHUNK_SIZE = 1 << 16
+BOILERPLATE_TOKENS = frozenset({"cookie", "privacy", "terms", "subscribe", "advertisement", "login"})
+
+# Content of these elements is never user-visible text.
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "head", "svg"})
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+        "figcaption", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+        "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "td", "th",
+        "tr", "ul",
+    }
+)
+_INLINE_WHITESPACE = re.compile(r"[^\S\n]+")
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+# Containers whose text is navigation or chrome rather than page content.
+_BOILERPLATE_CONTAINERS = frozenset({"nav", "footer", "aside", "form"})
+# Matched against whole id/class/role tokens, so layout wrappers such as
+# "has-sidebar" or "social-share-enabled" do not count.
+_BOILERPLATE_HINT = re.compile(
+    r"(?:(?:site|main|top|page)[-_])?"
+    r"(?:nav|navbar|navigation|menu|footer|sidebar|breadcrumbs?|banner|contentinfo|complementary"
+    r"|cookies?(?:[-_](?:banner|notice|consent|bar))?|consent|subscribe|newsletter|advert|ads?|promo"
+    r"|social|share|sharing)",
+    re.IGNORECASE,
+)
+_MAX_LINK_DENSITY = 0.5
+_MAX_BOILERPLATE_WORD_SHARE = 0.4
+# A flagged container holding more than this share of the page text is the
+# main block, not boilerplate around it.
+_MAIN_BLOCK_SHARE = 0.5
+
+
+@dataclass(frozen=True)
+class ExtractedPage:
+    raw_html: str
+    clean_text: str
+    bytes_read: int
+    truncated: bool
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "body":
+            # Tolerate pages that never close <head>.
+            self._skip_depth = 0
+        elif tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+@dataclass(frozen=True)
+class MainContent:
+    text: str
+    removed_ratio: float
+
+
+@dataclass(frozen=True)
+class _Block:
+    text: str
+    link_chars: int
+    containers: tuple[int, ...]
+
+
+class _BlockCollector(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[_Block] = []
+        self.container_count = 0
+        self._stack: list[tuple[str, int | None]] = []
+        self._open_containers: list[int] = []
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._parts: list[str] = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "body":
+            self._skip_depth = 0
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "a":
+            self._link_depth += 1
+        if tag in _BLOCK_TAGS or tag in _BOILERPLATE_CONTAINERS:
+            self._flush()
+        if tag in _VOID_TAGS:
+            return
+        tokens = " ".join(value or "" for name, value in attrs if name in ("id", "class", "role")).split()
+        container = None
+        if tag in _BOILERPLATE_CONTAINERS or any(_BOILERPLATE_HINT.fullmatch(token) for token in tokens):
+            self._flush()
+            container = self.container_count
+            self.container_count += 1
+            self._open_containers.append(container)
+        self._stack.append((tag, container))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+        if tag in _BLOCK_TAGS or tag in _BOILERPLATE_CONTAINERS:
+            self._flush()
+        # Close the nearest matching open tag, tolerating unclosed children.
+        for idx in range(len(self._stack) - 1, -1, -1):
+            if self._stack[idx][0] == tag:
+                closing = self._stack[idx:]
+                del self._stack[idx:]
+                closed = {container for _, container in closing if container is not None}
+                if closed:
+                    self._flush()
+                    self._open_containers = [c for c in self._open_containers if c not in closed]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._parts.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._parts).split())
+        if text:
+            self.blocks.append(_Block(text, self._link_chars, tuple(self._open_containers)))
+        self._parts = []
+        self._link_chars = 0
+
+
+class _LinkCollector(HTMLParser):
+    def __init__(self, base_url: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        values = dict(attrs)
+        if tag == "base" and values.get("href"):
+            self.base_url = urljoin(self.base_url, values["href"].strip())
+        elif tag in ("a", "area") and values.get("href"):
+            if "nofollow" not in (values.get("rel") or "").lower().split():
+                self.hrefs.append(values["href"].strip())
+
+
+def extract_links(raw_html: str, base_url: str) -> list[str]:
+    """
+    Absolute targets of the page's `<a>`/`<area>` links, in page order.
+
+    Relative links resolve against `<base href>` when present, fragments are
+    dropped, duplicates are kept once and `rel="nofollow"` links are skipped.
+    """
+    collector = _LinkCollector(base_url)
+    collector.feed(raw_html)
+    collector.close()
+    links: dict[str, None] = {}
+    for href in collector.hrefs:
+        links.setdefault(urldefrag(urljoin(collector.base_url, href)).url, None)
+    return list(links)
+
+
+def _main_containers(blocks: list[_Block], container_count: int) -> set[int]:
+    chars = [0] * container_count
+    total = 0
+    for block in blocks:
+        total += len(block.text)
+        for container in block.containers:
+            chars[container] += len(block.text)
+    return {idx for idx, size in enumerate(chars) if total and size / total > _MAIN_BLOCK_SHARE}
+
+
+def _is_boilerplate_block(block: _Block, main: set[int]) -> bool:
+    if any(container not in main for container in block.containers):
+        return True
+    if block.link_chars / len(block.text) > _MAX_LINK_DENSITY:
+        return True
+    words = block.text.split()
+    tokens = sum(1 for word in words if word.lower().strip(".,:;!?()[]{}") in BOILERPLATE_TOKENS)
+    return tokens / len(words) >= _MAX_BOILERPLATE_WORD_SHARE
+
+
+def extract_main_content(raw_html: str) -> MainContent:
+    """
+    Keep the main text of a page by dropping boilerplate blocks.
+
+    A block is dropped when it sits in navigation-like containers (`nav`,
+    `footer`, `aside`, `form`, or an id/class token such as "cookie-banner"),
+    when most of its text is link text, or when a large share of its words
+    are boilerplate tokens. A container holding most of the page text is the
+    main block and is never dropped as a whole. `removed_ratio` is the dropped
+    share of block text.
+    """
+    collector = _BlockCollector()
+    collector.feed(raw_html)
+    collector.close()
+    main = _main_containers(collector.blocks, collector.container_count)
+    kept: list[str] = []
+    total = removed = 0
+    for block in collector.blocks:
+        total += len(block.text)
+        if _is_boilerplate_block(block, main):
+            removed += len(block.text)
+        else:
+            kept.append(block.text)
+    return MainContent(
+        text="\n".join(kept),
+        removed_ratio=removed / total if total else 0.0,
+    )
+
+
+class StreamingTextExtractor:
+    """
+    Incremental HTML-to-text extraction with an input byte cap.
+
+    Chunks are fed to a stdlib `HTMLParser` as they arrive, so only the text
+    and the capped HTML are retained. Once `max_bytes` of input has been
+    consumed, further input is ignored and the text ends with
+    `TRUNCATION_MARKER`.
+    """
+
+    def __init__(self, max_bytes: int | None = None, keep_html: bool = True) -> None:
+        self._max_bytes = max_bytes
+        self._keep_html = keep_html
+        self._collector = _TextCollector()
+        self._html_parts: list[str] = []
+        self.bytes_read = 0
+        self.truncated = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; returns False once the byte cap has been reached."""
+        if self.truncated:
+            return False
+        size = len(chunk.encode("utf-8"))
+        if self._max_bytes is not None and self.bytes_read + size > self._max_bytes:
+            remaining = self._max_bytes - self.bytes_read
+            chunk = chunk.encode("utf-8")[:remaining].decode("utf-8", errors="ignore")
+            size = remaining
+            self.truncated = True
+        self.bytes_read += size
+        if self._keep_html:
+            self._html_parts.append(chunk)
+        self._collector.feed(chunk)
+        return not self.truncated
+
+    def close(self) -> ExtractedPage:
+        self._collector.close()
+        lines = (_INLINE_WHITESPACE.sub(" ", line).strip() for line in "".join(self._collector.parts).split("\n"))
+        clean_text = "\n".join(line for line in lines if line)
+        if self.truncated:
+            clean_text = f"{clean_text}\n{TRUNCATION_MARKER}" if clean_text else TRUNCATION_MARKER
+        return ExtractedPage(
+            raw_html="".join(self._html_parts),
+            clean_text=clean_text,
+            bytes_read=self.bytes_read,
+            truncated=self.truncated,
+        )
+
+
+def extract_text(
+    html: str,
+    max_bytes: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ExtractedPage:
+    extractor = StreamingTextExtractor(max_bytes=max_bytes)
+    for start in range(0, len(html), chunk_size):
+        if not extractor.feed(html[start : start + chunk_size]):
+            break
+    return extractor.close()
+
+
+def extract_from_stream(
+    stream: BinaryIO,
+    max_bytes: int | None = None,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ExtractedPage:
+    """Extract text from a binary stream such as an HTTP response body."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    extractor = StreamingTextExtractor(max_bytes=max_bytes)
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            extractor.feed(decoder.decode(b"", final=True))
+            break
+        if not extractor.feed(decoder.decode(block)):
+            break
+    return extractor.close()
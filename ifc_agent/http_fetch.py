@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import http.client
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+from urllib.parse import urljoin, urlsplit
+
+from .http_pool import HTTPConnectionPool, HTTPTimeouts, StreamingResponse
+
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_READ_CHUNK = 1 << 16
+
+
+@dataclass(frozen=True)
+class FetchResponse:
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    truncated: bool
+    # Body bytes read off the wire, before content decoding.
+    wire_bytes: int = 0
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+
+    @property
+    def charset(self) -> str:
+        for param in self.headers.get("content-type", "").split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset" and value.strip():
+                return value.strip().strip("\"'")
+        return "utf-8"
+
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+def decompressor(encoding: str):
+    """A streaming decoder for a Content-Encoding, or None if it is not compressed."""
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        # Auto-detects zlib-wrapped deflate; raw deflate is handled below.
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    return None
+
+
+def decompress_stream(encoding: str, blocks: Iterable[bytes], step: int = _READ_CHUNK) -> Iterator[bytes]:
+    """
+    Lazily decode `blocks` of a body sent with Content-Encoding `encoding`.
+
+    Each decompression step inflates at most `step` bytes, so a small
+    compressed body cannot expand all at once; the caller decides how much
+    to consume. Bodies that are not compressed pass through unchanged.
+    """
+    decoder = decompressor(encoding)
+    if decoder is None:
+        yield from blocks
+        return
+    raw_deflate_possible = encoding == "deflate"
+    for block in blocks:
+        while block:
+            try:
+                out = decoder.decompress(block, step)
+            except zlib.error:
+                if not raw_deflate_possible:
+                    raise
+                # Some servers send raw deflate without the zlib header.
+                decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+                raw_deflate_possible = False
+                continue
+            raw_deflate_possible = False
+            block = decoder.unconsumed_tail
+            if out:
+                yield out
+    yield decoder.flush()
+
+
+class HTTPFetcher:
+    """
+    Plain HTTP(S) GET client on a keep-alive `HTTPConnectionPool`.
+
+    Connections are reused across fetches and threads as the pool allows.
+    gzip/deflate bodies are decoded, redirects are followed up to
+    `max_redirects`, and at most `max_bytes` of decoded body are kept; a
+    truncated response's connection is closed rather than pooled. Without a
+    `pool`, the fetcher owns one with `timeout` for connect and reads.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = "IFC-Agent/0.2",
+        timeout: float = 15.0,
+        max_bytes: int | None = None,
+        max_redirects: int = 5,
+        pool: HTTPConnectionPool | None = None,
+    ) -> None:
+        self._user_agent = user_agent
+        self._max_bytes = max_bytes
+        self._max_redirects = max_redirects
+        self._owns_pool = pool is None
+        self._pool = pool or HTTPConnectionPool(HTTPTimeouts(connect_s=timeout, read_s=timeout))
+
+    def __enter__(self) -> "HTTPFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self._pool.close()
+
+    def fetch(self, url: str, headers: dict[str, str] | None = None) -> FetchResponse:
+        for _ in range(self._max_redirects + 1):
+            response = self._fetch_once(url, headers or {})
+            location = response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+        raise http.client.HTTPException(f"Too many redirects fetching {url}")
+
+    def _fetch_once(self, url: str, extra_headers: dict[str, str]) -> FetchResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL for HTTP fetch: {url}")
+        request_headers = {
+            "User-Agent": self._user_agent,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+            "Accept-Encoding": "gzip, deflate",
+            **extra_headers,
+        }
+        # The pool takes the connection back only if the body was read to the end.
+        with self._pool.stream("GET", url, headers=request_headers) as response:
+            body, truncated, wire_bytes = self._read_body(response)
+        return FetchResponse(
+            url=url,
+            status=response.status,
+            headers=response.headers,
+            body=body,
+            truncated=truncated,
+            wire_bytes=wire_bytes,
+        )
+
+    def _read_body(self, response: StreamingResponse) -> tuple[bytes, bool, int]:
+        encoding = response.headers.get("content-encoding", "").strip().lower()
+        limit = self._max_bytes
+        parts: list[bytes] = []
+        size = wire = 0
+
+        def _wire_blocks() -> Iterator[bytes]:
+            nonlocal wire
+            while True:
+                block = response.read(_READ_CHUNK)
+                if not block:
+                    return
+                wire += len(block)
+                yield block
+
+        for block in decompress_stream(encoding, _wire_blocks()):
+            parts.append(block)
+            size += len(block)
+            if limit is not None and size > limit:
+                # The rest of the body is left unread, so the connection is dropped.
+                return b"".join(parts)[:limit], True, wire
+        return b"".join(parts), False, wire
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+# Errors that mean a reused keep-alive connection was closed by the server.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+@dataclass(frozen=True)
+class HTTPTimeouts:
+    # Budget for TCP connect and TLS handshake.
+    connect_s: float = 10.0
+    # Budget for each socket read once connected; model calls can be slow.
+    read_s: float = 120.0
+
+
+@dataclass(frozen=True)
+class PooledResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+class StreamingResponse:
+    """An open response whose body is read incrementally."""
+
+    def __init__(self, response: http.client.HTTPResponse) -> None:
+        self._response = response
+        self.status = response.status
+        self.headers = {name.lower(): value for name, value in response.getheaders()}
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._response.read(amt)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Body lines as they arrive, without line endings."""
+        while True:
+            line = self._response.readline()
+            if not line:
+                return
+            yield line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+class HTTPConnectionPool:
+    """
+    Thread-safe keep-alive HTTP(S) client over `http.client`.
+
+    Connections are pooled per scheme/host/port. A request checks out an idle
+    connection (or opens one) and returns it once the response has been read,
+    keeping at most `max_idle_per_origin` idle per origin. A reused
+    connection the server has already closed is reopened once transparently.
+    `counters` tracks "opened" and "reused" connections.
+    """
+
+    def __init__(self, timeouts: HTTPTimeouts | None = None, max_idle_per_origin: int = 4) -> None:
+        self.timeouts = timeouts or HTTPTimeouts()
+        self._max_idle = max_idle_per_origin
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.counters: Counter[str] = Counter()
+
+    def __enter__(self) -> "HTTPConnectionPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> PooledResponse:
+        key, connection, response = self._send(method, url, body, headers)
+        try:
+            payload = response.read()
+        except Exception:
+            connection.close()
+            raise
+        self._release(key, connection, response)
+        return PooledResponse(
+            status=response.status,
+            headers={name.lower(): value for name, value in response.getheaders()},
+            body=payload,
+        )
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[StreamingResponse]:
+        """
+        Send a request and yield the response before its body is read. The
+        connection goes back to the pool only if the body was read to the
+        end; leaving early closes it.
+        """
+        key, connection, response = self._send(method, url, body, headers)
+        try:
+            yield StreamingResponse(response)
+        except BaseException:
+            connection.close()
+            raise
+        # http.client marks the response closed once the body is consumed.
+        if response.isclosed():
+            self._release(key, connection, response)
+        else:
+            connection.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str] | None,
+    ) -> tuple[tuple[str, str, int], http.client.HTTPConnection, http.client.HTTPResponse]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL for HTTP request: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        request_headers = {"Connection": "keep-alive", **(headers or {})}
+
+        connection, reused = self._checkout(key)
+        try:
+            connection.request(method, path, body=body, headers=request_headers)
+            return key, connection, connection.getresponse()
+        except _STALE_CONNECTION_ERRORS:
+            connection.close()
+            if not reused:
+                raise
+        except Exception:
+            connection.close()
+            raise
+        connection = self._open(key)
+        try:
+            connection.request(method, path, body=body, headers=request_headers)
+            return key, connection, connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+    def _release(
+        self,
+        key: tuple[str, str, int],
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(key, connection)
+
+    def _checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.counters["reused"] += 1
+                return idle.pop(), True
+        return self._open(key), False
+
+    def _checkin(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _open(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(host, port, timeout=self.timeouts.connect_s)
+        connection.connect()
+        # The connect budget covers the handshake; reads get their own.
+        connection.sock.settimeout(self.timeouts.read_s)
+        with self._lock:
+            self.counters["opened"] += 1
+        return connection
+
+
+_shared_pool: HTTPConnectionPool | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> HTTPConnectionPool:
+    """Process-wide pool with default timeouts, used by adapters given none."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = HTTPConnectionPool()
+        return _shared_pool
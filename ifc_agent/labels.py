@@ -16,30 +16,115 @@ class Label:
 
 
 class Lattice:
-    def __init__(self, levels: Iterable[str]) -> None:
+    """
+    Security levels ordered as a DAG.
+
+    `flows` lists `(lower, upper)` edges; when omitted, `levels` is read as a
+    total order from lowest to highest. The transitive closure and the
+    least-upper-bound table are precomputed, so `level_flows` and
+    `join_level` are table lookups regardless of lattice size.
+    """
+
+    def __init__(
+        self,
+        levels: Iterable[str],
+        flows: Iterable[tuple[str, str]] | None = None,
+    ) -> None:
         self._levels = list(levels)
-        self._rank = {level: idx for idx, level in enumerate(self._levels)}
-        if len(self._rank) != len(self._levels):
+        self._index = {level: idx for idx, level in enumerate(self._levels)}
+        if len(self._index) != len(self._levels):
             raise ValueError("Levels must be unique.")
+        if flows is None:
+            flows = zip(self._levels, self._levels[1:])
+
+        # up[i] is a bitset of every level that level i may flow to.
+        size = len(self._levels)
+        up = [1 << idx for idx in range(size)]
+        for lower, upper in flows:
+            if lower not in self._index or upper not in self._index:
+                raise ValueError(f"Unknown level in flow edge: {lower} -> {upper}")
+            up[self._index[lower]] |= 1 << self._index[upper]
+        for k in range(size):
+            for i in range(size):
+                if up[i] >> k & 1:
+                    up[i] |= up[k]
+
+        self._leq = [[bool(up[i] >> j & 1) for j in range(size)] for i in range(size)]
+        for i in range(size):
+            for j in range(i + 1, size):
+                if self._leq[i][j] and self._leq[j][i]:
+                    raise ValueError(
+                        f"Flow edges form a cycle between {self._levels[i]} and {self._levels[j]}."
+                    )
+
+        self._join = [[0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i, size):
+                upper_bounds = up[i] & up[j]
+                least = next(
+                    (k for k in range(size) if upper_bounds >> k & 1 and upper_bounds & ~up[k] == 0),
+                    None,
+                )
+                if least is None:
+                    raise ValueError(
+                        f"Levels {self._levels[i]} and {self._levels[j]} have no least upper bound."
+                    )
+                self._join[i][j] = self._join[j][i] = least
+
+    @classmethod
+    def from_config(cls, value: Iterable[str] | dict) -> "Lattice":
+        # Accepts the legacy ordered list or {"levels": [...], "flows": [[low, high], ...]}.
+        if isinstance(value, dict):
+            flows = value.get("flows")
+            return cls(
+                value["levels"],
+                None if flows is None else [tuple(edge) for edge in flows],
+            )
+        return cls(value)
+
+    @property
+    def levels(self) -> tuple[str, ...]:
+        return tuple(self._levels)
+
+    def level_flows(self, src: str, dst: str) -> bool:
+        return self._leq[self._index[src]][self._index[dst]]
 
     def join_level(self, a: str, b: str) -> str:
-        return a if self._rank[a] >= self._rank[b] else b
+        return self._levels[self._join[self._index[a]][self._index[b]]]
+
+    def join_levels(self, levels: Iterable[str]) -> str:
+        iterator = iter(levels)
+        try:
+            current = self._index[next(iterator)]
+        except StopIteration:
+            raise ValueError("Cannot join an empty level set.") from None
+        for level in iterator:
+            current = self._join[current][self._index[level]]
+        return self._levels[current]
 
     def can_flow(self, src: Label, dst: Label) -> bool:
         # Level dominance + category containment.
         return (
-            self._rank[src.level] <= self._rank[dst.level]
+            self.level_flows(src.level, dst.level)
             and src.categories.issubset(dst.categories)
         )
     # For validation purposes.
     def is_valid_level(self, level: str) -> bool:
-        return level in self._rank
+        return level in self._index
 
 
 def make_label(level: str, categories: Iterable[str] | None = None) -> Label:
     return Label(level=level, categories=frozenset(categories or []))
 
 
+def label_to_json(label: Label) -> dict:
+    return {"level": label.level, "categories": sorted(label.categories)}
+
+
+def label_from_json(obj: dict) -> Label:
+    return make_label(obj["level"], obj.get("categories", []))
+
+
 def join_labels(lattice: Lattice, labels: Iterable[Label]) -> Label:
     levels: list[str] = []
     categories: set[str] = set()
@@ -48,7 +133,4 @@ def join_labels(lattice: Lattice, labels: Iterable[Label]) -> Label:
         categories.update(label.categories)
     if not levels:
         raise ValueError("Cannot join an empty label set.")
-    level = levels[0]
-    for other in levels[1:]:
-        level = lattice.join_level(level, other)
-    return Label(level=level, categories=frozenset(categories))
\ No newline at end of file
+    return Label(level=lattice.join_levels(levels), categories=frozenset(categories))
\ No newline at end of file
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import urllib.request
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Iterator
 
+from .http_pool import HTTPConnectionPool, shared_pool
 from .labels import Label
+from .resilience import RetryPolicy
 
 
 @dataclass(frozen=True)
@@ -15,6 +22,82 @@ class LLMResponse:
     label: Label
 
 
+class LLMHTTPError(RuntimeError):
+    """
+    Error status from an LLM endpoint. `retry_after` is the server's
+    Retry-After hint in seconds, when it sent one.
+    """
+
+    def __init__(self, message: str, status: int, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(headers: dict[str, str]) -> float | None:
+    # Retry-After is either delay-seconds or an HTTP date.
+    raw = headers.get("retry-after", "").strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class LLMOutcome:
+    """Result of one prompt in `generate_many`: a response, or the error it failed with."""
+
+    response: LLMResponse | None = None
+    error: str = ""
+    # Requests sent for this prompt, including retries after rate limiting.
+    attempts: int = 0
+
+
+class _RateLimitGate:
+    """Holds back every request of a batch until a 429's wait has passed."""
+
+    def __init__(self) -> None:
+        self._until = 0.0
+
+    def block_for(self, seconds: float) -> None:
+        self._until = max(self._until, time.monotonic() + seconds)
+
+    async def wait(self) -> None:
+        while (remaining := self._until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+
+class LLMStream:
+    """
+    Text chunks of a response whose label is known before the first chunk,
+    so flow checks can run before anything is shown.
+
+    `tokens` is the backend's reported token count when it sends one, and
+    otherwise the number of chunks; it is final once iteration has ended.
+    """
+
+    def __init__(self, label: Label, chunks: Iterable[str], usage: dict[str, int] | None = None) -> None:
+        self.label = label
+        self._chunks = chunks
+        self._usage = usage if usage is not None else {}
+        self._count = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            self._count += 1
+            yield chunk
+
+    @property
+    def tokens(self) -> int:
+        return self._usage.get("tokens", self._count)
+
+
 class BaseLLM:
     def __init__(self, name: str, is_external: bool) -> None:
         self.name = name
@@ -23,41 +106,155 @@ class BaseLLM:
     def generate(self, prompt: str, label: Label) -> LLMResponse:
         raise NotImplementedError
 
+    def counters(self) -> Counter[str]:
+        """Cumulative event counts of this backend and any backend it wraps."""
+        return Counter()
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        """Backends without streaming yield the whole response as one chunk."""
+        response = self.generate(prompt, label)
+        return LLMStream(response.label, [response.text] if response.text else [])
+
+    async def agenerate(self, prompt: str, label: Label) -> LLMResponse:
+        """
+        `generate` on the event loop's executor. The HTTP adapters share a
+        thread-safe keep-alive pool, so concurrent calls each hold their own
+        pooled connection.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt, label)
+
+    async def agenerate_many(
+        self,
+        prompts_with_labels: Iterable[tuple[str, Label]],
+        max_concurrency: int = 4,
+        rate_limit: RetryPolicy | None = None,
+        rng: random.Random | None = None,
+    ) -> list[LLMOutcome]:
+        """
+        Run `agenerate` for each (prompt, label) with at most `max_concurrency`
+        requests in flight, returning outcomes in input order. A failure is
+        recorded on its own item. A 429 pauses the whole batch for the
+        server's Retry-After (or the `rate_limit` backoff when it sends none)
+        and retries the item, up to `rate_limit.max_attempts` requests.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        policy = rate_limit or RetryPolicy(max_attempts=4, base_delay_s=1.0, max_delay_s=30.0)
+        rng = rng or random.Random()
+        slots = asyncio.Semaphore(max_concurrency)
+        gate = _RateLimitGate()
+
+        async def _one(prompt: str, label: Label) -> LLMOutcome:
+            async with slots:
+                attempts = 0
+                while True:
+                    await gate.wait()
+                    attempts += 1
+                    try:
+                        response = await self.agenerate(prompt, label)
+                    except Exception as e:
+                        # Guards such as ResilientLLM re-raise with the status
+                        # and Retry-After of the error they gave up on.
+                        if getattr(e, "status", None) != 429 or attempts >= policy.max_attempts:
+                            return LLMOutcome(error=str(e), attempts=attempts)
+                        retry_after = getattr(e, "retry_after", None)
+                        wait = retry_after if retry_after is not None else policy.delay(attempts - 1, rng)
+                        gate.block_for(wait)
+                    else:
+                        return LLMOutcome(response=response, attempts=attempts)
+
+        return list(await asyncio.gather(*(_one(prompt, label) for prompt, label in prompts_with_labels)))
+
+    def generate_many(
+        self,
+        prompts_with_labels: Iterable[tuple[str, Label]],
+        max_concurrency: int = 4,
+        rate_limit: RetryPolicy | None = None,
+        rng: random.Random | None = None,
+    ) -> list[LLMOutcome]:
+        """Blocking `agenerate_many` on its own event loop and worker threads."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        items = list(prompts_with_labels)
+
+        async def _run() -> list[LLMOutcome]:
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency))
+            return await self.agenerate_many(items, max_concurrency, rate_limit, rng)
+
+        return asyncio.run(_run())
+
 
 class OllamaLLM(BaseLLM):
     """
     Local LLM via Ollama API.
     Requires Ollama running on localhost (default: http://127.0.0.1:11434).
+    Requests go over `http_client` (the process-wide keep-alive pool by default).
     """
 
-    def __init__(self, model: str, base_url: str = "http://127.0.0.1:11434") -> None:
+    def __init__(
+        self,
+        model: str,
+        base_url: str = "http://127.0.0.1:11434",
+        http_client: HTTPConnectionPool | None = None,
+    ) -> None:
         super().__init__(name=f"ollama:{model}", is_external=False)
         self._model = model
         self._base_url = base_url.rstrip("/")
+        self._http = http_client or shared_pool()
 
     def generate(self, prompt: str, label: Label) -> LLMResponse:
         payload = {"model": self._model, "prompt": prompt, "stream": False}
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
+        resp = self._http.request(
+            "POST",
             f"{self._base_url}/api/generate",
-            data=data,
+            body=json.dumps(payload).encode("utf-8"),
             headers={"Content-Type": "application/json"},
-            method="POST",
         )
-        try:
-            with urllib.request.urlopen(req, timeout=120) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8")
-            raise RuntimeError(f"Ollama API error: {e.code} - {error_body}") from e
-        
+        if resp.status >= 400:
+            raise LLMHTTPError(
+                f"Ollama API error: {resp.status} - {resp.text()}", resp.status, _retry_after(resp.headers)
+            )
+        body = resp.json()
         return LLMResponse(text=body.get("response", ""), label=label)
 
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        usage: dict[str, int] = {}
+        return LLMStream(label, self._stream_chunks(prompt, usage), usage)
+
+    def _stream_chunks(self, prompt: str, usage: dict[str, int]) -> Iterator[str]:
+        # Ollama streams one JSON object per line; the last has "done": true.
+        payload = {"model": self._model, "prompt": prompt, "stream": True}
+        with self._http.stream(
+            "POST",
+            f"{self._base_url}/api/generate",
+            body=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            if resp.status >= 400:
+                raise LLMHTTPError(
+                    f"Ollama API error: {resp.status} - {resp.read().decode('utf-8', errors='replace')}",
+                    resp.status,
+                    _retry_after(resp.headers),
+                )
+            for line in resp.iter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if "error" in event:
+                    raise RuntimeError(f"Ollama API error: {event['error']}")
+                if event.get("response"):
+                    yield event["response"]
+                if event.get("done") and "eval_count" in event:
+                    usage["tokens"] = int(event["eval_count"])
+
 
 class OpenAICompatibleLLM(BaseLLM):
     """
     External LLM with OpenAI-compatible API.
-    Uses the OPENAI_API_KEY env var by default.
+    Uses the OPENAI_API_KEY env var by default. Requests go over `http_client`
+    (the process-wide keep-alive pool by default), so the TLS handshake is
+    paid once per connection rather than once per call.
     """
 
     def __init__(
@@ -65,11 +262,13 @@ class OpenAICompatibleLLM(BaseLLM):
         model: str,
         base_url: str,
         api_key_env: str = "OPENAI_API_KEY",
+        http_client: HTTPConnectionPool | None = None,
     ) -> None:
         super().__init__(name=f"openai:{model}", is_external=True)
         self._model = model
         self._base_url = base_url.rstrip("/")
         self._api_key = os.getenv(api_key_env, "")
+        self._http = http_client or shared_pool()
 
     def generate(self, prompt: str, label: Label) -> LLMResponse:
         if not self._api_key:
@@ -78,18 +277,60 @@ class OpenAICompatibleLLM(BaseLLM):
             "model": self._model,
             "messages": [{"role": "user", "content": prompt}],
         }
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
+        resp = self._http.request(
+            "POST",
             f"{self._base_url}/v1/chat/completions",
-            data=data,
+            body=json.dumps(payload).encode("utf-8"),
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {self._api_key}",
             },
-            method="POST",
         )
-        with urllib.request.urlopen(req, timeout=120) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
+        if resp.status >= 400:
+            raise LLMHTTPError(
+                f"OpenAI-compatible API error: {resp.status} - {resp.text()}", resp.status, _retry_after(resp.headers)
+            )
+        body = resp.json()
         content = body["choices"][0]["message"]["content"]
         return LLMResponse(text=content, label=label)
 
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        if not self._api_key:
+            raise RuntimeError("Missing API key for external LLM.")
+        return LLMStream(label, self._stream_chunks(prompt))
+
+    def _stream_chunks(self, prompt: str) -> Iterator[str]:
+        # Server-sent events: "data: {json}" lines, ending with "data: [DONE]".
+        payload: dict[str, Any] = {
+            "model": self._model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        with self._http.stream(
+            "POST",
+            f"{self._base_url}/v1/chat/completions",
+            body=json.dumps(payload).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "Authorization": f"Bearer {self._api_key}",
+            },
+        ) as resp:
+            if resp.status >= 400:
+                raise LLMHTTPError(
+                    f"OpenAI-compatible API error: {resp.status} - {resp.read().decode('utf-8', errors='replace')}",
+                    resp.status,
+                    _retry_after(resp.headers),
+                )
+            for line in resp.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    # Read on to the end of the body so the connection is reused.
+                    continue
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .labels import Label, label_from_json, label_to_json
+from .llm import BaseLLM, LLMResponse, LLMStream
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    backend TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    label TEXT NOT NULL,
+    response_label TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (backend, prompt_hash, label)
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """
+    Size-bounded, disk-backed LRU of LLM responses in SQLite.
+
+    Entries are keyed by backend name (which includes the model), prompt
+    hash and `str(label)` of the label the prompt was sent under, and a
+    lookup only matches that exact label: a response is never served under
+    a label other than the one it was generated for. Entries older than
+    `ttl_seconds` are dropped on lookup, and the least recently used ones are
+    evicted once the stored text exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.counters: Counter[str] = Counter()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def get(self, backend: str, prompt: str, label: Label) -> LLMResponse | None:
+        key = (backend, _prompt_hash(prompt), str(label))
+        now = self._clock()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT response_label, text, created_at FROM responses WHERE backend = ? AND prompt_hash = ? AND label = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            response_label, text, created_at = row
+            if self._ttl is not None and now - created_at > self._ttl:
+                self._db.execute("DELETE FROM responses WHERE backend = ? AND prompt_hash = ? AND label = ?", key)
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE backend = ? AND prompt_hash = ? AND label = ?",
+                (now, *key),
+            )
+            self.counters["hits"] += 1
+        return LLMResponse(text=text, label=label_from_json(json.loads(response_label)))
+
+    def put(self, backend: str, prompt: str, label: Label, response: LLMResponse) -> None:
+        size = len(response.text.encode("utf-8"))
+        if size > self._max_bytes:
+            return
+        now = self._clock()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (backend, _prompt_hash(prompt), str(label), json.dumps(label_to_json(response.label)), response.text, size, now, now),
+            )
+            self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        victims = []
+        for backend, prompt_hash, label, size in self._db.execute(
+            "SELECT backend, prompt_hash, label, size FROM responses ORDER BY accessed_at"
+        ):
+            if total <= self._max_bytes:
+                break
+            victims.append((backend, prompt_hash, label))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE backend = ? AND prompt_hash = ? AND label = ?", victims)
+        self.counters["evictions"] += len(victims)
+
+
+def _prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class CachedLLM(BaseLLM):
+    """
+    Serves repeated (prompt, label) calls to `backend` from a `ResponseCache`.
+
+    Cache events are reported through `counters()` as "cache_hits",
+    "cache_misses", "cache_expired" and "cache_evictions". A streamed miss is
+    cached once the stream has been read to the end.
+    """
+
+    def __init__(self, backend: BaseLLM, cache: ResponseCache) -> None:
+        super().__init__(name=f"cached->{backend.name}", is_external=backend.is_external)
+        self._backend = backend
+        self._cache = cache
+
+    def generate(self, prompt: str, label: Label) -> LLMResponse:
+        cached = self._cache.get(self._backend.name, prompt, label)
+        if cached is not None:
+            return cached
+        response = self._backend.generate(prompt, label)
+        self._cache.put(self._backend.name, prompt, label, response)
+        return response
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        cached = self._cache.get(self._backend.name, prompt, label)
+        if cached is not None:
+            return LLMStream(cached.label, [cached.text] if cached.text else [])
+        stream = self._backend.generate_stream(prompt, label)
+        usage: dict[str, int] = {}
+        return LLMStream(stream.label, self._record(stream, prompt, label, usage), usage)
+
+    def counters(self) -> Counter[str]:
+        own = Counter({f"cache_{name}": count for name, count in self._cache.counters.items()})
+        return own + self._backend.counters()
+
+    def _record(self, stream: LLMStream, prompt: str, label: Label, usage: dict[str, int]) -> Iterator[str]:
+        parts: list[str] = []
+        for chunk in stream:
+            parts.append(chunk)
+            yield chunk
+        usage["tokens"] = stream.tokens
+        self._cache.put(self._backend.name, prompt, label, LLMResponse(text="".join(parts), label=stream.label))
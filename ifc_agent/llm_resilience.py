@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import http.client
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterator, TypeVar
+
+from .labels import Label
+from .llm import BaseLLM, LLMHTTPError, LLMResponse, LLMStream
+from .resilience import CircuitBreaker, RetryPolicy
+
+T = TypeVar("T")
+
+# Error kinds worth another attempt; they also count against the breaker.
+_RETRYABLE_KINDS = frozenset({"rate_limited", "server_error", "timeout", "connection"})
+
+_END = object()
+
+
+class LLMCallError(RuntimeError):
+    """
+    Final failure of a guarded LLM call. `kind` is the classification of the
+    last error (see `classify_llm_error`), or "deadline" / "circuit_open"
+    when the guard itself gave up; the underlying error is `__cause__`.
+    `status` and `retry_after` are copied from a final `LLMHTTPError`, so
+    callers such as `generate_many` still see a 429 and its Retry-After.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        kind: str,
+        attempts: int,
+        elapsed_s: float,
+        status: int | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.kind = kind
+        self.attempts = attempts
+        self.elapsed_s = elapsed_s
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _DeadlineExceeded(Exception):
+    pass
+
+
+def classify_llm_error(error: BaseException) -> str:
+    """
+    One of "rate_limited", "server_error", "client_error", "timeout",
+    "connection", "bad_response" or "other".
+    """
+    if isinstance(error, LLMHTTPError):
+        if error.status == 429:
+            return "rate_limited"
+        if error.status == 408 or error.status >= 500:
+            return "server_error"
+        return "client_error"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, (ConnectionError, http.client.HTTPException, OSError)):
+        return "connection"
+    if isinstance(error, (ValueError, KeyError, IndexError, TypeError)):
+        return "bad_response"
+    return "other"
+
+
+class ResilientLLM(BaseLLM):
+    """
+    Deadline, retries and a circuit breaker around one `backend`.
+
+    Each call, retries included, finishes within `deadline_s`: an attempt
+    still running at the deadline is abandoned on a daemon thread and the
+    call fails with kind "deadline". Rate limiting, 5xx responses, timeouts
+    and connection errors are retried with the `retry` backoff (at least
+    the server's Retry-After); other errors fail at once. After
+    `failure_threshold` consecutive backend failures the breaker opens and
+    calls fail fast with kind "circuit_open" until `reset_timeout_s` has
+    passed (`failure_threshold=None` disables it). Final failures raise
+    `LLMCallError`.
+
+    `counters()` adds "attempts", "retries", "short_circuited" and
+    "errors_<kind>" to the backend's counts. A stream is only retried
+    before its first chunk; later chunks are read on a daemon thread and the
+    wait for each one is bounded by the deadline, so a stream that stalls
+    mid-answer fails with kind "deadline" too. A failure after the first
+    chunk is classified, counted against the breaker and raised as
+    `LLMCallError` like any other final failure.
+    """
+
+    def __init__(
+        self,
+        backend: BaseLLM,
+        retry: RetryPolicy | None = None,
+        deadline_s: float | None = 90.0,
+        failure_threshold: int | None = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        super().__init__(name=f"resilient->{backend.name}", is_external=backend.is_external)
+        self._backend = backend
+        self._retry = retry or RetryPolicy(max_attempts=3)
+        self._deadline_s = deadline_s
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._breaker = (
+            CircuitBreaker(failure_threshold, reset_timeout_s, clock) if failure_threshold is not None else None
+        )
+        # Guards the breaker and counters; generate_many calls concurrently.
+        self._lock = threading.Lock()
+        self._events: Counter[str] = Counter()
+
+    @property
+    def circuit_state(self) -> str:
+        return self._breaker.state if self._breaker is not None else "closed"
+
+    def generate(self, prompt: str, label: Label) -> LLMResponse:
+        response, _ = self._call(lambda: self._backend.generate(prompt, label), self._clock())
+        return response
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        # The backend builds its stream lazily, so the label is known before any request.
+        stream = self._backend.generate_stream(prompt, label)
+        usage: dict[str, int] = {}
+        return LLMStream(stream.label, self._guarded_chunks(stream, prompt, label, usage), usage)
+
+    def counters(self) -> Counter[str]:
+        with self._lock:
+            own = Counter(self._events)
+        return own + self._backend.counters()
+
+    def _guarded_chunks(
+        self,
+        stream: LLMStream,
+        prompt: str,
+        label: Label,
+        usage: dict[str, int],
+    ) -> Iterator[str]:
+        started = self._clock()
+        pending: list[LLMStream] = [stream]
+
+        def _open() -> tuple[LLMStream, Iterator[str], object]:
+            # A retry needs a fresh stream; the failed one is spent.
+            current = pending.pop() if pending else self._backend.generate_stream(prompt, label)
+            chunks = iter(current)
+            return current, chunks, next(chunks, _END)
+
+        (current, chunks, head), attempts = self._call(_open, started)
+        if head is _END:
+            usage["tokens"] = current.tokens
+            return
+        yield head
+        try:
+            if self._deadline_s is None:
+                yield from chunks
+            else:
+                yield from self._chunks_within(chunks, started, attempts)
+        except LLMCallError:
+            raise
+        except Exception as e:
+            # Chunks already reached the caller, so the stream is not retried,
+            # but the failure is classified and counted like any other.
+            kind = classify_llm_error(e)
+            self._after_failure(kind)
+            raise self._give_up(kind, attempts, started, e) from e
+        usage["tokens"] = current.tokens
+
+    def _chunks_within(self, chunks: Iterator[str], started: float, attempts: int) -> Iterator[str]:
+        # Chunks are pulled on a daemon thread so waiting for each one can
+        # time out; a stream abandoned at the deadline is left to that thread.
+        pipe: queue.SimpleQueue[tuple[object, BaseException | None]] = queue.SimpleQueue()
+
+        def _pump() -> None:
+            try:
+                for chunk in chunks:
+                    pipe.put((chunk, None))
+            except BaseException as e:
+                pipe.put((_END, e))
+            else:
+                pipe.put((_END, None))
+
+        threading.Thread(target=_pump, name=f"llm-stream {self._backend.name}", daemon=True).start()
+        while True:
+            remaining = self._deadline_s - (self._clock() - started)
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                chunk, error = pipe.get(timeout=remaining)
+            except queue.Empty:
+                self._after_failure("deadline")
+                raise self._give_up("deadline", attempts, started, None) from None
+            if error is not None:
+                raise error
+            if chunk is _END:
+                return
+            yield chunk
+
+    def _call(self, attempt: Callable[[], T], started: float) -> tuple[T, int]:
+        self._admit(started)
+        attempts = 0
+        while True:
+            attempts += 1
+            self._count("attempts")
+            try:
+                result = self._within(attempt, started)
+            except _DeadlineExceeded:
+                self._after_failure("deadline")
+                raise self._give_up("deadline", attempts, started, None) from None
+            except Exception as e:
+                kind = classify_llm_error(e)
+                wait = None
+                if self._after_failure(kind) and attempts < self._retry.max_attempts:
+                    wait = self._backoff(e, attempts - 1, started)
+                if wait is None:
+                    raise self._give_up(kind, attempts, started, e) from e
+                self._count("retries")
+                self._sleep(wait)
+            else:
+                with self._lock:
+                    if self._breaker is not None:
+                        self._breaker.record_success()
+                return result, attempts
+
+    def _admit(self, started: float) -> None:
+        with self._lock:
+            if self._breaker is None or self._breaker.allow():
+                return
+            self._events["short_circuited"] += 1
+            failures = self._breaker.failures
+        raise LLMCallError(
+            f"{self._backend.name} circuit open after {failures} consecutive failures",
+            "circuit_open",
+            0,
+            self._clock() - started,
+        )
+
+    def _within(self, attempt: Callable[[], T], started: float) -> T:
+        if self._deadline_s is None:
+            return attempt()
+        remaining = self._deadline_s - (self._clock() - started)
+        if remaining <= 0:
+            raise _DeadlineExceeded()
+        outcome: dict[str, object] = {}
+        done = threading.Event()
+
+        def _run() -> None:
+            try:
+                outcome["value"] = attempt()
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=_run, name=f"llm-call {self._backend.name}", daemon=True).start()
+        if not done.wait(remaining):
+            raise _DeadlineExceeded()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
+    def _after_failure(self, kind: str) -> bool:
+        """Record the failure; True when another attempt is worth making."""
+        with self._lock:
+            self._events[f"errors_{kind}"] += 1
+            if self._breaker is None:
+                return kind in _RETRYABLE_KINDS
+            if kind in _RETRYABLE_KINDS or kind == "deadline":
+                self._breaker.record_failure()
+            else:
+                # The backend answered; the request itself was at fault.
+                self._breaker.record_success()
+            return kind in _RETRYABLE_KINDS and self._breaker.allow()
+
+    def _backoff(self, error: Exception, retry: int, started: float) -> float | None:
+        """Wait before the next attempt, or None when it would overrun the deadline."""
+        wait = self._retry.delay(retry, self._rng)
+        if isinstance(error, LLMHTTPError) and error.retry_after is not None:
+            wait = max(wait, error.retry_after)
+        if self._deadline_s is not None and self._clock() - started + wait >= self._deadline_s:
+            return None
+        return wait
+
+    def _give_up(self, kind: str, attempts: int, started: float, error: Exception | None) -> LLMCallError:
+        elapsed = self._clock() - started
+        if kind == "deadline":
+            detail = f"deadline of {self._deadline_s:g}s exceeded"
+        else:
+            detail = f"{kind}: {error}"
+        return LLMCallError(
+            f"{self._backend.name} failed after {attempts} attempt(s) in {elapsed:.1f}s ({detail})",
+            kind,
+            attempts,
+            elapsed,
+            status=error.status if isinstance(error, LLMHTTPError) else None,
+            retry_after=error.retry_after if isinstance(error, LLMHTTPError) else None,
+        )
+
+    def _count(self, event: str) -> None:
+        with self._lock:
+            self._events[event] += 1
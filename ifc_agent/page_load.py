@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+from urllib.parse import urlparse
+
+from .domains import DomainSuffixSet, lookup_by_domain, normalize_domain
+
+# Readiness checks a page load can wait for before its content is read.
+LOAD_WAITS = frozenset({"load", "domcontentloaded", "networkidle", "selector"})
+
+
+@dataclass(frozen=True)
+class LoadStrategy:
+    """
+    When a browser page counts as loaded.
+
+    `wait` is one of `LOAD_WAITS`: "load" and "domcontentloaded" wait for
+    that navigation event, "networkidle" additionally waits for the network
+    to go quiet, and "selector" waits for `selector` to appear. With
+    `timeout_ms`, a readiness wait that runs out is not an error: the page is
+    read as it is at that point.
+    """
+
+    wait: str = "networkidle"
+    selector: str | None = None
+    timeout_ms: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.wait not in LOAD_WAITS:
+            raise ValueError(f"Unknown load wait: {self.wait}")
+        if self.wait == "selector" and not self.selector:
+            raise ValueError("The selector load wait needs a selector.")
+
+    @classmethod
+    def from_config(cls, obj: Mapping[str, Any]) -> "LoadStrategy":
+        timeout_ms = obj.get("timeout_ms")
+        return cls(
+            wait=obj.get("wait", "networkidle"),
+            selector=obj.get("selector"),
+            timeout_ms=int(timeout_ms) if timeout_ms is not None else None,
+        )
+
+    @property
+    def goto_wait_until(self) -> str | None:
+        # None keeps Playwright's default ("load") for goto.
+        if self.wait in ("domcontentloaded", "selector"):
+            return "domcontentloaded"
+        return None
+
+
+class LoadStrategies:
+    """A default `LoadStrategy` with per-domain overrides; the most specific domain wins."""
+
+    def __init__(
+        self,
+        default: LoadStrategy | None = None,
+        by_domain: Mapping[str, LoadStrategy] | None = None,
+    ) -> None:
+        self.default = default or LoadStrategy()
+        self._by_domain = {normalize_domain(domain): item for domain, item in (by_domain or {}).items()}
+
+    @classmethod
+    def from_config(
+        cls,
+        default: Mapping[str, Any] | None = None,
+        by_domain: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> "LoadStrategies":
+        return cls(
+            default=LoadStrategy.from_config(default) if default else None,
+            by_domain={domain: LoadStrategy.from_config(item) for domain, item in (by_domain or {}).items()},
+        )
+
+    def for_url(self, url: str) -> LoadStrategy:
+        strategy = lookup_by_domain(self._by_domain, urlparse(url).hostname or "")
+        return self.default if strategy is None else strategy
+
+
+class ResourceFilter:
+    """
+    Which subresource requests a browser page should abort.
+
+    Requests are blocked by Playwright resource type (for example "image",
+    "font", "media") or when their host is under one of `domains`. The page's
+    own navigation request is never blocked.
+    """
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] = (),
+        domains: Iterable[str] | DomainSuffixSet = (),
+    ) -> None:
+        self._resource_types = frozenset(item.lower() for item in resource_types)
+        self._domains = domains if isinstance(domains, DomainSuffixSet) else DomainSuffixSet(domains)
+
+    def __bool__(self) -> bool:
+        return bool(self._resource_types) or len(self._domains) > 0
+
+    def blocks(self, resource_type: str, url: str, is_navigation: bool = False) -> bool:
+        if is_navigation:
+            return False
+        if resource_type.lower() in self._resource_types:
+            return True
+        return self._domains.match(urlparse(url).hostname or "") is not None
+
+
+def response_size(response: Any) -> int:
+    """Encoded body size of a Playwright response, from its Content-Length header."""
+    try:
+        return int(response.headers.get("content-length", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
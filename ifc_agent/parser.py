@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import copy
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable
+from hashlib import sha256
+from typing import Iterable, Iterator, Protocol, Sequence
 from urllib.parse import urlparse
 
+from .analysis import AnalyzedText, content_hash
+from .domains import DomainSuffixSet
+from .extract import BOILERPLATE_TOKENS
 from .labels import Label, make_label
 
+# Bump whenever scoring or signal extraction changes so cached assessments
+# produced by an older parser are never reused.
+PARSER_VERSION = "1"
+# Weight of the domain signal in the score; the score is linear in it, which
+# lets relabelling shift stored scores without re-parsing documents.
+DOMAIN_WEIGHT = 0.3
+
+_BOILERPLATE_TOKENS = BOILERPLATE_TOKENS
+_TEXT_ORG_TOKENS = ("inc", "corp", "university", "government")
+_HTML_DATE_TOKENS = ("datetime", "published", "date")
+_SCAN_CHUNK_CHARS = 1 << 18
+_WHITESPACE = re.compile(r"\s")
+_STRIP_CHARS = frozenset(".,:;!?()[]{}")
+
 
 @dataclass(frozen=True)
 class TrustAssessment:
@@ -14,35 +35,202 @@ class TrustAssessment:
     signals: dict[str, float | str | bool | int]
 
 
+@dataclass(frozen=True)
+class _TextSignals:
+    words: int
+    boilerplate_words: int
+    references: int
+    author_present: bool
+    org_present: bool
+
+    @property
+    def boilerplate_ratio(self) -> float:
+        if not self.words:
+            return 1.0
+        return min(1.0, self.boilerplate_words / self.words)
+
+
+def _iter_lower_chunks(text: str, lowered: bool = False) -> Iterator[str]:
+    # Chunks end just after a whitespace character, so no signal token or word
+    # straddles a boundary and only one chunk-sized lowercase copy is alive.
+    start = 0
+    while start < len(text):
+        match = _WHITESPACE.search(text, start + _SCAN_CHUNK_CHARS)
+        end = match.end() if match else len(text)
+        chunk = text[start:end]
+        yield chunk if lowered else chunk.lower()
+        start = end
+
+
+def _count_boilerplate_words(chunk: str) -> int:
+    # Equivalent to counting words whose punctuation-stripped form is a token,
+    # but only visits token occurrences instead of every word.
+    count = 0
+    size = len(chunk)
+    for token in _BOILERPLATE_TOKENS:
+        pos = chunk.find(token)
+        while pos != -1:
+            end = pos + len(token)
+            left = pos
+            while left > 0 and chunk[left - 1] in _STRIP_CHARS:
+                left -= 1
+            right = end
+            while right < size and chunk[right] in _STRIP_CHARS:
+                right += 1
+            if (left == 0 or chunk[left - 1].isspace()) and (right == size or chunk[right].isspace()):
+                count += 1
+            pos = chunk.find(token, end)
+    return count
+
+
+def _scan_text(text: str, lowered: bool = False) -> _TextSignals:
+    words = boilerplate = refs = 0
+    author_present = org_present = False
+    for chunk in _iter_lower_chunks(text, lowered):
+        refs += chunk.count("http") + chunk.count("www.")
+        author_present = author_present or "by " in chunk
+        org_present = org_present or any(token in chunk for token in _TEXT_ORG_TOKENS)
+        words += len(chunk.split())
+        boilerplate += _count_boilerplate_words(chunk)
+    return _TextSignals(
+        words=words,
+        boilerplate_words=boilerplate,
+        references=refs,
+        author_present=author_present,
+        org_present=org_present,
+    )
+
+
+def _scan_html(html: str, author_present: bool) -> tuple[bool, bool]:
+    date_present = False
+    for chunk in _iter_lower_chunks(html):
+        author_present = author_present or "author" in chunk
+        date_present = date_present or any(token in chunk for token in _HTML_DATE_TOKENS)
+        if author_present and date_present:
+            break
+    return author_present, date_present
+
+
+class AssessmentCache(Protocol):
+    def get(self, key: str) -> TrustAssessment | None: ...
+
+    def put(self, key: str, assessment: TrustAssessment) -> None: ...
+
+
+def _as_domain_set(domains: Iterable[str] | DomainSuffixSet | None) -> DomainSuffixSet:
+    if isinstance(domains, DomainSuffixSet):
+        return domains
+    return DomainSuffixSet(domains or [])
+
+
+# Each pool worker receives the parser once through the initializer instead of
+# with every task chunk, which matters when domain lists are large.
+_worker_parser: TrustParser | None = None
+
+
+def _init_worker(parser: TrustParser) -> None:
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _assess_in_worker(url: str, clean_text: str, raw_html: str) -> TrustAssessment:
+    assert _worker_parser is not None
+    return _worker_parser.assess(url, clean_text, raw_html)
+
+
 class TrustParser:
     def __init__(
         self,
-        trusted_domains: Iterable[str] | None = None,
-        blocked_domains: Iterable[str] | None = None,
+        trusted_domains: Iterable[str] | DomainSuffixSet | None = None,
+        blocked_domains: Iterable[str] | DomainSuffixSet | None = None,
+        cache: AssessmentCache | None = None,
     ) -> None:
-        self._trusted_domains = {d.lower() for d in (trusted_domains or [])}
-        self._blocked_domains = {d.lower() for d in (blocked_domains or [])}
+        # Entries match the domain itself and every subdomain.
+        self._trusted_domains = _as_domain_set(trusted_domains)
+        self._blocked_domains = _as_domain_set(blocked_domains)
+        self._cache = cache
+
+    def cache_key(
+        self,
+        url: str,
+        clean_text: str,
+        raw_html: str,
+        analyzed: AnalyzedText | None = None,
+    ) -> str:
+        """
+        Key an assessment by content, host, scheme and the parser config.
+
+        The config part is the parser version plus the domain classification
+        of this host only, so editing trusted/blocked lists invalidates
+        exactly the entries whose host changes classification. The text part
+        reuses the ingest-time content hash when `analyzed` is given.
+        """
+        host = (urlparse(url).hostname or "").lower()
+        scheme = "https" if url.lower().startswith("https://") else "other"
+        text_hash = analyzed.content_hash if analyzed is not None else content_hash(clean_text)
+        digest = sha256(text_hash.encode("ascii"))
+        digest.update(b"\0")
+        digest.update(raw_html.encode("utf-8"))
+        fingerprint = f"v{PARSER_VERSION}/{self.domain_signal(host)}"
+        return f"{digest.hexdigest()}|{host}|{scheme}|{fingerprint}"
+
+    def assess(
+        self,
+        url: str,
+        clean_text: str,
+        raw_html: str,
+        analyzed: AnalyzedText | None = None,
+    ) -> TrustAssessment:
+        """
+        Score a page; `analyzed` must be the analysis of `clean_text` if given.
+
+        This is the whole contract `AgentTools` relies on for sequential
+        parsing: a replacement parser takes the same arguments and may ignore
+        `analyzed`.
+        """
+        if self._cache is None:
+            return self._assess(url, clean_text, raw_html, analyzed)
+        key = self.cache_key(url, clean_text, raw_html, analyzed)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        assessment = self._assess(url, clean_text, raw_html, analyzed)
+        self._cache.put(key, assessment)
+        return assessment
 
-    def assess(self, url: str, clean_text: str, raw_html: str) -> TrustAssessment:
+    def domain_signal(self, host: str) -> float:
+        # The most specific matching entry wins; a tie keeps trusted first.
+        trusted = self._trusted_domains.match(host)
+        blocked = self._blocked_domains.match(host)
+        if trusted is not None and (blocked is None or trusted.count(".") >= blocked.count(".")):
+            return 1.0
+        if blocked is not None:
+            return 0.0
+        return 0.5
+
+    def _assess(
+        self,
+        url: str,
+        clean_text: str,
+        raw_html: str,
+        analyzed: AnalyzedText | None = None,
+    ) -> TrustAssessment:
         host = (urlparse(url).hostname or "").lower()
         https = url.lower().startswith("https://")
 
-        html_lower = raw_html.lower()
-        text_lower = clean_text.lower()
-        author_present = ("author" in html_lower) or ("by " in text_lower)
-        date_present = any(token in html_lower for token in ("datetime", "published", "date"))
-        org_present = any(token in text_lower for token in ("inc", "corp", "university", "government"))
-        refs = text_lower.count("http") + text_lower.count("www.")
-        boilerplate_ratio = self._boilerplate_ratio(clean_text)
+        if analyzed is not None:
+            text_signals = _scan_text(analyzed.normalized, lowered=True)
+        else:
+            text_signals = _scan_text(clean_text)
+        author_present, date_present = _scan_html(raw_html, text_signals.author_present)
+        org_present = text_signals.org_present
+        refs = text_signals.references
+        boilerplate_ratio = text_signals.boilerplate_ratio
 
-        domain_signal = 0.5
-        if host in self._trusted_domains:
-            domain_signal = 1.0
-        elif host in self._blocked_domains:
-            domain_signal = 0.0
+        domain_signal = self.domain_signal(host)
 
         score = (
-            0.3 * domain_signal
+            DOMAIN_WEIGHT * domain_signal
             + 0.15 * float(https)
             + 0.2 * float(author_present or date_present or org_present)
             + 0.2 * min(refs, 5) / 5.0
@@ -66,6 +254,69 @@ class TrustParser:
             },
         )
 
+    def assess_many(
+        self,
+        items: Iterable[tuple[str, str, str]],
+        workers: int | None = None,
+        chunksize: int | None = None,
+        analyzed: Sequence[AnalyzedText] | None = None,
+        executor: ProcessPoolExecutor | None = None,
+    ) -> list[TrustAssessment]:
+        """
+        Assess `(url, clean_text, raw_html)` items, in order.
+
+        With more than one worker the items are fanned out across a process
+        pool in chunks; otherwise they are assessed inline. Cache hits are
+        resolved in this process and only misses are sent to the pool.
+        `analyzed`, parallel to `items`, is used in-process only; pool workers
+        scan the raw text rather than receive a second pickled copy of it.
+
+        `executor`, from `worker_pool`, is used instead of starting a pool for
+        this call; it is left running.
+        """
+        batch = list(items)
+        if not batch:
+            return []
+        analyses = list(analyzed) if analyzed is not None else [None] * len(batch)
+        workers = workers or 1
+        if (workers <= 1 and executor is None) or len(batch) == 1:
+            return [self.assess(*item, analyzed=analysis) for item, analysis in zip(batch, analyses)]
+
+        results: list[TrustAssessment | None] = [None] * len(batch)
+        keys: list[str | None] = [None] * len(batch)
+        if self._cache is not None:
+            for idx, item in enumerate(batch):
+                keys[idx] = self.cache_key(*item, analyzed=analyses[idx])
+                results[idx] = self._cache.get(keys[idx])
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        if pending:
+            workers = min(workers, len(pending))
+            if chunksize is None:
+                chunksize = max(1, len(pending) // (workers * 4))
+            urls, texts, htmls = zip(*(batch[idx] for idx in pending))
+            pool = executor if executor is not None else self.worker_pool(workers)
+            try:
+                assessed = pool.map(_assess_in_worker, urls, texts, htmls, chunksize=chunksize)
+                for idx, assessment in zip(pending, assessed):
+                    results[idx] = assessment
+                    if self._cache is not None:
+                        self._cache.put(keys[idx], assessment)
+            finally:
+                if pool is not executor:
+                    pool.shutdown()
+        return results  # type: ignore[return-value]
+
+    def worker_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        A process pool for `assess_many` that can be kept across calls. Its
+        workers hold a copy of this parser as it is now, so a pool must not
+        outlive a change to the parser's configuration.
+        """
+        # Workers get a cache-less copy so the cache is never pickled.
+        worker_parser = copy.copy(self)
+        worker_parser._cache = None
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(worker_parser,))
+
     @staticmethod
     def map_score_to_label(score: float) -> Label:
         if score >= 0.8:
@@ -76,11 +327,4 @@ class TrustParser:
 
     @staticmethod
     def _boilerplate_ratio(text: str) -> float:
-        if not text:
-            return 1.0
-        words = text.split()
-        if not words:
-            return 1.0
-        boilerplate_tokens = {"cookie", "privacy", "terms", "subscribe", "advertisement", "login"}
-        boilerplate_count = sum(1 for w in words if w.lower().strip(".,:;!?()[]{}") in boilerplate_tokens)
-        return min(1.0, boilerplate_count / max(1, len(words)))
+        return _scan_text(text).boilerplate_ratio
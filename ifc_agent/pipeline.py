@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+# Marks the end of a stage's input.
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline step: `run` maps a batch of inputs to the outputs passed on."""
+
+    name: str
+    run: Callable[[list[Any]], list[Any]]
+    # Upper bound on items handed to `run` at once; smaller batches are passed
+    # whenever fewer items are waiting, so a stage never idles to fill one.
+    batch_size: int = 1
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    busy_s: float = 0.0
+    # Deepest the stage's input queue got; at `queue_size` the stage before
+    # it was blocked (backpressure).
+    max_queue_depth: int = 0
+
+    def as_dict(self, wall_s: float) -> dict[str, float | int]:
+        return {
+            "items": self.items,
+            "busy_s": round(self.busy_s, 4),
+            "items_per_s": round(self.items / wall_s, 1) if wall_s > 0 else 0.0,
+            "utilization": round(self.busy_s / wall_s, 3) if wall_s > 0 else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class StagePipeline:
+    """
+    A producer and a chain of stages connected by bounded queues.
+
+    The producer runs in the calling thread (sync Playwright objects must stay
+    on the thread that created them) and hands items to `emit`; each stage
+    runs in its own thread. When a queue holds `queue_size` items, whoever
+    feeds it blocks until the stage catches up. If a stage raises, the
+    remaining input is drained without processing and the error is re-raised
+    from `run`.
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 8) -> None:
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self._stages = list(stages)
+        self._queue_size = max(1, queue_size)
+
+    def run(
+        self,
+        produce: Callable[[Callable[[Any], None]], None],
+        source_name: str = "source",
+    ) -> tuple[list[Any], dict[str, dict[str, float | int]]]:
+        """Run `produce(emit)` through the stages; returns the last stage's outputs and per-stage stats."""
+        inboxes = [queue.Queue(maxsize=self._queue_size) for _ in self._stages]
+        stats = {source_name: StageStats(), **{stage.name: StageStats() for stage in self._stages}}
+        outputs: list[Any] = []
+        errors: list[BaseException] = []
+
+        def _put(idx: int, item: Any) -> None:
+            inboxes[idx].put(item)
+            depth = inboxes[idx].qsize()
+            stage_stats = stats[self._stages[idx].name]
+            stage_stats.max_queue_depth = max(stage_stats.max_queue_depth, depth)
+
+        def _work(idx: int) -> None:
+            stage = self._stages[idx]
+            inbox = inboxes[idx]
+            done = False
+            while not done:
+                batch = [inbox.get()]
+                while len(batch) < stage.batch_size and batch[-1] is not _DONE:
+                    try:
+                        batch.append(inbox.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is _DONE:
+                    done = True
+                    batch.pop()
+                if not batch or errors:
+                    continue
+                started = time.perf_counter()
+                try:
+                    results = stage.run(batch)
+                except BaseException as e:
+                    errors.append(e)
+                    continue
+                stats[stage.name].busy_s += time.perf_counter() - started
+                stats[stage.name].items += len(batch)
+                for result in results:
+                    if idx + 1 < len(self._stages):
+                        _put(idx + 1, result)
+                    else:
+                        outputs.append(result)
+            if idx + 1 < len(self._stages):
+                inboxes[idx + 1].put(_DONE)
+
+        threads = [
+            threading.Thread(target=_work, args=(idx,), name=f"pipeline-{stage.name}", daemon=True)
+            for idx, stage in enumerate(self._stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        source = stats[source_name]
+        wall_started = time.perf_counter()
+        last = wall_started
+
+        def _emit(item: Any) -> None:
+            nonlocal last
+            if errors:
+                # Stop producing for a pipeline that has already failed.
+                raise errors[0]
+            now = time.perf_counter()
+            source.busy_s += now - last
+            source.items += 1
+            _put(0, item)
+            last = time.perf_counter()
+
+        try:
+            produce(_emit)
+            source.busy_s += time.perf_counter() - last
+        finally:
+            inboxes[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        wall_s = time.perf_counter() - wall_started
+        if errors:
+            raise errors[0]
+        return outputs, {name: item.as_dict(wall_s) for name, item in stats.items()}
@@ -23,6 +23,14 @@ class Policy:
         self._external_llm_allowed = list(external_llm_allowed)
         self._user_output_max = user_output_max
 
+    @property
+    def external_llm_allowed(self) -> tuple[Label, ...]:
+        return tuple(self._external_llm_allowed)
+
+    @property
+    def user_output_max(self) -> Label:
+        return self._user_output_max
+
     def can_send_to_external_llm(self, payload_label: Label) -> FlowDecision:
         for allowed in self._external_llm_allowed:
             if self._lattice.can_flow(payload_label, allowed):
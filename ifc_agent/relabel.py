@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+from .labels import Label, Lattice, join_labels
+from .parser import DOMAIN_WEIGHT, TrustParser
+from .storage import JSONStorage, StoredTrustAssessment
+
+try:
+    # NumPy is optional; without it scores are shifted in a Python loop.
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - depends on environment
+    np = None
+
+
+@dataclass(frozen=True)
+class RelabelChange:
+    document_id: str
+    domain: str
+    old_score: float
+    new_score: float
+    old_label: Label
+    new_label: Label
+
+
+def _shift_scores(
+    scores: list[float],
+    old_signals: list[float],
+    new_signals: list[float],
+) -> list[float]:
+    if np is not None:
+        shifted = np.asarray(scores) + DOMAIN_WEIGHT * (np.asarray(new_signals) - np.asarray(old_signals))
+        return np.clip(shifted, 0.0, 1.0).tolist()
+    return [
+        max(0.0, min(1.0, score + DOMAIN_WEIGHT * (new - old)))
+        for score, old, new in zip(scores, old_signals, new_signals)
+    ]
+
+
+def relabel_store(
+    storage: JSONStorage,
+    parser: TrustParser,
+    lattice: Lattice,
+    dry_run: bool = False,
+) -> list[RelabelChange]:
+    """
+    Re-score stored documents after a trusted/blocked domain config change.
+
+    Hosts are taken from the storage domain index and classified once each;
+    only documents whose stored `domain_signal` differs are touched. Their
+    scores are shifted by the domain weight (the score is linear in that
+    signal), so nothing is re-parsed. The new label is joined with the
+    original scrape label, or with the stored label for rows that predate
+    scrape-label tracking, so a relabel never lowers ingest-time restrictions.
+    """
+    trust_by_id = {item.document_id: item for item in storage.load_trust_assessments()}
+
+    affected: list[tuple[str, StoredTrustAssessment, float]] = []
+    for host, document_ids in storage.load_domain_index().items():
+        new_signal = parser.domain_signal(host)
+        for document_id in document_ids:
+            trust = trust_by_id.get(document_id)
+            if trust is None or "domain_signal" not in trust.signals:
+                continue
+            if float(trust.signals["domain_signal"]) != new_signal:
+                affected.append((host, trust, new_signal))
+    if not affected:
+        return []
+
+    new_scores = _shift_scores(
+        [trust.score for _, trust, _ in affected],
+        [float(trust.signals["domain_signal"]) for _, trust, _ in affected],
+        [new_signal for _, _, new_signal in affected],
+    )
+
+    changes: list[RelabelChange] = []
+    updates: list[StoredTrustAssessment] = []
+    for (host, trust, new_signal), new_score in zip(affected, new_scores):
+        floors = [trust.scrape_label] if trust.scrape_label is not None else []
+        new_label = join_labels(lattice, [parser.map_score_to_label(new_score), *floors])
+        updates.append(
+            replace(
+                trust,
+                score=new_score,
+                label=new_label,
+                signals={**trust.signals, "domain_signal": new_signal},
+            )
+        )
+        changes.append(
+            RelabelChange(
+                document_id=trust.document_id,
+                domain=host,
+                old_score=trust.score,
+                new_score=new_score,
+                old_label=trust.label,
+                new_label=new_label,
+            )
+        )
+    if not dry_run:
+        storage.update_trust_assessments(updates)
+    return changes
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Attempts per call and the jittered exponential backoff between them.
+
+    The wait before retry `n` (0-based) is drawn uniformly from
+    `[0, min(max_delay_s, base_delay_s * 2**n)]` ("full jitter"), so hosts
+    that failed together do not retry in lockstep.
+    """
+
+    max_attempts: int = 1
+    base_delay_s: float = 0.5
+    max_delay_s: float = 8.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        return rng.uniform(0.0, min(self.max_delay_s, self.base_delay_s * (2**retry)))
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one host.
+
+    After `failure_threshold` failures in a row the breaker opens and calls
+    fail fast. Once `reset_timeout_s` has passed, one trial call is let
+    through: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or self._clock() - self._opened_at >= self._reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial or self._clock() - self._opened_at < self._reset_timeout_s:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial = False
+        if self._opened_at is not None or self.failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+
+
+def _retryable(error: Exception) -> bool:
+    # A missing dependency does not fix itself between attempts.
+    return not isinstance(error, ModuleNotFoundError)
+
+
+class ScrapeGuard:
+    """
+    Retries and per-host circuit breaking around single scrape attempts.
+
+    `failure_threshold=None` disables the breakers, and the default
+    `RetryPolicy` makes one attempt, so a default guard only counts
+    outcomes. `counters` accumulates "succeeded", "failed", "retried" and
+    "short_circuited" (rejected by an open breaker without an attempt).
+    Errors for which `retryable` is false are raised at once.
+    """
+
+    def __init__(
+        self,
+        retry: RetryPolicy | None = None,
+        failure_threshold: int | None = None,
+        reset_timeout_s: float = 30.0,
+        retryable: Callable[[Exception], bool] = _retryable,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._retry = retry or RetryPolicy()
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._retryable = retryable
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.counters: Counter[str] = Counter()
+
+    def open_hosts(self) -> list[str]:
+        return sorted(host for host, breaker in self._breakers.items() if breaker.state == "open")
+
+    def run(self, url: str, attempt: Callable[[], T]) -> T:
+        breaker = self._admit(url)
+        retry = 0
+        while True:
+            try:
+                result = attempt()
+            except Exception as e:
+                wait = self._after_failure(breaker, e, retry)
+                if wait is None:
+                    raise
+                self._sleep(wait)
+                retry += 1
+            else:
+                self._after_success(breaker)
+                return result
+
+    async def run_async(self, url: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        breaker = self._admit(url)
+        retry = 0
+        while True:
+            try:
+                result = await attempt()
+            except Exception as e:
+                wait = self._after_failure(breaker, e, retry)
+                if wait is None:
+                    raise
+                await asyncio.sleep(wait)
+                retry += 1
+            else:
+                self._after_success(breaker)
+                return result
+
+    def _admit(self, url: str) -> CircuitBreaker | None:
+        if self._failure_threshold is None:
+            return None
+        host = (urlparse(url).hostname or "").lower()
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self._failure_threshold, self._reset_timeout_s, self._clock)
+        if not breaker.allow():
+            self.counters["short_circuited"] += 1
+            raise CircuitOpenError(f"circuit open for {host} after {breaker.failures} consecutive failures")
+        return breaker
+
+    def _after_success(self, breaker: CircuitBreaker | None) -> None:
+        if breaker is not None:
+            breaker.record_success()
+        self.counters["succeeded"] += 1
+
+    def _after_failure(self, breaker: CircuitBreaker | None, error: Exception, retry: int) -> float | None:
+        """Backoff before the next attempt, or None when the error should be raised."""
+        if breaker is not None:
+            breaker.record_failure()
+        last = retry + 1 >= self._retry.max_attempts
+        if last or not self._retryable(error) or (breaker is not None and not breaker.allow()):
+            self.counters["failed"] += 1
+            return None
+        self.counters["retried"] += 1
+        return self._retry.delay(retry, self._rng)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Collection, Iterable
 
+from .analysis import tokenize
 from .labels import Label, Lattice
 from .storage import Document, StoredTrustAssessment
 
@@ -37,9 +37,13 @@ class Retriever:
             assessment = assessment_by_doc.get(doc.id)
             if assessment is None:
                 continue
+            # Checked against the assessment loaded with the documents, so a
+            # relabel is always honoured.
             if label_cap is not None and not self._lattice.can_flow(assessment.label, label_cap):
                 continue
-            rank_score = self._rank(query_tokens, doc.clean_text)
+            # Stored term frequencies stand in for re-tokenizing the document.
+            doc_terms = doc.terms if doc.terms is not None else set(self._tokenize(doc.clean_text))
+            rank_score = self._rank(query_tokens, doc_terms)
             if rank_score <= 0:
                 continue
             scored.append(
@@ -59,13 +63,12 @@ class Retriever:
 
     @staticmethod
     def _tokenize(text: str) -> list[str]:
-        return re.findall(r"[a-z0-9]+", text.lower())
+        return tokenize(text.lower())
 
-    @classmethod
-    def _rank(cls, query_tokens: list[str], text: str) -> float:
+    @staticmethod
+    def _rank(query_tokens: list[str], doc_tokens: Collection[str]) -> float:
         if not query_tokens:
             return 0.0
-        doc_tokens = set(cls._tokenize(text))
         if not doc_tokens:
             return 0.0
         overlap = sum(1 for token in query_tokens if token in doc_tokens)
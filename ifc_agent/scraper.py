@@ -1,7 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import http.client
+import re
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Sequence
+from urllib.parse import quote, unquote, urlparse
+from urllib.request import url2pathname
+
+from .domains import DomainSuffixSet
+from .extract import TRUNCATION_MARKER, ExtractedPage, extract_from_stream, extract_text
+from .http_fetch import FetchResponse, HTTPFetcher
+from .page_load import LoadStrategies, LoadStrategy, ResourceFilter, response_size
+from .resilience import ScrapeGuard
+
+_PLAYWRIGHT_REQUIRED = "Playwright is required for scraping. Install it with 'pip install playwright'."
+HTML_CONTENT_TYPES = frozenset({"", "text/html", "application/xhtml+xml"})
+_JS_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "requires javascript",
+    "javascript is disabled",
+    "turn on javascript",
+)
+# An empty mount point such as <div id="root"></div> is a client-rendered app shell.
+_APP_SHELL = re.compile(r"<div[^>]*\bid=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>", re.IGNORECASE)
 
 
 @dataclass(frozen=True)
@@ -10,40 +37,764 @@ class ScrapedContent:
     fetched_at: str
     raw_html: str
     clean_text: str
+    # "http" for the plain-HTTP tier, "browser" when rendered by Playwright,
+    # "file" when read from disk by `LocalFileScraper`, "warc" when read
+    # from an archive by `WarcReader`.
+    fetch_tier: str = "browser"
+    # Validators from the response, replayed on the next conditional fetch.
+    etag: str | None = None
+    last_modified: str | None = None
+    # Set when a conditional fetch got 304; the page fields are then empty.
+    not_modified: bool = False
+    # Time to a loaded page, and approximate bytes received for it
+    # (Content-Length of every response the page loaded).
+    load_ms: float | None = None
+    bytes_transferred: int | None = None
+
+
+@dataclass(frozen=True)
+class ScrapeOutcome:
+    """Result for one URL of a batch: exactly one of `content`/`error` is set."""
+
+    url: str
+    content: ScrapedContent | None = None
+    error: str | None = None
+
+
+def _page_text(raw_html: str, inner_text: str | None, max_page_bytes: int | None) -> tuple[str, str]:
+    if max_page_bytes is None:
+        return raw_html, inner_text or ""
+    extracted = extract_text(raw_html, max_bytes=max_page_bytes)
+    return extracted.raw_html, extracted.clean_text
+
+
+def _scraped(
+    url: str,
+    raw_html: str,
+    clean_text: str,
+    fetch_tier: str = "browser",
+    headers: dict[str, str] | None = None,
+    not_modified: bool = False,
+    load_ms: float | None = None,
+    bytes_transferred: int | None = None,
+) -> ScrapedContent:
+    headers = headers or {}
+    return ScrapedContent(
+        url=url,
+        fetched_at=datetime.now(timezone.utc).isoformat(),
+        raw_html=raw_html,
+        clean_text=clean_text.strip(),
+        fetch_tier=fetch_tier,
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+        not_modified=not_modified,
+        load_ms=None if load_ms is None else round(load_ms, 1),
+        bytes_transferred=bytes_transferred,
+    )
+
+
+def _is_timeout(error: Exception) -> bool:
+    # Playwright's sync and async TimeoutError classes share this name.
+    return type(error).__name__ == "TimeoutError"
+
+
+def _wait_capped(wait, target: str, timeout_ms: int | None) -> None:
+    if timeout_ms is None:
+        wait(target)
+        return
+    try:
+        wait(target, timeout=timeout_ms)
+    except Exception as e:
+        if not _is_timeout(e):
+            raise
+
+
+async def _wait_capped_async(wait, target: str, timeout_ms: int | None) -> None:
+    if timeout_ms is None:
+        await wait(target)
+        return
+    try:
+        await wait(target, timeout=timeout_ms)
+    except Exception as e:
+        if not _is_timeout(e):
+            raise
+
+
+def _response_headers(response: Any) -> dict[str, str]:
+    # Playwright returns None from goto for some navigations (e.g. data: URLs).
+    if response is None:
+        return {}
+    return {name.lower(): value for name, value in dict(response.headers).items()}
+
+
+def browser_render_reason(response: FetchResponse, page: ExtractedPage, min_text_chars: int) -> str | None:
+    """Return why a plain-HTTP fetch is not good enough, or None if it is."""
+    if response.status != 200:
+        return f"status {response.status}"
+    if response.content_type not in HTML_CONTENT_TYPES:
+        return f"content type {response.content_type}"
+    if len(page.clean_text) < min_text_chars:
+        return "too little text"
+    lowered = page.raw_html.lower()
+    pos = lowered.find("<noscript")
+    while pos != -1:
+        end = lowered.find("</noscript", pos)
+        section = lowered[pos : end if end != -1 else len(lowered)]
+        if any(marker in section for marker in _JS_REQUIRED_MARKERS):
+            return "noscript asks for javascript"
+        pos = lowered.find("<noscript", pos + 1)
+    if _APP_SHELL.search(page.raw_html):
+        return "client-rendered app shell"
+    return None
+
+
+class _HTTPTier:
+    """
+    The plain-HTTP step ahead of a browser render, shared by both scrapers.
+
+    `fetch` answers a conditional request (given validators) with a
+    `not_modified` result on 304, and with `http_first` returns pages that
+    `browser_render_reason` accepts. None means the URL needs the browser.
+    The fetcher is thread-safe, so the async scraper calls it from threads.
+    """
+
+    def __init__(
+        self,
+        fetcher: HTTPFetcher,
+        http_first: bool,
+        render_domains: Iterable[str] | DomainSuffixSet,
+        min_static_text_chars: int,
+        max_page_bytes: int | None,
+    ) -> None:
+        self._fetcher = fetcher
+        self._http_first = http_first
+        self._render_domains = (
+            render_domains if isinstance(render_domains, DomainSuffixSet) else DomainSuffixSet(render_domains)
+        )
+        self._min_static_text_chars = min_static_text_chars
+        self._max_page_bytes = max_page_bytes
+
+    def close(self) -> None:
+        self._fetcher.close()
+
+    def fetch(self, url: str, etag: str | None, last_modified: str | None) -> ScrapedContent | None:
+        if not url.lower().startswith(("http://", "https://")):
+            return None
+        conditional = etag is not None or last_modified is not None
+        # Render-only hosts still get the cheap conditional check.
+        render_only = not self._http_first or self._render_domains.match(urlparse(url).hostname or "") is not None
+        if render_only and not conditional:
+            return None
+        headers: dict[str, str] = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        started = time.perf_counter()
+        try:
+            response = self._fetcher.fetch(url, headers=headers)
+        except (OSError, http.client.HTTPException, ValueError):
+            # Anything the plain client cannot handle gets a browser attempt.
+            return None
+        if response.status == 304:
+            # A 304 may omit validators; the ones sent stay valid.
+            validators = {name: value for name, value in (("etag", etag), ("last-modified", last_modified)) if value}
+            validators.update(response.headers)
+            return _scraped(url, "", "", fetch_tier="http", headers=validators, not_modified=True)
+        if render_only:
+            return None
+        page = extract_text(response.text(), max_bytes=self._max_page_bytes)
+        if browser_render_reason(response, page, self._min_static_text_chars) is not None:
+            return None
+        clean_text = page.clean_text
+        if response.truncated and not page.truncated:
+            # The fetcher already stopped at the byte cap.
+            clean_text = f"{clean_text}\n{TRUNCATION_MARKER}"
+        return _scraped(
+            url,
+            page.raw_html,
+            clean_text,
+            fetch_tier="http",
+            headers=response.headers,
+            load_ms=(time.perf_counter() - started) * 1000,
+            bytes_transferred=response.wire_bytes,
+        )
+
+
+@dataclass
+class _PageSlot:
+    context: Any
+    page: Any
+    navigations: int = 0
+    bytes_received: int = 0
+
+    def count_response(self, response: Any) -> None:
+        self.bytes_received += response_size(response)
+
+
+@dataclass(frozen=True)
+class _Rendered:
+    raw_html: str
+    clean_text: str
+    headers: dict[str, str]
+    load_ms: float
+    bytes_transferred: int
+
+    def content(self, url: str) -> ScrapedContent:
+        return _scraped(
+            url,
+            self.raw_html,
+            self.clean_text,
+            headers=self.headers,
+            load_ms=self.load_ms,
+            bytes_transferred=self.bytes_transferred,
+        )
+
 
 class WebScraper:
-    def __init__(self, user_agent: str = "IFC-Agent/0.2") -> None:
+    """
+    Playwright scraper that can keep one browser alive across many URLs.
+
+    Used as a context manager (or via `open`/`close`) the scraper launches a
+    single browser on the first URL that needs one and keeps it, reusing
+    browser contexts and pages from a small pool, until `close`. A context is
+    recycled after `max_navigations` page loads, and discarded immediately
+    when a navigation fails; a disconnected browser is relaunched on the next
+    scrape. Calling `scrape` on a scraper that is not open launches a browser
+    for that URL only.
+
+    With `http_first`, each URL is first fetched over plain HTTP and the
+    browser is used only when `browser_render_reason` flags the response
+    (error status, non-HTML, too little text, a noscript JavaScript notice
+    or an empty app shell) or the host is listed in `render_domains`.
+
+    Given an `etag` or `last_modified` from an earlier fetch, `scrape` first
+    sends a conditional GET and returns a `not_modified` result on 304.
+
+    Browser loads abort requests matched by `resource_filter` and wait for
+    readiness according to the URL's `LoadStrategy`. Each scrape runs under
+    `guard`, which can retry it and fail fast for hosts whose circuit is open.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = "IFC-Agent/0.2",
+        max_page_bytes: int | None = None,
+        headless: bool = True,
+        max_navigations: int = 50,
+        pool_size: int = 1,
+        navigation_timeout_ms: int = 60000,
+        http_first: bool = False,
+        render_domains: Iterable[str] | DomainSuffixSet = (),
+        min_static_text_chars: int = 200,
+        resource_filter: ResourceFilter | None = None,
+        load_strategies: LoadStrategies | None = None,
+        http_timeout_s: float = 15.0,
+        guard: ScrapeGuard | None = None,
+    ) -> None:
         self._user_agent = user_agent
+        # With a cap, text is extracted by streaming the page HTML instead of
+        # asking the browser for a second full copy via inner_text.
+        self._max_page_bytes = max_page_bytes
+        self._headless = headless
+        self._max_navigations = max(1, max_navigations)
+        self._pool_size = max(1, pool_size)
+        self._navigation_timeout_ms = navigation_timeout_ms
+        self._manager: Any = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        # Set by `open`: a launched browser is kept until `close`.
+        self._session = False
+        self._idle: list[_PageSlot] = []
+        self._http = _HTTPTier(
+            HTTPFetcher(user_agent=user_agent, timeout=http_timeout_s, max_bytes=max_page_bytes),
+            http_first,
+            render_domains,
+            min_static_text_chars,
+            max_page_bytes,
+        )
+        self._resource_filter = resource_filter or ResourceFilter()
+        self._load_strategies = load_strategies or LoadStrategies()
+        self.guard = guard or ScrapeGuard()
 
-    def scrape(self, url: str) -> ScrapedContent:
-        try:
-            # Import lazily so unit tests that replace the scraper can run
-            # without requiring Playwright in the environment.
-            from playwright.sync_api import sync_playwright
+    def __enter__(self) -> "WebScraper":
+        return self.open()
 
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=False)
-                context = browser.new_context(user_agent=self._user_agent)
-                page = context.new_page()
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
-                page.goto(url, timeout=60000)
-                page.wait_for_load_state("networkidle")
+    @property
+    def is_open(self) -> bool:
+        return self._session
 
-                raw_html = page.content()
-                clean_text = page.inner_text("body")
+    def open(self) -> "WebScraper":
+        # The browser itself is launched by the first page that needs it, so
+        # a session served entirely over HTTP never starts one.
+        self._session = True
+        return self
 
+    def close(self) -> None:
+        self._session = False
+        self._http.close()
+        for slot in self._idle:
+            self._close_slot(slot)
+        self._idle.clear()
+        browser, manager = self._browser, self._manager
+        self._browser = self._playwright = self._manager = None
+        if browser is not None:
+            try:
                 browser.close()
+            except Exception:
+                pass
+        if manager is not None:
+            manager.__exit__(None, None, None)
 
+    def scrape(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> ScrapedContent:
+        try:
+            return self.guard.run(url, lambda: self._scrape_once(url, etag, last_modified))
         except ModuleNotFoundError as e:
-            raise RuntimeError(
-                "Playwright is required for scraping. Install it with 'pip install playwright'."
-            ) from e
+            raise RuntimeError(_PLAYWRIGHT_REQUIRED) from e
         except Exception as e:
             raise RuntimeError(f"Failed to scrape {url}: {e}")
 
-        return ScrapedContent(
-            url=url,
-            fetched_at=datetime.now(timezone.utc).isoformat(),
-            raw_html=raw_html,
-            clean_text=clean_text.strip(),
+    def _scrape_once(self, url: str, etag: str | None, last_modified: str | None) -> ScrapedContent:
+        static = self._http.fetch(url, etag, last_modified)
+        if static is not None:
+            return static
+        ephemeral = not self._session
+        if self._browser is None:
+            self._launch()
+        try:
+            rendered = self._render(url)
+        finally:
+            if ephemeral:
+                self.close()
+        return rendered.content(url)
+
+    def _launch(self) -> None:
+        # Import lazily so unit tests that replace the scraper can run
+        # without requiring Playwright in the environment.
+        from playwright.sync_api import sync_playwright
+
+        manager = sync_playwright()
+        playwright = manager.__enter__()
+        try:
+            browser = playwright.chromium.launch(headless=self._headless)
+        except BaseException:
+            manager.__exit__(None, None, None)
+            raise
+        self._manager, self._playwright, self._browser = manager, playwright, browser
+
+    def _render(self, url: str) -> _Rendered:
+        slot = self._acquire()
+        strategy = self._load_strategies.for_url(url)
+        slot.bytes_received = 0
+        started = time.perf_counter()
+        try:
+            response = self._navigate(slot.page, url, strategy)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            raw_html = slot.page.content()
+            inner_text = slot.page.inner_text("body") if self._max_page_bytes is None else None
+            received = slot.bytes_received
+            if response is not None and not response_size(response):
+                # Chunked documents carry no length; count the HTML instead.
+                received += len(raw_html.encode("utf-8"))
+            raw_html, clean_text = _page_text(raw_html, inner_text, self._max_page_bytes)
+        except Exception:
+            # A failed navigation can leave the page or context unusable.
+            self._close_slot(slot)
+            raise
+        slot.navigations += 1
+        self._release(slot)
+        return _Rendered(raw_html, clean_text, _response_headers(response), load_ms, received)
+
+    def _navigate(self, page: Any, url: str, strategy: LoadStrategy) -> Any:
+        if strategy.goto_wait_until is None:
+            response = page.goto(url, timeout=self._navigation_timeout_ms)
+        else:
+            response = page.goto(url, timeout=self._navigation_timeout_ms, wait_until=strategy.goto_wait_until)
+        if strategy.wait == "networkidle":
+            _wait_capped(page.wait_for_load_state, "networkidle", strategy.timeout_ms)
+        elif strategy.wait == "selector":
+            _wait_capped(page.wait_for_selector, strategy.selector, strategy.timeout_ms)
+        return response
+
+    def _route(self, route: Any) -> None:
+        request = route.request
+        if self._resource_filter.blocks(request.resource_type, request.url, request.is_navigation_request()):
+            route.abort()
+        else:
+            route.continue_()
+
+    def _acquire(self) -> _PageSlot:
+        if not self._browser.is_connected():
+            # The browser crashed or was killed: its contexts died with it.
+            self._idle.clear()
+            self._browser = self._playwright.chromium.launch(headless=self._headless)
+        if self._idle:
+            return self._idle.pop()
+        context = self._browser.new_context(user_agent=self._user_agent)
+        if self._resource_filter:
+            context.route("**/*", self._route)
+        slot = _PageSlot(context=context, page=context.new_page())
+        slot.page.on("response", slot.count_response)
+        return slot
+
+    def _release(self, slot: _PageSlot) -> None:
+        if slot.navigations >= self._max_navigations or len(self._idle) >= self._pool_size:
+            self._close_slot(slot)
+        else:
+            self._idle.append(slot)
+
+    @staticmethod
+    def _close_slot(slot: _PageSlot) -> None:
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+
+
+class AsyncWebScraper:
+    """
+    Concurrent Playwright scraper built on the async API.
+
+    `scrape_many` fetches a batch with at most `max_concurrency` pages in
+    flight overall and `per_host_limit` per host, and returns one
+    `ScrapeOutcome` per input URL, in input order, so a failing URL never
+    aborts the rest of the batch. Pages come from a pool of reusable
+    contexts recycled as in `WebScraper`.
+
+    Each URL first goes through the same HTTP tier as `WebScraper`
+    (conditional revalidation, and `http_first` static fetches) on a worker
+    thread; the browser is launched only once a URL needs rendering.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = "IFC-Agent/0.2",
+        max_page_bytes: int | None = None,
+        headless: bool = True,
+        max_concurrency: int = 8,
+        per_host_limit: int = 2,
+        max_navigations: int = 50,
+        navigation_timeout_ms: int = 60000,
+        resource_filter: ResourceFilter | None = None,
+        load_strategies: LoadStrategies | None = None,
+        guard: ScrapeGuard | None = None,
+        http_first: bool = False,
+        render_domains: Iterable[str] | DomainSuffixSet = (),
+        min_static_text_chars: int = 200,
+        http_timeout_s: float = 15.0,
+    ) -> None:
+        self._user_agent = user_agent
+        self._max_page_bytes = max_page_bytes
+        self._headless = headless
+        self._max_concurrency = max(1, max_concurrency)
+        self._http = _HTTPTier(
+            HTTPFetcher(user_agent=user_agent, timeout=http_timeout_s, max_bytes=max_page_bytes),
+            http_first,
+            render_domains,
+            min_static_text_chars,
+            max_page_bytes,
+        )
+        self._per_host_limit = max(1, per_host_limit)
+        self._max_navigations = max(1, max_navigations)
+        self._navigation_timeout_ms = navigation_timeout_ms
+        self._manager: Any = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._idle: list[_PageSlot] = []
+        self._relaunch_lock: asyncio.Lock | None = None
+        self._resource_filter = resource_filter or ResourceFilter()
+        self._load_strategies = load_strategies or LoadStrategies()
+        self.guard = guard or ScrapeGuard()
+
+    async def __aenter__(self) -> "AsyncWebScraper":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._browser is not None
+
+    async def open(self) -> "AsyncWebScraper":
+        if self._browser is None:
+            try:
+                from playwright.async_api import async_playwright
+            except ModuleNotFoundError as e:
+                raise RuntimeError(_PLAYWRIGHT_REQUIRED) from e
+            manager = async_playwright()
+            playwright = await manager.__aenter__()
+            try:
+                browser = await playwright.chromium.launch(headless=self._headless)
+            except BaseException:
+                await manager.__aexit__(None, None, None)
+                raise
+            self._manager, self._playwright, self._browser = manager, playwright, browser
+            if self._relaunch_lock is None:
+                self._relaunch_lock = asyncio.Lock()
+        return self
+
+    async def close(self) -> None:
+        self._http.close()
+        self._relaunch_lock = None
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await self._close_slot(slot)
+        browser, manager = self._browser, self._manager
+        self._browser = self._playwright = self._manager = None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if manager is not None:
+            await manager.__aexit__(None, None, None)
+
+    async def scrape(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> ScrapedContent:
+        outcome = (await self.scrape_many([url], validators=[(etag, last_modified)]))[0]
+        if outcome.content is None:
+            raise RuntimeError(outcome.error)
+        return outcome.content
+
+    async def scrape_many(
+        self,
+        urls: Iterable[str],
+        on_outcome: Callable[[int, ScrapeOutcome], None] | None = None,
+        validators: Sequence[tuple[str | None, str | None]] | None = None,
+    ) -> list[ScrapeOutcome]:
+        """
+        Scrape `urls` concurrently. `validators`, parallel to `urls`, holds
+        the (etag, last_modified) of an earlier fetch for a conditional
+        request. `on_outcome(position, outcome)` is called as each URL
+        finishes, on the event loop; a callback that blocks pauses the whole
+        batch, which callers can use as backpressure.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        conditions = list(validators) if validators is not None else [(None, None)] * len(urls)
+        # A scraper that is not open launches its browser on first need and
+        # closes it after the batch.
+        ephemeral = self._browser is None
+        if self._relaunch_lock is None:
+            self._relaunch_lock = asyncio.Lock()
+        # Semaphores are bound to the running loop, so they are per batch.
+        global_limit = asyncio.Semaphore(self._max_concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+
+        async def _one(position: int, url: str) -> ScrapeOutcome:
+            outcome = await _scrape(url, *conditions[position])
+            if on_outcome is not None:
+                on_outcome(position, outcome)
+            return outcome
+
+        async def _scrape(url: str, etag: str | None, last_modified: str | None) -> ScrapeOutcome:
+            host = (urlparse(url).hostname or "").lower()
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(self._per_host_limit))
+
+            async def _attempt() -> ScrapedContent:
+                # Take the host slot first so a busy host does not hold global
+                # slots; both are released while a retry backs off.
+                async with host_limit, global_limit:
+                    static = await asyncio.to_thread(self._http.fetch, url, etag, last_modified)
+                    if static is not None:
+                        return static
+                    return (await self._render(url)).content(url)
+
+            try:
+                content = await self.guard.run_async(url, _attempt)
+            except Exception as e:
+                return ScrapeOutcome(url=url, error=f"Failed to scrape {url}: {e}")
+            return ScrapeOutcome(url=url, content=content)
+
+        try:
+            return list(await asyncio.gather(*(_one(position, url) for position, url in enumerate(urls))))
+        finally:
+            if ephemeral:
+                await self.close()
+
+    async def _render(self, url: str) -> _Rendered:
+        slot = await self._acquire()
+        strategy = self._load_strategies.for_url(url)
+        slot.bytes_received = 0
+        started = time.perf_counter()
+        try:
+            response = await self._navigate(slot.page, url, strategy)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            raw_html = await slot.page.content()
+            inner_text = await slot.page.inner_text("body") if self._max_page_bytes is None else None
+            received = slot.bytes_received
+            if response is not None and not response_size(response):
+                received += len(raw_html.encode("utf-8"))
+            raw_html, clean_text = _page_text(raw_html, inner_text, self._max_page_bytes)
+        except Exception:
+            await self._close_slot(slot)
+            raise
+        slot.navigations += 1
+        if slot.navigations >= self._max_navigations or len(self._idle) >= self._max_concurrency:
+            await self._close_slot(slot)
+        else:
+            self._idle.append(slot)
+        return _Rendered(raw_html, clean_text, _response_headers(response), load_ms, received)
+
+    async def _navigate(self, page: Any, url: str, strategy: LoadStrategy) -> Any:
+        if strategy.goto_wait_until is None:
+            response = await page.goto(url, timeout=self._navigation_timeout_ms)
+        else:
+            response = await page.goto(url, timeout=self._navigation_timeout_ms, wait_until=strategy.goto_wait_until)
+        if strategy.wait == "networkidle":
+            await _wait_capped_async(page.wait_for_load_state, "networkidle", strategy.timeout_ms)
+        elif strategy.wait == "selector":
+            await _wait_capped_async(page.wait_for_selector, strategy.selector, strategy.timeout_ms)
+        return response
+
+    async def _route(self, route: Any) -> None:
+        request = route.request
+        if self._resource_filter.blocks(request.resource_type, request.url, request.is_navigation_request()):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self) -> _PageSlot:
+        if self._browser is None:
+            async with self._relaunch_lock:
+                if self._browser is None:
+                    await self.open()
+        if not self._browser.is_connected():
+            async with self._relaunch_lock:
+                # Another task may have relaunched while this one waited.
+                if not self._browser.is_connected():
+                    self._idle.clear()
+                    self._browser = await self._playwright.chromium.launch(headless=self._headless)
+        if self._idle:
+            return self._idle.pop()
+        context = await self._browser.new_context(user_agent=self._user_agent)
+        if self._resource_filter:
+            await context.route("**/*", self._route)
+        slot = _PageSlot(context=context, page=await context.new_page())
+        slot.page.on("response", slot.count_response)
+        return slot
+
+    @staticmethod
+    async def _close_slot(slot: _PageSlot) -> None:
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+
+class LocalFileScraper:
+    """
+    Serves pages from disk, returning the same `ScrapedContent` as `WebScraper`.
+
+    `file://` URLs are read directly. `url_map` maps URL prefixes to
+    directories (for example `{"http://localhost:8000/": "mock_web"}`), so a
+    local site is ingested without a server or browser; the longest matching
+    prefix wins and paths may not escape the mapped directory. The ETag is
+    derived from the file's size and mtime, so revalidating an unchanged file
+    does not read it.
+    """
+
+    def __init__(
+        self,
+        url_map: Mapping[str, str | Path] | None = None,
+        max_page_bytes: int | None = None,
+    ) -> None:
+        self._url_map = sorted(
+            ((prefix, Path(root)) for prefix, root in (url_map or {}).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
         )
+        self._max_page_bytes = max_page_bytes
+
+    # Same lifecycle as `WebScraper`; there is nothing to launch.
+    def __enter__(self) -> "LocalFileScraper":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> "LocalFileScraper":
+        return self
+
+    def close(self) -> None:
+        pass
+
+    def path_for(self, url: str) -> Path:
+        parsed = urlparse(url)
+        if parsed.scheme == "file":
+            if parsed.netloc not in ("", "localhost"):
+                raise ValueError(f"Remote file URL: {url}")
+            return self._index(Path(url2pathname(parsed.path)))
+        base = url.split("#", 1)[0].split("?", 1)[0]
+        for prefix, root in self._url_map:
+            if base.startswith(prefix):
+                root = root.resolve()
+                path = (root / unquote(base[len(prefix) :]).lstrip("/")).resolve()
+                if not path.is_relative_to(root):
+                    raise ValueError(f"URL escapes {root}: {url}")
+                return self._index(path)
+        raise ValueError(f"No local file mapped for {url}")
+
+    def directory_urls(self, directory: str | Path, pattern: str = "*.html") -> list[str]:
+        """URLs for the files under `directory`, through `url_map` when it covers it."""
+        root = Path(directory).resolve()
+        paths = sorted(path for path in root.glob(pattern) if path.is_file())
+        for prefix, mapped in self._url_map:
+            if mapped.resolve() == root:
+                base = prefix if prefix.endswith("/") else f"{prefix}/"
+                return [base + quote(path.relative_to(root).as_posix()) for path in paths]
+        return [path.as_uri() for path in paths]
+
+    def scrape(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> ScrapedContent:
+        started = time.perf_counter()
+        try:
+            path = self.path_for(url)
+            stat = path.stat()
+            headers = {
+                "etag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+                "last-modified": formatdate(stat.st_mtime, usegmt=True),
+            }
+            if etag is not None:
+                unchanged = etag == headers["etag"]
+            else:
+                unchanged = last_modified is not None and last_modified == headers["last-modified"]
+            if unchanged:
+                return _scraped(url, "", "", fetch_tier="file", headers=headers, not_modified=True)
+            with path.open("rb") as stream:
+                page = extract_from_stream(stream, max_bytes=self._max_page_bytes)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Failed to scrape {url}: {e}")
+        return _scraped(
+            url,
+            page.raw_html,
+            page.clean_text,
+            fetch_tier="file",
+            headers=headers,
+            load_ms=(time.perf_counter() - started) * 1000,
+            bytes_transferred=page.bytes_read,
+        )
+
+    @staticmethod
+    def _index(path: Path) -> Path:
+        return path / "index.html" if path.is_dir() else path
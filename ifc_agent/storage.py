@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import json
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
 from uuid import uuid4
-from hashlib import sha256
 
-from .labels import Label, make_label
+from .analysis import AnalyzedText, content_hash
+from .clearance import ClearanceIndex
+from .labels import Label, Lattice, label_from_json, label_to_json
 from .parser import TrustAssessment
 from .scraper import ScrapedContent
 
 
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
 @dataclass(frozen=True)
 class Document:
     id: str
@@ -18,6 +28,8 @@ class Document:
     fetched_at: str
     raw_html: str
     clean_text: str
+    # Term frequencies from ingest-time analysis; None for legacy rows.
+    terms: dict[str, int] | None = None
 
 
 @dataclass(frozen=True)
@@ -26,129 +38,472 @@ class StoredTrustAssessment:
     score: float
     label: Label
     signals: dict[str, float | str | bool | int]
+    scrape_label: Label | None = None
+
+
+@dataclass(frozen=True)
+class StoreItem:
+    """One document for `JSONStorage.store_documents`; see `store_document`."""
+
+    content: ScrapedContent
+    assessment: TrustAssessment
+    scrape_label: Label | None = None
+    analyzed: AnalyzedText | None = None
+
+
+class _RowIndex:
+    """
+    Lookups over one loaded payload for `store_documents`.
+
+    Kept for as long as `deferred_save` holds the payload and updated row by
+    row, so a long ingest never rescans the store. Host membership is kept
+    as insertion-ordered dicts and written back to the payload's list-valued
+    `domain_index` only when it is read or saved.
+    """
+
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+        self.by_url: dict[str, int] = {}
+        self.by_hash: dict[str, int] = {}
+        for i, doc in enumerate(payload["documents"]):
+            self.by_url.setdefault(doc["url"], i)
+            self.by_hash.setdefault(JSONStorage._stored_hash(doc), i)
+        self.trust_at: dict[str, int] = {}
+        for j, row in enumerate(payload["trust_assessments"]):
+            self.trust_at.setdefault(row["document_id"], j)
+        self.hosts = {
+            host: dict.fromkeys(ids) for host, ids in JSONStorage._domain_index(payload).items()
+        }
+        self._hosts_dirty = False
+
+    def move_host(self, document_id: str, old_host: str | None, new_host: str) -> None:
+        if old_host == new_host:
+            return
+        if old_host is not None:
+            ids = self.hosts.get(old_host)
+            if ids is not None:
+                ids.pop(document_id, None)
+                if not ids:
+                    del self.hosts[old_host]
+        self.hosts.setdefault(new_host, {})[document_id] = None
+        self._hosts_dirty = True
+
+    def sync_domain_index(self) -> None:
+        if self._hosts_dirty:
+            self.payload["domain_index"] = {host: list(ids) for host, ids in self.hosts.items()}
+            self._hosts_dirty = False
 
 
 class JSONStorage:
     def __init__(self, path: str | Path) -> None:
         self._path = Path(path)
+        self._clearance_cache: tuple[tuple[int, int, int], ClearanceIndex] | None = None
+        # Payload held in memory by `deferred_save`, whether it changed, and
+        # the row index kept over it.
+        self._held: dict | None = None
+        self._held_dirty = False
+        self._held_index: _RowIndex | None = None
         self._ensure_file()
 
-    def _content_hash(self, text: str) -> str:
-        return sha256(text.encode("utf-8")).hexdigest()
+    @contextmanager
+    def deferred_save(self) -> Iterator[None]:
+        """
+        Hold the store in memory for the block: every load reuses one payload
+        and writes are saved once on exit, so many `store_documents` calls
+        cost one load and one write, and their URL/hash lookups are kept up
+        to date instead of rebuilt per call. The whole store must fit in
+        memory.
+        """
+        if self._held is not None:
+            yield
+            return
+        self._held = self._load()
+        try:
+            yield
+        finally:
+            payload, dirty, index = self._held, self._held_dirty, self._held_index
+            self._held, self._held_dirty, self._held_index = None, False, None
+            if dirty:
+                if index is not None:
+                    index.sync_domain_index()
+                self._save(payload)
 
     def store_document(
-        self, content: ScrapedContent, assessment: TrustAssessment
+        self,
+        content: ScrapedContent,
+        assessment: TrustAssessment,
+        scrape_label: Label | None = None,
+        analyzed: AnalyzedText | None = None,
     ) -> tuple[Document, StoredTrustAssessment]:
+        """
+        Insert or update a document and its trust row.
+
+        `analyzed` must be the analysis of `content.clean_text`; its hash drives
+        dedup and its term frequencies are stored for retrieval.
+        """
+        return self.store_documents([StoreItem(content, assessment, scrape_label, analyzed)])[0]
+
+    def store_documents(self, items: Iterable[StoreItem]) -> list[tuple[Document, StoredTrustAssessment]]:
+        """
+        Insert or update many documents with one load and one save.
+
+        Each item follows the `store_document` rules in order: a row with the
+        same URL or content hash is updated in place, so a later item may
+        update a row written earlier in the same batch.
+        """
         payload = self._load()
-        new_hash = self._content_hash(content.clean_text)
+        documents = payload["documents"]
+        trust_rows = payload["trust_assessments"]
+        index = self._row_index(payload)
+        by_url, by_hash, trust_at = index.by_url, index.by_hash, index.trust_at
 
-        # Check for duplicate by URL or content hash
-        for i, doc in enumerate(payload["documents"]):
-            existing_hash = self._content_hash(doc["clean_text"])
-            if doc["url"] == content.url or existing_hash == new_hash:
-                # Update existing document
-                payload["documents"][i] = {
-                    "id": doc["id"],
-                    "url": content.url,
-                    "fetched_at": content.fetched_at,
-                    "raw_html": content.raw_html,
-                    "clean_text": content.clean_text,
-                }
-                # Update trust assessment
-                for j, ta in enumerate(payload["trust_assessments"]):
-                    if ta["document_id"] == doc["id"]:
-                        payload["trust_assessments"][j] = {
-                            "document_id": doc["id"],
-                            "score": assessment.score,
-                            "label": {"level": assessment.label.level, "categories": sorted(assessment.label.categories)},
-                            "signals": assessment.signals,
-                        }
-                        break
-                self._save(payload)
-                stored_doc = Document(
-                    id=doc["id"],
-                    url=content.url,
-                    fetched_at=content.fetched_at,
-                    raw_html=content.raw_html,
-                    clean_text=content.clean_text,
-                )
-                stored_trust = StoredTrustAssessment(
-                    document_id=doc["id"],
-                    score=assessment.score,
-                    label=assessment.label,
-                    signals=assessment.signals,
+        stored: list[tuple[Document, StoredTrustAssessment]] = []
+        for item in items:
+            content = item.content
+            analyzed = item.analyzed or AnalyzedText.from_text(content.clean_text)
+            new_hash = analyzed.content_hash
+            matches = [i for i in (by_url.get(content.url), by_hash.get(new_hash)) if i is not None]
+            if matches:
+                # Update the first row that shares the URL or the content.
+                i = min(matches)
+                old = documents[i]
+                doc_id = old["id"]
+                old_host: str | None = _host(old["url"])
+                if by_url.get(old["url"]) == i:
+                    del by_url[old["url"]]
+                if by_hash.get(old["content_hash"]) == i:
+                    del by_hash[old["content_hash"]]
+                documents[i] = self._document_row(doc_id, content, analyzed)
+                j = trust_at.get(doc_id)
+                if j is not None:
+                    trust_rows[j] = self._trust_row(doc_id, item.assessment, item.scrape_label)
+            else:
+                i = len(documents)
+                doc_id = str(uuid4())
+                old_host = None
+                documents.append(self._document_row(doc_id, content, analyzed))
+                trust_at[doc_id] = len(trust_rows)
+                trust_rows.append(self._trust_row(doc_id, item.assessment, item.scrape_label))
+            by_url[content.url] = min(by_url.get(content.url, i), i)
+            by_hash[new_hash] = min(by_hash.get(new_hash, i), i)
+            index.move_host(doc_id, old_host, _host(content.url))
+
+            stored.append(
+                (
+                    Document(
+                        id=doc_id,
+                        url=content.url,
+                        fetched_at=content.fetched_at,
+                        raw_html=content.raw_html,
+                        clean_text=content.clean_text,
+                        terms=analyzed.terms,
+                    ),
+                    StoredTrustAssessment(
+                        document_id=doc_id,
+                        score=item.assessment.score,
+                        label=item.assessment.label,
+                        signals=item.assessment.signals,
+                        scrape_label=item.scrape_label,
+                    ),
                 )
-                return stored_doc, stored_trust
+            )
+        if stored:
+            if payload is not self._held:
+                index.sync_domain_index()
+            self._save(payload)
+        return stored
 
-        # New document
-        doc_id = str(uuid4())
-        payload["documents"].append({
-            "id": doc_id,
+    def update_trust_assessments(self, updates: Iterable[StoredTrustAssessment]) -> int:
+        """Rewrite score, label and signals of existing rows in one save."""
+        by_id = {item.document_id: item for item in updates}
+        if not by_id:
+            return 0
+        payload = self._load()
+        updated = 0
+        for j, row in enumerate(payload["trust_assessments"]):
+            item = by_id.get(row["document_id"])
+            if item is None:
+                continue
+            payload["trust_assessments"][j] = {
+                **row,
+                "score": item.score,
+                "label": label_to_json(item.label),
+                "signals": item.signals,
+            }
+            updated += 1
+        self._save(payload)
+        return updated
+
+    def load_domain_index(self) -> dict[str, list[str]]:
+        """Map each host to the ids of documents stored from it."""
+        payload = self._load()
+        if self._held_index is not None and payload is self._held:
+            self._held_index.sync_domain_index()
+        return self._domain_index(payload)
+
+    def load_documents(self) -> list[Document]:
+        payload = self._load()
+        return [self._document_from_row(item) for item in payload["documents"]]
+
+    def load_trust_assessments(self) -> list[StoredTrustAssessment]:
+        payload = self._load()
+        return [self._trust_from_row(item) for item in payload["trust_assessments"]]
+
+    def load_stored(self, document_ids: Iterable[str]) -> dict[str, tuple[Document, StoredTrustAssessment]]:
+        """Load the given documents with their trust rows; unknown ids are omitted."""
+        wanted = set(document_ids)
+        if not wanted:
+            return {}
+        payload = self._load()
+        trusts = {
+            item["document_id"]: self._trust_from_row(item)
+            for item in payload["trust_assessments"]
+            if item["document_id"] in wanted
+        }
+        stored: dict[str, tuple[Document, StoredTrustAssessment]] = {}
+        for item in payload["documents"]:
+            trust = trusts.get(item["id"])
+            if trust is not None:
+                stored[item["id"]] = (self._document_from_row(item), trust)
+        return stored
+
+    def load_clearance_index(self, lattice: Lattice) -> ClearanceIndex:
+        # Reuse the index until the store file changes on disk.
+        stat = self._path.stat()
+        key = (stat.st_mtime_ns, stat.st_size, id(lattice))
+        if self._clearance_cache is not None and self._clearance_cache[0] == key:
+            return self._clearance_cache[1]
+        index = ClearanceIndex.from_assessments(lattice, self.load_trust_assessments())
+        self._clearance_cache = (key, index)
+        return index
+
+    @staticmethod
+    def _document_row(document_id: str, content: ScrapedContent, analyzed: AnalyzedText) -> dict:
+        return {
+            "id": document_id,
             "url": content.url,
             "fetched_at": content.fetched_at,
             "raw_html": content.raw_html,
             "clean_text": content.clean_text,
-        })
-        payload["trust_assessments"].append({
-            "document_id": doc_id,
-            "score": assessment.score,
-            "label": {"level": assessment.label.level, "categories": sorted(assessment.label.categories)},
-            "signals": assessment.signals,
-        })
-        self._save(payload)
+            "content_hash": analyzed.content_hash,
+            "terms": analyzed.terms,
+        }
 
-        stored_doc = Document(
-            id=doc_id,
-            url=content.url,
-            fetched_at=content.fetched_at,
-            raw_html=content.raw_html,
-            clean_text=content.clean_text,
+    @staticmethod
+    def _document_from_row(item: dict) -> Document:
+        return Document(
+            id=item["id"],
+            url=item["url"],
+            fetched_at=item["fetched_at"],
+            raw_html=item["raw_html"],
+            clean_text=item["clean_text"],
+            terms=item.get("terms"),
         )
-        stored_trust = StoredTrustAssessment(
-            document_id=doc_id,
-            score=assessment.score,
-            label=assessment.label,
-            signals=assessment.signals,
+
+    @staticmethod
+    def _trust_from_row(item: dict) -> StoredTrustAssessment:
+        label = label_from_json(item["label"])
+        if "scrape_label" in item:
+            scrape_label = label_from_json(item["scrape_label"]) if item["scrape_label"] else None
+        else:
+            # Rows written before scrape labels were recorded: the stored
+            # label is the only safe floor for later relabelling.
+            scrape_label = label
+        return StoredTrustAssessment(
+            document_id=item["document_id"],
+            score=float(item["score"]),
+            label=label,
+            signals=item.get("signals", {}),
+            scrape_label=scrape_label,
         )
-        return stored_doc, stored_trust
 
-    def load_documents(self) -> list[Document]:
-        payload = self._load()
-        return [
-            Document(
-                id=item["id"],
-                url=item["url"],
-                fetched_at=item["fetched_at"],
-                raw_html=item["raw_html"],
-                clean_text=item["clean_text"],
-            )
-            for item in payload["documents"]
-        ]
+    @staticmethod
+    def _stored_hash(doc: dict) -> str:
+        # Rows written before hashes were stored are hashed on demand.
+        if "content_hash" not in doc:
+            doc["content_hash"] = content_hash(doc["clean_text"])
+        return doc["content_hash"]
 
-    def load_trust_assessments(self) -> list[StoredTrustAssessment]:
-        payload = self._load()
-        assessments: list[StoredTrustAssessment] = []
-        for item in payload["trust_assessments"]:
-            label_obj = item["label"]
-            assessments.append(
-                StoredTrustAssessment(
-                    document_id=item["document_id"],
-                    score=float(item["score"]),
-                    label=make_label(label_obj["level"], label_obj.get("categories", [])),
-                    signals=item.get("signals", {}),
-                )
-            )
-        return assessments
+    @staticmethod
+    def _trust_row(
+        document_id: str,
+        assessment: TrustAssessment,
+        scrape_label: Label | None,
+    ) -> dict:
+        return {
+            "document_id": document_id,
+            "score": assessment.score,
+            "label": label_to_json(assessment.label),
+            "signals": assessment.signals,
+            "scrape_label": label_to_json(scrape_label) if scrape_label is not None else None,
+        }
+
+    @staticmethod
+    def _domain_index(payload: dict) -> dict[str, list[str]]:
+        # Stores written before the index existed get it rebuilt on first use.
+        if "domain_index" not in payload:
+            index: dict[str, list[str]] = {}
+            for doc in payload["documents"]:
+                index.setdefault(_host(doc["url"]), []).append(doc["id"])
+            payload["domain_index"] = index
+        return payload["domain_index"]
+
+    def _row_index(self, payload: dict) -> _RowIndex:
+        if payload is not self._held:
+            return _RowIndex(payload)
+        if self._held_index is None:
+            self._held_index = _RowIndex(payload)
+        return self._held_index
 
     def _ensure_file(self) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
         if not self._path.exists():
-            self._save({"documents": [], "trust_assessments": []})
+            self._save({"documents": [], "trust_assessments": [], "domain_index": {}})
 
     def _load(self) -> dict:
+        if self._held is not None:
+            return self._held
         with self._path.open("r", encoding="utf-8") as handle:
             return json.load(handle)
 
     def _save(self, payload: dict) -> None:
+        self._clearance_cache = None
+        if payload is self._held:
+            self._held_dirty = True
+            return
         with self._path.open("w", encoding="utf-8") as handle:
             json.dump(payload, handle, indent=2)
+
+
+class _JSONFileCache:
+    """
+    Entries of one JSON file kept next to the store, loaded on first use.
+
+    Writes are buffered until `flush`, which replaces the file in one rename
+    so a crash mid-write never leaves it truncated. With `max_entries`, the
+    oldest entries are dropped first.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int | None = None) -> None:
+        self._path = Path(path)
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, dict] | None = None
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self._path.with_name(f"{self._path.name}.tmp")
+        with partial.open("w", encoding="utf-8") as handle:
+            json.dump({"entries": self._load()}, handle)
+        os.replace(partial, self._path)
+        self._dirty = False
+
+    def _get(self, key: str) -> dict | None:
+        return self._load().get(key)
+
+    def _put(self, key: str, item: dict) -> None:
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = item
+        if self._max_entries is not None:
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+        self._dirty = True
+
+    def _load(self) -> OrderedDict[str, dict]:
+        if self._entries is None:
+            if self._path.exists():
+                with self._path.open("r", encoding="utf-8") as handle:
+                    self._entries = OrderedDict(json.load(handle).get("entries", {}))
+            else:
+                self._entries = OrderedDict()
+        return self._entries
+
+
+class JSONAssessmentCache(_JSONFileCache):
+    """
+    Persistent memo of trust assessments keyed by `TrustParser.cache_key`.
+
+    Kept in its own file next to the store so a cache reset never touches
+    stored documents. At most `max_entries` are kept, so a long archive
+    import cannot grow the cache (in memory or on disk) without bound.
+    """
+
+    DEFAULT_MAX_ENTRIES = 50_000
+
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        super().__init__(path, max_entries)
+
+    @classmethod
+    def beside(cls, storage_path: str | Path) -> "JSONAssessmentCache":
+        storage_path = Path(storage_path)
+        return cls(storage_path.with_name(f"{storage_path.stem}.assessments.json"))
+
+    def get(self, key: str) -> TrustAssessment | None:
+        item = self._get(key)
+        if item is None:
+            return None
+        return TrustAssessment(
+            score=float(item["score"]),
+            label=label_from_json(item["label"]),
+            signals=item.get("signals", {}),
+        )
+
+    def put(self, key: str, assessment: TrustAssessment) -> None:
+        self._put(
+            key,
+            {
+                "score": assessment.score,
+                "label": label_to_json(assessment.label),
+                "signals": assessment.signals,
+            },
+        )
+
+
+@dataclass(frozen=True)
+class FetchRecord:
+    url: str
+    document_id: str
+    # When the stored content was fetched, and when it was last confirmed
+    # current (a fresh fetch or a 304 revalidation).
+    fetched_at: str
+    checked_at: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class JSONFetchCache(_JSONFileCache):
+    """
+    Per-URL fetch validators kept next to the store.
+
+    Recording a revalidation only touches this file, so a 304 response never
+    rewrites the document store.
+    """
+
+    @classmethod
+    def beside(cls, storage_path: str | Path) -> "JSONFetchCache":
+        storage_path = Path(storage_path)
+        return cls(storage_path.with_name(f"{storage_path.stem}.fetch.json"))
+
+    def get(self, url: str) -> FetchRecord | None:
+        item = self._get(url)
+        if item is None:
+            return None
+        return FetchRecord(url=url, **item)
+
+    def put(self, record: FetchRecord) -> None:
+        self._put(
+            record.url,
+            {
+                "document_id": record.document_id,
+                "fetched_at": record.fetched_at,
+                "checked_at": record.checked_at,
+                "etag": record.etag,
+                "last_modified": record.last_modified,
+            },
+        )
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+import asyncio
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+from urllib.parse import urlparse
 
+from .analysis import AnalyzedText
+from .domains import DomainSuffixSet, lookup_by_domain, normalize_domain
+from .extract import extract_links, extract_main_content
 from .labels import Label, Lattice
+from .page_load import LoadStrategies, ResourceFilter
 from .parser import TrustAssessment, TrustParser
+from .pipeline import Stage, StagePipeline
+from .resilience import RetryPolicy, ScrapeGuard
 from .retrieval import RetrievedDocument, Retriever
-from .scraper import WebScraper
-from .storage import JSONStorage
+from .scraper import AsyncWebScraper, LocalFileScraper, ScrapedContent, ScrapeOutcome, WebScraper
+from .storage import (
+    Document,
+    FetchRecord,
+    JSONAssessmentCache,
+    JSONFetchCache,
+    JSONStorage,
+    StoreItem,
+    StoredTrustAssessment,
+)
 
 
 @dataclass(frozen=True)
@@ -17,6 +36,42 @@ class ScrapeStoreResult:
     label: Label
     score: float
     signals: dict[str, float | str | bool | int]
+    fetch_tier: str = "browser"
+    # None for pages reused from storage without a fetch.
+    load_ms: float | None = None
+    bytes_transferred: int | None = None
+    # Outgoing links of the page; only filled when a batch collects links.
+    links: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ScrapeStoreBatch:
+    stored: list[ScrapeStoreResult]
+    # Outcomes of URLs that could not be scraped, in input order.
+    errors: list[ScrapeOutcome]
+    # Scrape attempt outcomes in this batch ("succeeded", "retried", ...).
+    scrape_counts: dict[str, int] = field(default_factory=dict)
+    # Hosts whose circuit breaker was open when the batch finished.
+    open_circuits: list[str] = field(default_factory=list)
+    # Per-stage throughput and queue depth (see `StageStats.as_dict`).
+    stage_stats: dict[str, dict[str, float | int]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class IngestReport:
+    stored: int
+    stage_stats: dict[str, dict[str, float | int]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _Fetched:
+    idx: int
+    url: str
+    record: FetchRecord | None
+    outcome: ScrapeOutcome
+    # Set by the parse stage for pages that are stored.
+    analyzed: AnalyzedText | None = None
+    assessment: TrustAssessment | None = None
 
 
 @dataclass(frozen=True)
@@ -29,75 +84,438 @@ class AgentTools:
         self,
         lattice: Lattice,
         storage_path: str,
-        trusted_domains: Iterable[str] | None = None,
-        blocked_domains: Iterable[str] | None = None,
+        trusted_domains: Iterable[str] | DomainSuffixSet | None = None,
+        blocked_domains: Iterable[str] | DomainSuffixSet | None = None,
         user_agent: str = "IFC-Agent/0.2",
+        parse_workers: int = 1,
+        max_page_bytes: int | None = None,
+        main_content_only: bool = False,
+        headless: bool = True,
+        max_navigations_per_context: int = 50,
+        scrape_concurrency: int = 1,
+        per_host_concurrency: int = 2,
+        http_first: bool = False,
+        render_domains: Iterable[str] | DomainSuffixSet | None = None,
+        min_static_text_chars: int = 200,
+        freshness_ttl_seconds: float = 0.0,
+        freshness_ttl_by_domain: dict[str, float] | None = None,
+        blocked_resource_types: Iterable[str] | None = None,
+        blocked_request_domains: Iterable[str] | DomainSuffixSet | None = None,
+        load_strategies: LoadStrategies | None = None,
+        scraper_backend: str = "browser",
+        local_url_map: dict[str, str] | None = None,
+        navigation_timeout_ms: int = 60000,
+        http_timeout_seconds: float = 15.0,
+        scrape_attempts: int = 1,
+        retry_base_delay_seconds: float = 0.5,
+        retry_max_delay_seconds: float = 8.0,
+        circuit_failure_threshold: int | None = None,
+        circuit_reset_seconds: float = 30.0,
+        pipeline_queue_size: int = 8,
+        parse_batch_size: int = 16,
+        store_batch_size: int = 32,
     ) -> None:
         self._lattice = lattice
-        self._scraper = WebScraper(user_agent=user_agent)
+        self._parse_workers = parse_workers
+        # Started on the first pooled parse and kept until close().
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._pipeline_queue_size = pipeline_queue_size
+        self._parse_batch_size = parse_batch_size
+        self._store_batch_size = store_batch_size
+        self._main_content_only = main_content_only
+        if scraper_backend not in ("browser", "local"):
+            raise ValueError(f"Unknown scraper backend: {scraper_backend}")
+        resource_filter = ResourceFilter(blocked_resource_types or (), blocked_request_domains or ())
+        # Shared by the sync and async scrapers so breakers see every attempt.
+        self._guard = ScrapeGuard(
+            retry=RetryPolicy(scrape_attempts, retry_base_delay_seconds, retry_max_delay_seconds),
+            failure_threshold=circuit_failure_threshold,
+            reset_timeout_s=circuit_reset_seconds,
+        )
+        self._scraper: WebScraper | LocalFileScraper
+        self._async_scraper: AsyncWebScraper | None = None
+        if scraper_backend == "local":
+            # Disk reads need neither a browser nor concurrency.
+            self._scraper = LocalFileScraper(url_map=local_url_map, max_page_bytes=max_page_bytes)
+        else:
+            self._scraper = WebScraper(
+                user_agent=user_agent,
+                max_page_bytes=max_page_bytes,
+                headless=headless,
+                max_navigations=max_navigations_per_context,
+                http_first=http_first,
+                render_domains=render_domains or (),
+                min_static_text_chars=min_static_text_chars,
+                resource_filter=resource_filter,
+                load_strategies=load_strategies,
+                navigation_timeout_ms=navigation_timeout_ms,
+                http_timeout_s=http_timeout_seconds,
+                guard=self._guard,
+            )
+        # With concurrency above 1, batches go through the async scraper; it
+        # opens its own browser per batch because it is bound to one event loop,
+        # so the sync scraper never launches one.
+        if scraper_backend == "browser" and scrape_concurrency > 1:
+            self._async_scraper = AsyncWebScraper(
+                user_agent=user_agent,
+                max_page_bytes=max_page_bytes,
+                headless=headless,
+                max_concurrency=scrape_concurrency,
+                per_host_limit=per_host_concurrency,
+                max_navigations=max_navigations_per_context,
+                resource_filter=resource_filter,
+                load_strategies=load_strategies,
+                navigation_timeout_ms=navigation_timeout_ms,
+                guard=self._guard,
+                http_first=http_first,
+                render_domains=render_domains or (),
+                min_static_text_chars=min_static_text_chars,
+                http_timeout_s=http_timeout_seconds,
+            )
+        self._assessment_cache = JSONAssessmentCache.beside(storage_path)
         self._parser = TrustParser(
             trusted_domains=trusted_domains,
             blocked_domains=blocked_domains,
+            cache=self._assessment_cache,
         )
         self._storage = JSONStorage(storage_path)
         self._retriever = Retriever(lattice)
+        self._fetch_cache = JSONFetchCache.beside(storage_path)
+        self._freshness_ttl_seconds = freshness_ttl_seconds
+        self._freshness_ttl_by_domain = {
+            normalize_domain(domain): float(ttl) for domain, ttl in (freshness_ttl_by_domain or {}).items()
+        }
+
+    def __enter__(self) -> "AgentTools":
+        # Keeps one browser alive for every scrape until the block exits; it is
+        # launched by the first page that falls through to the browser tier.
+        self._scraper.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._scraper.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
 
     def scrape_parse_store(
         self,
         urls: Iterable[str],
         scrape_label: Label | None = None,
     ) -> list[ScrapeStoreResult]:
-        
-        stored: list[ScrapeStoreResult] = []
-        
+        """Scrape, assess and store `urls`; raises if any URL failed to scrape."""
+        batch = self.scrape_parse_store_batch(urls, scrape_label)
+        if batch.errors:
+            raise RuntimeError(batch.errors[0].error)
+        return batch.stored
+
+    def scrape_parse_store_batch(
+        self,
+        urls: Iterable[str],
+        scrape_label: Label | None = None,
+        collect_links: bool = False,
+    ) -> ScrapeStoreBatch:
+        """
+        Like `scrape_parse_store`, but stores every page that could be scraped
+        and reports the failures instead of raising. With `collect_links`, each
+        result carries the page's outgoing links (see `extract_links`).
+
+        A URL stored earlier is reused without fetching while it is within its
+        freshness TTL, and revalidated with a conditional GET afterwards; a 304
+        reuses the stored document and assessment without touching the store.
+        Stored rows are only reused when their label already covers
+        `scrape_label`.
+        """
         if scrape_label and not self._lattice.is_valid_level(scrape_label.level):
             raise ValueError(f"Unknown scrape label level: {scrape_label.level}")
-        
-        for url in urls:
-            content = self._scraper.scrape(url)
-
-            assessment = self._parser.assess(
-                url,
-                content.clean_text,
-                content.raw_html,
-            )
 
-            final_level = assessment.label.level
-            final_categories = set(assessment.label.categories)
+        urls = list(urls)
+        now = datetime.now(timezone.utc)
+        records = {url: self._fetch_cache.get(url) for url in urls}
+        known = self._storage.load_stored(record.document_id for record in records.values() if record is not None)
 
-            if scrape_label is not None:
-                final_level = self._lattice.join_level(
-                    final_level,
-                    scrape_label.level,
-                )
-                final_categories.update(scrape_label.categories)
+        results: dict[int, ScrapeStoreResult] = {}
+        pending: list[tuple[int, str, FetchRecord | None]] = []
+        for idx, url in enumerate(urls):
+            record = records[url]
+            stored = known.get(record.document_id) if record is not None else None
+            if stored is None or not self._reusable(url, stored, scrape_label):
+                pending.append((idx, url, None))
+            elif self._is_fresh(record, now):
+                results[idx] = self._reused_result(url, stored, "fresh", collect_links)
+            else:
+                pending.append((idx, url, record))
 
-            final_label = Label(
-                level=final_level,
-                categories=frozenset(final_categories),
+        stage_stats: dict[str, dict[str, float | int]] = {}
+        errors: list[tuple[int, ScrapeOutcome]] = []
+        counts_before = Counter(self._guard.counters)
+        if pending:
+            # Fetching stays on this thread (the browser is bound to it) while
+            # parsing and storing run behind bounded queues.
+            pipeline = StagePipeline(
+                [
+                    Stage("parse", self._parse_stage, self._parse_batch_size),
+                    Stage(
+                        "store",
+                        lambda batch: self._store_stage(batch, scrape_label, known, collect_links),
+                        self._store_batch_size,
+                    ),
+                ],
+                queue_size=self._pipeline_queue_size,
             )
+            outputs, stage_stats = pipeline.run(lambda emit: self._scrape_all(pending, emit), source_name="fetch")
+            for idx, result, error in outputs:
+                if result is not None:
+                    results[idx] = result
+                else:
+                    errors.append((idx, error))
+        scrape_counts = dict(self._guard.counters - counts_before)
+        self._fetch_cache.flush()
+        self._assessment_cache.flush()
+        return ScrapeStoreBatch(
+            stored=[results[idx] for idx in sorted(results)],
+            errors=[error for _, error in sorted(errors, key=lambda item: item[0])],
+            scrape_counts=scrape_counts,
+            open_circuits=self._guard.open_hosts(),
+            stage_stats=stage_stats,
+        )
+
+    def ingest_pages(self, pages: Iterable[ScrapedContent], scrape_label: Label | None = None) -> IngestReport:
+        """
+        Assess and store pages fetched elsewhere (for example read from a WARC
+        archive) through the parse and store stages, with `scrape_label`
+        joined into every label as in `scrape_parse_store_batch`.
+
+        Nothing is fetched or reused and only a count is kept per page, but
+        the JSON store is held in memory for the whole ingest and written once
+        at the end (see `JSONStorage.deferred_save`): the stream can be long,
+        but the resulting store must fit in memory. Archived pages are not
+        recorded in the fetch cache.
+        """
+        if scrape_label and not self._lattice.is_valid_level(scrape_label.level):
+            raise ValueError(f"Unknown scrape label level: {scrape_label.level}")
+
+        stored = 0
 
-            safe_assessment = TrustAssessment(
-                score=assessment.score,
-                label=final_label,
-                signals=assessment.signals,
+        def _store(batch: list[_Fetched]) -> list:
+            nonlocal stored
+            stored += len(self._store_stage(batch, scrape_label, {}, False))
+            return []
+
+        pipeline = StagePipeline(
+            [Stage("parse", self._parse_stage, self._parse_batch_size), Stage("store", _store, self._store_batch_size)],
+            queue_size=self._pipeline_queue_size,
+        )
+
+        def _produce(emit: Callable[[_Fetched], None]) -> None:
+            for idx, page in enumerate(pages):
+                emit(_Fetched(idx, page.url, None, ScrapeOutcome(url=page.url, content=page)))
+
+        with self._storage.deferred_save():
+            _, stage_stats = pipeline.run(_produce, source_name="read")
+        self._fetch_cache.flush()
+        self._assessment_cache.flush()
+        return IngestReport(stored=stored, stage_stats=stage_stats)
+
+    def _freshness_ttl(self, url: str) -> float:
+        # The most specific configured domain wins over the default TTL.
+        ttl = lookup_by_domain(self._freshness_ttl_by_domain, urlparse(url).hostname or "")
+        return self._freshness_ttl_seconds if ttl is None else ttl
+
+    def _is_fresh(self, record: FetchRecord, now: datetime) -> bool:
+        ttl = self._freshness_ttl(record.url)
+        if ttl <= 0:
+            return False
+        age = now - datetime.fromisoformat(record.checked_at)
+        return age.total_seconds() < ttl
+
+    def _reusable(
+        self,
+        url: str,
+        stored: tuple[Document, StoredTrustAssessment],
+        scrape_label: Label | None,
+    ) -> bool:
+        document, trust = stored
+        # The row may since have been overwritten with another URL's content.
+        if document.url != url:
+            return False
+        return scrape_label is None or self._lattice.can_flow(scrape_label, trust.label)
+
+    @staticmethod
+    def _reused_result(
+        url: str,
+        stored: tuple[Document, StoredTrustAssessment],
+        fetch_tier: str,
+        collect_links: bool = False,
+    ) -> ScrapeStoreResult:
+        document, trust = stored
+        return ScrapeStoreResult(
+            document_id=document.id,
+            url=url,
+            label=trust.label,
+            score=trust.score,
+            signals=trust.signals,
+            fetch_tier=fetch_tier,
+            links=tuple(extract_links(document.raw_html, url)) if collect_links else (),
+        )
+
+    def _scrape_all(
+        self,
+        items: list[tuple[int, str, FetchRecord | None]],
+        emit: Callable[[_Fetched], None],
+    ) -> None:
+        if self._async_scraper is not None:
+            asyncio.run(
+                self._async_scraper.scrape_many(
+                    (url for _, url, _ in items),
+                    on_outcome=lambda pos, outcome: emit(_Fetched(*items[pos], outcome)),
+                    validators=[
+                        (record.etag, record.last_modified) if record is not None else (None, None)
+                        for _, _, record in items
+                    ],
+                )
             )
+            return
+        for idx, url, record in items:
+            try:
+                if record is not None and (record.etag or record.last_modified):
+                    content = self._scraper.scrape(url, etag=record.etag, last_modified=record.last_modified)
+                else:
+                    content = self._scraper.scrape(url)
+                emit(_Fetched(idx, url, record, ScrapeOutcome(url=url, content=content)))
+            except RuntimeError as e:
+                emit(_Fetched(idx, url, record, ScrapeOutcome(url=url, error=str(e))))
 
-            document, trust = self._storage.store_document(
-                content,
-                safe_assessment,
+    def _parse_stage(self, batch: list[_Fetched]) -> list[_Fetched]:
+        parsed = [
+            idx
+            for idx, item in enumerate(batch)
+            if item.outcome.content is not None and not (item.outcome.content.not_modified and item.record is not None)
+        ]
+        contents = [batch[idx].outcome.content for idx in parsed]
+        # One analysis per page feeds trust scoring, dedup and the term index.
+        analyses = [AnalyzedText.from_text(content.clean_text) for content in contents]
+        items = [(content.url, content.clean_text, content.raw_html) for content in contents]
+        if self._parse_workers > 1 and len(items) > 1:
+            if self._parse_pool is None:
+                self._parse_pool = self._parser.worker_pool(self._parse_workers)
+            assessments = self._parser.assess_many(
+                items,
+                workers=self._parse_workers,
+                analyzed=analyses,
+                executor=self._parse_pool,
             )
+        else:
+            assessments = [self._parser.assess(*item, analyzed=analyzed) for item, analyzed in zip(items, analyses)]
+        batch = list(batch)
+        for idx, analyzed, assessment in zip(parsed, analyses, assessments):
+            batch[idx] = replace(batch[idx], analyzed=analyzed, assessment=assessment)
+        return batch
 
-            stored.append(
-                ScrapeStoreResult(
+    def _store_stage(
+        self,
+        batch: list[_Fetched],
+        scrape_label: Label | None,
+        known: dict[str, tuple[Document, StoredTrustAssessment]],
+        collect_links: bool,
+    ) -> list[tuple[int, ScrapeStoreResult | None, ScrapeOutcome | None]]:
+        done: list[tuple[int, ScrapeStoreResult | None, ScrapeOutcome | None]] = []
+        to_store: list[tuple[int, StoreItem]] = []
+        for item in batch:
+            content = item.outcome.content
+            if content is None:
+                done.append((item.idx, None, item.outcome))
+            elif item.assessment is None:
+                record = item.record
+                done.append((item.idx, self._reused_result(item.url, known[record.document_id], "not_modified", collect_links), None))
+                self._fetch_cache.put(
+                    replace(
+                        record,
+                        checked_at=content.fetched_at,
+                        etag=content.etag or record.etag,
+                        last_modified=content.last_modified or record.last_modified,
+                    )
+                )
+            else:
+                to_store.append((item.idx, self._store_item(content, item.analyzed, item.assessment, scrape_label)))
+
+        # One storage rewrite for the whole batch.
+        stored = self._storage.store_documents(store_item for _, store_item in to_store)
+        for (idx, store_item), (document, trust) in zip(to_store, stored):
+            content = store_item.content
+            done.append(
+                (
+                    idx,
+                    ScrapeStoreResult(
+                        document_id=document.id,
+                        url=document.url,
+                        label=trust.label,
+                        score=trust.score,
+                        signals=trust.signals,
+                        fetch_tier=content.fetch_tier,
+                        load_ms=content.load_ms,
+                        bytes_transferred=content.bytes_transferred,
+                        links=tuple(extract_links(content.raw_html, content.url)) if collect_links else (),
+                    ),
+                    None,
+                )
+            )
+            if content.fetch_tier == "warc":
+                # Archived pages carry no live validators; recording each one
+                # would grow the in-memory fetch cache with the archive.
+                continue
+            self._fetch_cache.put(
+                FetchRecord(
+                    url=content.url,
                     document_id=document.id,
-                    url=document.url,
-                    label=trust.label,
-                    score=trust.score,
-                    signals=trust.signals,
+                    fetched_at=content.fetched_at,
+                    checked_at=content.fetched_at,
+                    etag=content.etag,
+                    last_modified=content.last_modified,
                 )
             )
-        return stored
+        return done
+
+    def _store_item(
+        self,
+        content: ScrapedContent,
+        analyzed: AnalyzedText,
+        assessment: TrustAssessment,
+        scrape_label: Label | None,
+    ) -> StoreItem:
+        final_level = assessment.label.level
+        final_categories = set(assessment.label.categories)
+
+        if scrape_label is not None:
+            final_level = self._lattice.join_level(
+                final_level,
+                scrape_label.level,
+            )
+            final_categories.update(scrape_label.categories)
+
+        final_label = Label(
+            level=final_level,
+            categories=frozenset(final_categories),
+        )
+
+        signals = assessment.signals
+        if self._main_content_only:
+            # Trust is scored on the full page; only the stored text shrinks.
+            main = extract_main_content(content.raw_html)
+            if main.text:
+                content = replace(content, clean_text=main.text)
+                analyzed = AnalyzedText.from_text(main.text)
+                signals = {**signals, "main_content_removed_ratio": round(main.removed_ratio, 4)}
+
+        safe_assessment = TrustAssessment(
+            score=assessment.score,
+            label=final_label,
+            signals=signals,
+        )
+        return StoreItem(content, safe_assessment, scrape_label=scrape_label, analyzed=analyzed)
 
     def retrieve_by_query(
         self,
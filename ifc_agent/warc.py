@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import codecs
+import gzip
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from .extract import extract_from_stream
+from .http_fetch import decompress_stream
+from .scraper import HTML_CONTENT_TYPES, ScrapedContent
+
+_READ_CHUNK = 1 << 16
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _read_headers(stream: BinaryIO) -> dict[str, str]:
+    """`Name: value` lines up to a blank line, with lowercased names."""
+    headers: dict[str, str] = {}
+    last = ""
+    while True:
+        line = stream.readline()
+        if not line or not line.strip():
+            return headers
+        text = line.decode("latin-1").rstrip("\r\n")
+        if text[:1] in (" ", "\t") and last:
+            # Folded continuation of the previous header.
+            headers[last] = f"{headers[last]} {text.strip()}"
+            continue
+        name, sep, value = text.partition(":")
+        if not sep:
+            raise ValueError(f"Malformed header line: {text[:80]!r}")
+        last = name.strip().lower()
+        headers[last] = value.strip()
+
+
+class _BlockReader:
+    """Read-only view of the next `length` bytes of a stream."""
+
+    def __init__(self, stream: BinaryIO, length: int) -> None:
+        self._stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self._stream.read(size)
+        if not data:
+            raise ValueError("WARC record is truncated.")
+        self.remaining -= len(data)
+        return data
+
+    def readline(self) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        line = self._stream.readline(self.remaining)
+        self.remaining -= len(line)
+        return line
+
+    def skip_rest(self) -> None:
+        while self.remaining > 0:
+            if not self.read(_READ_CHUNK):
+                break
+
+
+class _ChunkStream:
+    """File-like `read` over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _dechunk(block: _BlockReader) -> Iterator[bytes]:
+    # Archivers usually keep the body exactly as sent, chunk framing included.
+    while True:
+        size_line = block.readline()
+        if not size_line:
+            return
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            return
+        yield block.read(size)
+        block.readline()
+
+
+def _decoded_body(block: _BlockReader, http_headers: dict[str, str]) -> Iterator[bytes]:
+    if "chunked" in http_headers.get("transfer-encoding", "").lower():
+        raw = _dechunk(block)
+    else:
+        raw = iter(lambda: block.read(_READ_CHUNK), b"")
+    # Inflated a bounded step at a time, as the extractor asks for it.
+    yield from decompress_stream(http_headers.get("content-encoding", "").strip().lower(), raw)
+
+
+def _charset(content_type: str) -> str:
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            charset = value.strip().strip("\"'")
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                break
+    return "utf-8"
+
+
+def _fetched_at(warc_date: str) -> str:
+    try:
+        parsed = datetime.fromisoformat(warc_date.replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.now(timezone.utc).isoformat()
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.isoformat()
+
+
+@dataclass(frozen=True)
+class WarcRecord:
+    # WARC header fields, with lowercased names.
+    headers: dict[str, str]
+    # The record block; only readable until the next record is requested.
+    block: _BlockReader
+
+    @property
+    def type(self) -> str:
+        return self.headers.get("warc-type", "").lower()
+
+    @property
+    def target_uri(self) -> str:
+        return self.headers.get("warc-target-uri", "").strip("<>")
+
+
+def iter_records(stream: BinaryIO) -> Iterator[WarcRecord]:
+    """
+    Records of an uncompressed WARC stream, one at a time.
+
+    Only headers are parsed up front; whatever part of a block the caller
+    does not read is skipped when the next record is requested, so memory
+    use does not depend on record or file size.
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        if not line.strip():
+            # The CRLF pair that ends each record.
+            continue
+        if not line.startswith(b"WARC/"):
+            raise ValueError(f"Expected a WARC record header, got {line[:40]!r}")
+        headers = _read_headers(stream)
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            raise ValueError("WARC record without a valid Content-Length.")
+        block = _BlockReader(stream, length)
+        yield WarcRecord(headers=headers, block=block)
+        block.skip_rest()
+
+
+class WarcReader:
+    """
+    Streams the HTML responses out of a `.warc` or `.warc.gz` file.
+
+    Compression is detected from the file's magic bytes; multi-member gzip
+    (one member per record, as most archivers write) is read member by
+    member. Each 2xx `response` record with an HTML body becomes a
+    `ScrapedContent` with `fetch_tier="warc"`, the capture time as
+    `fetched_at` and the archived validators. Other records are counted in
+    `skipped` by reason.
+    """
+
+    def __init__(self, path: str | Path, max_page_bytes: int | None = None) -> None:
+        self.path = Path(path)
+        self._max_page_bytes = max_page_bytes
+        self.records = 0
+        self.skipped: Counter[str] = Counter()
+
+    def pages(self) -> Iterator[ScrapedContent]:
+        with self.path.open("rb") as raw:
+            compressed = raw.read(2) == _GZIP_MAGIC
+            raw.seek(0)
+            stream = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw
+            try:
+                for record in iter_records(stream):
+                    self.records += 1
+                    page = self._page(record)
+                    if page is not None:
+                        yield page
+            finally:
+                if compressed:
+                    stream.close()
+
+    def _page(self, record: WarcRecord) -> ScrapedContent | None:
+        if record.type != "response":
+            self.skipped[record.type or "untyped"] += 1
+            return None
+        if not record.headers.get("content-type", "").lower().startswith("application/http"):
+            self.skipped["not_http"] += 1
+            return None
+        if not record.target_uri:
+            self.skipped["no_target_uri"] += 1
+            return None
+        status_line = record.block.readline().decode("latin-1").split()
+        try:
+            status = int(status_line[1])
+            http_headers = _read_headers(record.block)
+        except (IndexError, ValueError):
+            self.skipped["malformed"] += 1
+            return None
+        content_type = http_headers.get("content-type", "")
+        if not 200 <= status < 300:
+            self.skipped[f"status_{status}"] += 1
+            return None
+        if content_type.split(";", 1)[0].strip().lower() not in HTML_CONTENT_TYPES:
+            self.skipped["not_html"] += 1
+            return None
+
+        wire_start = record.block.remaining
+        try:
+            page = extract_from_stream(
+                _ChunkStream(_decoded_body(record.block, http_headers)),
+                max_bytes=self._max_page_bytes,
+                encoding=_charset(content_type),
+            )
+        except (ValueError, zlib.error):
+            self.skipped["malformed"] += 1
+            return None
+        return ScrapedContent(
+            url=record.target_uri,
+            fetched_at=_fetched_at(record.headers.get("warc-date", "")),
+            raw_html=page.raw_html,
+            clean_text=page.clean_text.strip(),
+            fetch_tier="warc",
+            etag=http_headers.get("etag"),
+            last_modified=http_headers.get("last-modified"),
+            bytes_transferred=wire_start - record.block.remaining,
+        )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.domains import DomainSuffixSet
+
+
+def _random_domain(rng: random.Random) -> str:
+    name = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(5, 14)))
+    return f"{name}.{rng.choice(('com', 'net', 'org', 'io', 'info', 'co.uk'))}"
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark DomainSuffixSet build and lookup cost.")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Number of list entries.")
+    parser.add_argument("--lookups", type=int, default=200_000, help="Number of timed lookups.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    rng = random.Random(args.seed)
+    domains = [_random_domain(rng) for _ in range(args.entries)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    suffix_set = DomainSuffixSet(domains)
+    build_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    hits = [f"www.{rng.choice(domains)}" for _ in range(args.lookups // 2)]
+    misses = [f"www.{_random_domain(rng)}" for _ in range(args.lookups - len(hits))]
+    hosts = hits + misses
+    rng.shuffle(hosts)
+
+    match = suffix_set.match
+    start = time.perf_counter()
+    matched = sum(1 for host in hosts if match(host) is not None)
+    lookup_s = time.perf_counter() - start
+
+    print(f"entries: {args.entries} ({len(suffix_set)} unique)")
+    print(f"build: {build_s:.2f}s, retained {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB")
+    print(f"lookups: {len(hosts)}, matched {matched}, {lookup_s / len(hosts) * 1e9:.0f} ns/lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
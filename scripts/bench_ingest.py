@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice
+from ifc_agent.scraper import LocalFileScraper
+from ifc_agent.storage import JSONAssessmentCache, JSONStorage
+from ifc_agent.tools import AgentTools
+
+BASE_URL = "http://localhost:8000/"
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark scrape-parse-store ingest of local HTML pages.")
+    parser.add_argument("--directory", default=str(PROJECT_ROOT / "mock_web"), help="Directory of HTML pages.")
+    parser.add_argument("--rounds", type=int, default=20, help="Times each page is ingested.")
+    parser.add_argument("--parse-workers", type=int, default=1)
+    return parser.parse_args()
+
+
+def _write_rounds(source: Path, target: Path, rounds: int) -> int:
+    """
+    Copy every page once per round with a round-specific paragraph, so each
+    copy is new content: storage dedups by text hash and the assessment cache
+    key ignores the URL, so identical bodies would only be parsed once.
+    """
+    pages = sorted(path for path in source.glob("*.html") if path.is_file())
+    for idx in range(rounds):
+        round_dir = target / f"round-{idx}"
+        round_dir.mkdir(parents=True)
+        marker = f"<p>Benchmark round {idx}.</p>".encode("ascii")
+        for page in pages:
+            html = page.read_bytes()
+            end = html.lower().rfind(b"</body>")
+            html = html[:end] + marker + html[end:] if end >= 0 else html + marker
+            (round_dir / page.name).write_bytes(html)
+    return len(pages)
+
+
+def main() -> int:
+    args = _parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pages_dir = Path(tmpdir) / "pages"
+        files = _write_rounds(Path(args.directory), pages_dir, args.rounds)
+        if not files:
+            print(f"[ERROR] No HTML pages in {args.directory}")
+            return 1
+        url_map = {BASE_URL: pages_dir}
+        batch = LocalFileScraper(url_map=url_map).directory_urls(pages_dir, pattern="round-*/*.html")
+        store_path = Path(tmpdir) / "store.json"
+
+        tools = AgentTools(
+            lattice=Lattice(["Public", "Internal", "Confidential", "Secret"]),
+            storage_path=str(store_path),
+            parse_workers=args.parse_workers,
+            scraper_backend="local",
+            local_url_map=url_map,
+        )
+        scraper = LocalFileScraper(url_map=url_map)
+        start = time.perf_counter()
+        for url in batch:
+            scraper.scrape(url)
+        scrape_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with tools:
+            result = tools.scrape_parse_store_batch(batch)
+        total_s = time.perf_counter() - start
+
+        stored = len(JSONStorage(store_path).load_documents())
+        cached = len(JSONAssessmentCache.beside(store_path))
+        expected = len(batch) - len(result.errors)
+        if stored != expected or cached != expected:
+            print(f"[ERROR] expected {expected} new documents and cache entries, got {stored} and {cached}")
+            return 1
+
+    print(f"pages: {len(batch)} ({files} files x {args.rounds} rounds), errors {len(result.errors)}")
+    print(f"scrape only: {scrape_s:.3f}s ({len(batch) / scrape_s:.0f} pages/s)")
+    print(f"scrape+parse+store: {total_s:.3f}s ({len(batch) / total_s:.0f} pages/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
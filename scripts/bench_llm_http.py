@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.http_pool import HTTPConnectionPool
+from ifc_agent.labels import make_label
+from ifc_agent.llm import OllamaLLM
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Answers /api/generate at once, so timings are all client overhead."""
+
+    protocol_version = "HTTP/1.1"
+    # One send per response; split writes stall keep-alive clients on Nagle/delayed ACK.
+    wbufsize = 1 << 16
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        body = json.dumps({"response": "ok"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-call HTTP overhead of the LLM adapters.")
+    parser.add_argument("--calls", type=int, default=500, help="Calls per client.")
+    return parser.parse_args()
+
+
+def _urlopen_call(url: str) -> None:
+    # The adapters' previous transport: a fresh connection per call.
+    req = urllib.request.Request(
+        url,
+        data=json.dumps({"model": "bench", "prompt": "ping", "stream": False}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        json.loads(resp.read().decode("utf-8"))
+
+
+def main() -> int:
+    args = _parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    label = make_label("Public")
+
+    try:
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            _urlopen_call(f"{base_url}/api/generate")
+        urlopen_s = time.perf_counter() - start
+
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="bench", base_url=base_url, http_client=pool)
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                llm.generate("ping", label)
+            pooled_s = time.perf_counter() - start
+            counters = dict(pool.counters)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"calls: {args.calls} against a local stand-in server")
+    print(f"urlopen per call: {urlopen_s:.3f}s ({urlopen_s / args.calls * 1000:.3f} ms/call)")
+    print(f"pooled keep-alive: {pooled_s:.3f}s ({pooled_s / args.calls * 1000:.3f} ms/call), connections {counters}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure local package import works when running as a script.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.domains import DomainSuffixSet
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.tools import AgentTools
+from ifc_agent.warc import WarcReader
+
+
+def _load_config(path: Path) -> dict:
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Assess and store the HTML responses of WARC(.gz) archives without fetching anything."
+    )
+    parser.add_argument("config_path", help="Path to config.json")
+    parser.add_argument("warc_paths", nargs="+", help="One or more .warc or .warc.gz files")
+    parser.add_argument(
+        "--label-level",
+        required=True,
+        help="Scrape label level joined into every stored page (for example: Internal).",
+    )
+    parser.add_argument(
+        "--label-categories",
+        default="",
+        help="Comma-separated scrape label categories (for example: Untrusted,Archive).",
+    )
+    parser.add_argument(
+        "--store-batch-size",
+        type=int,
+        default=None,
+        help="Pages per store stage batch; overrides tools.warc_store_batch_size.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    config = _load_config(Path(args.config_path))
+    tool_cfg = config.get("tools", {})
+    lattice = Lattice.from_config(config["lattice"])
+    if not lattice.is_valid_level(args.label_level):
+        print(f"[ERROR] Unknown label level: {args.label_level}")
+        return 1
+    categories = [item.strip() for item in args.label_categories.split(",") if item.strip()]
+    scrape_label = make_label(args.label_level, categories)
+    max_page_bytes = tool_cfg.get("max_page_bytes")
+
+    tools = AgentTools(
+        lattice=lattice,
+        storage_path=tool_cfg.get("storage_path", "data/store.json"),
+        trusted_domains=DomainSuffixSet.from_config(tool_cfg, "trusted_domains"),
+        blocked_domains=DomainSuffixSet.from_config(tool_cfg, "blocked_domains"),
+        parse_workers=int(tool_cfg.get("parse_workers", 1)),
+        max_page_bytes=max_page_bytes,
+        main_content_only=bool(tool_cfg.get("main_content_only", False)),
+        pipeline_queue_size=int(tool_cfg.get("pipeline_queue_size", 8)),
+        parse_batch_size=int(tool_cfg.get("parse_batch_size", 16)),
+        store_batch_size=args.store_batch_size or int(tool_cfg.get("warc_store_batch_size", 500)),
+    )
+
+    # Nothing is fetched, so the scraper is never opened; close() stops the
+    # parse pool shared by every archive.
+    total = 0
+    try:
+        for warc_path in args.warc_paths:
+            reader = WarcReader(warc_path, max_page_bytes=max_page_bytes)
+            try:
+                report = tools.ingest_pages(reader.pages(), scrape_label=scrape_label)
+            except (OSError, EOFError, ValueError) as e:
+                print(f"[ERROR] {warc_path}: {e}")
+                return 1
+            total += report.stored
+            skipped = ", ".join(f"{reason} {count}" for reason, count in sorted(reader.skipped.items())) or "none"
+            rates = ", ".join(f"{name} {stats['items_per_s']}/s" for name, stats in report.stage_stats.items())
+            print(
+                f"[INFO] {warc_path}: {reader.records} record(s), stored {report.stored}; "
+                f"skipped: {skipped}; {rates}"
+            )
+    finally:
+        tools.close()
+    print(f"[INFO] Stored {total} page(s) with label {scrape_label}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,10 +14,18 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from ifc_agent.agent import WebAgent
+from ifc_agent.agent import AgentRunError, WebAgent
+from ifc_agent.crawl import CrawlFrontier, Crawler, CrawlReport
+from ifc_agent.domains import DomainSuffixSet
+from ifc_agent.http_pool import HTTPConnectionPool, HTTPTimeouts
 from ifc_agent.labels import Lattice, make_label
-from ifc_agent.llm import OllamaLLM, OpenAICompatibleLLM
+from ifc_agent.llm import BaseLLM, OllamaLLM, OpenAICompatibleLLM
+from ifc_agent.llm_cache import CachedLLM, ResponseCache
+from ifc_agent.llm_resilience import ResilientLLM
+from ifc_agent.page_load import LoadStrategies
 from ifc_agent.policy import Policy
+from ifc_agent.resilience import RetryPolicy
+from ifc_agent.scraper import LocalFileScraper
 from ifc_agent.tools import AgentTools
 
 
@@ -27,7 +35,7 @@ def _load_config(path: Path) -> dict:
 
 
 def _build_policy(config: dict) -> tuple[Lattice, Policy]:
-    lattice = Lattice(config["lattice"])
+    lattice = Lattice.from_config(config["lattice"])
     user_output_max = make_label(
         config["user_output_max"]["level"],
         config["user_output_max"].get("categories", []),
@@ -40,6 +48,34 @@ def _build_policy(config: dict) -> tuple[Lattice, Policy]:
     return lattice, policy
 
 
+def _expand_directories(urls: list[str], tool_cfg: dict) -> list[str]:
+    # With the local scraper, a directory argument stands for its HTML files.
+    scraper = LocalFileScraper(url_map=tool_cfg.get("local_url_map", {}))
+    expanded: list[str] = []
+    for url in urls:
+        expanded.extend(scraper.directory_urls(url) if Path(url).is_dir() else [url])
+    return expanded
+
+
+def _crawl(tools: AgentTools, lattice: Lattice, crawl_cfg: dict, seeds: list[str], scrape_label) -> CrawlReport:
+    frontier = CrawlFrontier(
+        crawl_cfg.get("state_path", "data/crawl.jsonl"),
+        seen_capacity=int(crawl_cfg.get("seen_capacity", 100_000)),
+    )
+    with frontier:
+        crawler = Crawler(
+            tools,
+            frontier,
+            lattice,
+            max_depth=int(crawl_cfg.get("max_depth", 2)),
+            max_pages=int(crawl_cfg.get("max_pages", 100)),
+            host_delay_seconds=float(crawl_cfg.get("host_delay_seconds", 1.0)),
+            same_host_only=bool(crawl_cfg.get("same_host_only", True)),
+            batch_size=int(crawl_cfg.get("batch_size", 8)),
+        )
+        return crawler.crawl(seeds, scrape_label=scrape_label)
+
+
 def _check_ollama_available(base_url: str) -> None:
     tags_url = f"{base_url.rstrip('/')}/api/tags"
     req = urllib.request.Request(tags_url, method="GET")
@@ -53,6 +89,49 @@ def _check_ollama_available(base_url: str) -> None:
         ) from exc
 
 
+def _build_http_pool(config: dict) -> HTTPConnectionPool:
+    http_cfg = config.get("llm_http", {})
+    return HTTPConnectionPool(
+        HTTPTimeouts(
+            connect_s=float(http_cfg.get("connect_timeout_seconds", 10)),
+            read_s=float(http_cfg.get("read_timeout_seconds", 120)),
+        ),
+        max_idle_per_origin=int(http_cfg.get("max_idle_connections_per_host", 4)),
+    )
+
+
+def _with_cache(llm: BaseLLM, config: dict) -> BaseLLM:
+    cache_cfg = config.get("llm_cache", {})
+    if not cache_cfg.get("enabled", False):
+        return llm
+    ttl = cache_cfg.get("ttl_seconds")
+    cache = ResponseCache(
+        cache_cfg.get("path", "data/llm_cache.sqlite3"),
+        max_bytes=int(cache_cfg.get("max_bytes", 64 * 1024 * 1024)),
+        ttl_seconds=float(ttl) if ttl is not None else None,
+    )
+    return CachedLLM(llm, cache)
+
+
+def _with_resilience(llm: BaseLLM, config: dict) -> BaseLLM:
+    guard_cfg = config.get("llm_resilience", {})
+    if not guard_cfg.get("enabled", False):
+        return llm
+    deadline = guard_cfg.get("deadline_seconds")
+    threshold = guard_cfg.get("failure_threshold")
+    return ResilientLLM(
+        llm,
+        retry=RetryPolicy(
+            max_attempts=int(guard_cfg.get("max_attempts", 3)),
+            base_delay_s=float(guard_cfg.get("retry_base_delay_seconds", 0.5)),
+            max_delay_s=float(guard_cfg.get("retry_max_delay_seconds", 8.0)),
+        ),
+        deadline_s=float(deadline) if deadline is not None else None,
+        failure_threshold=int(threshold) if threshold is not None else None,
+        reset_timeout_s=float(guard_cfg.get("reset_timeout_seconds", 30.0)),
+    )
+
+
 def _build_llm(config: dict, backend_mode: str):
     effective_mode = backend_mode
     if backend_mode == "auto":
@@ -67,17 +146,35 @@ def _build_llm(config: dict, backend_mode: str):
         return OpenAICompatibleLLM(
             model=params["model"],
             base_url=params["base_url"],
+            http_client=_build_http_pool(config),
         ), "external"
 
     params = config["ollama"]
     _check_ollama_available(params["base_url"])
-    return OllamaLLM(model=params["model"], base_url=params["base_url"]), "local"
+    return OllamaLLM(
+        model=params["model"],
+        base_url=params["base_url"],
+        http_client=_build_http_pool(config),
+    ), "local"
+
+
+def _print_chunk(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _write_audit(path_str: str, payload: dict) -> None:
+    audit_path = Path(path_str)
+    audit_path.parent.mkdir(parents=True, exist_ok=True)
+    with audit_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+    print(f"[INFO] Wrote audit log: {audit_path}")
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run IFC web agent on one or more URLs.")
     parser.add_argument("config_path", help="Path to config.json")
-    parser.add_argument("urls", nargs="+", help="One or more URLs to scrape")
+    parser.add_argument("urls", nargs="+", help="One or more URLs to scrape (or directories, with the local scraper)")
     parser.add_argument(
         "--prompt",
         default="Summarize the main points.",
@@ -103,6 +200,16 @@ def _parse_args() -> argparse.Namespace:
             "'auto' picks external if a key is available."
         ),
     )
+    parser.add_argument(
+        "--crawl",
+        action="store_true",
+        help="Treat the URLs as crawl seeds and follow their links (see the 'crawl' config section).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the answer as it is generated (after the output policy check).",
+    )
     parser.add_argument(
         "--audit-json-path",
         default="",
@@ -114,26 +221,61 @@ def _parse_args() -> argparse.Namespace:
 def main() -> int:
     args = _parse_args()
     config_path = Path(args.config_path)
+    config = _load_config(config_path)
+    tool_cfg = config.get("tools", {})
+    scraper_backend = tool_cfg.get("scraper_backend", "browser")
     urls = args.urls
+    if scraper_backend == "local":
+        urls = _expand_directories(urls, tool_cfg)
 
     for url in urls:
         parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
+        if not parsed.scheme or not (parsed.netloc or parsed.scheme == "file"):
             print(f"[ERROR] Invalid URL format: {url}")
             return 1
 
-    config = _load_config(config_path)
     lattice, policy = _build_policy(config)
     backend_mode = args.llm_backend or config.get("llm_backend", "local")
     llm, resolved_backend = _build_llm(config, backend_mode)
-    tool_cfg = config.get("tools", {})
+    # Cache hits skip the network, but still fall under the deadline.
+    llm = _with_resilience(_with_cache(llm, config), config)
 
     tools = AgentTools(
         lattice=lattice,
         storage_path=tool_cfg.get("storage_path", "data/store.json"),
-        trusted_domains=tool_cfg.get("trusted_domains", []),
-        blocked_domains=tool_cfg.get("blocked_domains", []),
+        trusted_domains=DomainSuffixSet.from_config(tool_cfg, "trusted_domains"),
+        blocked_domains=DomainSuffixSet.from_config(tool_cfg, "blocked_domains"),
         user_agent=tool_cfg.get("user_agent", "IFC-Agent/0.2"),
+        parse_workers=int(tool_cfg.get("parse_workers", 1)),
+        max_page_bytes=tool_cfg.get("max_page_bytes"),
+        main_content_only=bool(tool_cfg.get("main_content_only", False)),
+        headless=bool(tool_cfg.get("headless", True)),
+        max_navigations_per_context=int(tool_cfg.get("max_navigations_per_context", 50)),
+        scrape_concurrency=int(tool_cfg.get("scrape_concurrency", 1)),
+        per_host_concurrency=int(tool_cfg.get("per_host_concurrency", 2)),
+        http_first=bool(tool_cfg.get("http_first", False)),
+        render_domains=DomainSuffixSet.from_config(tool_cfg, "render_domains"),
+        min_static_text_chars=int(tool_cfg.get("min_static_text_chars", 200)),
+        freshness_ttl_seconds=float(tool_cfg.get("freshness_ttl_seconds", 0)),
+        freshness_ttl_by_domain=tool_cfg.get("freshness_ttl_by_domain", {}),
+        blocked_resource_types=tool_cfg.get("blocked_resource_types", []),
+        blocked_request_domains=DomainSuffixSet.from_config(tool_cfg, "blocked_request_domains"),
+        load_strategies=LoadStrategies.from_config(
+            tool_cfg.get("load_strategy"),
+            tool_cfg.get("load_strategies_by_domain"),
+        ),
+        scraper_backend=scraper_backend,
+        local_url_map=tool_cfg.get("local_url_map", {}),
+        navigation_timeout_ms=int(tool_cfg.get("navigation_timeout_ms", 60000)),
+        http_timeout_seconds=float(tool_cfg.get("http_timeout_seconds", 15.0)),
+        scrape_attempts=int(tool_cfg.get("scrape_attempts", 1)),
+        retry_base_delay_seconds=float(tool_cfg.get("retry_base_delay_seconds", 0.5)),
+        retry_max_delay_seconds=float(tool_cfg.get("retry_max_delay_seconds", 8.0)),
+        circuit_failure_threshold=tool_cfg.get("circuit_failure_threshold"),
+        circuit_reset_seconds=float(tool_cfg.get("circuit_reset_seconds", 30.0)),
+        pipeline_queue_size=int(tool_cfg.get("pipeline_queue_size", 8)),
+        parse_batch_size=int(tool_cfg.get("parse_batch_size", 16)),
+        store_batch_size=int(tool_cfg.get("store_batch_size", 32)),
     )
     
     agent = WebAgent(lattice=lattice, policy=policy, llm=llm, tools=tools)
@@ -144,12 +286,28 @@ def main() -> int:
 
 
     try:
-        result = agent.run(user_prompt, user_label, urls)
-        print(f"[INFO] LLM backend: {resolved_backend} ({llm.name})")
-        print(result.text)
+        crawl_report = None
+        with tools:
+            if args.crawl:
+                scrape_label = make_label(user_label.level, user_label.categories)
+                crawl_report = _crawl(tools, lattice, config.get("crawl", {}), urls, scrape_label)
+                # Crawled pages are already stored; the agent answers over the store.
+                urls = []
+            on_text = _print_chunk if args.stream else None
+            if on_text is not None:
+                print(f"[INFO] LLM backend: {resolved_backend} ({llm.name})")
+            result = agent.run(user_prompt, user_label, urls, on_text=on_text)
+        if crawl_report is not None:
+            print(
+                f"[INFO] Crawl stored {len(crawl_report.stored)} page(s), "
+                f"{len(crawl_report.errors)} error(s), {crawl_report.remaining} still queued."
+            )
+        if args.stream:
+            print()
+        else:
+            print(f"[INFO] LLM backend: {resolved_backend} ({llm.name})")
+            print(result.text)
         if args.audit_json_path:
-            audit_path = Path(args.audit_json_path)
-            audit_path.parent.mkdir(parents=True, exist_ok=True)
             payload = {
                 "backend_mode": resolved_backend,
                 "llm_name": llm.name,
@@ -157,9 +315,21 @@ def main() -> int:
                 "result_text": result.text,
                 "audit": result.audit or {},
             }
-            with audit_path.open("w", encoding="utf-8") as handle:
-                json.dump(payload, handle, indent=2)
-            print(f"[INFO] Wrote audit log: {audit_path}")
+            if crawl_report is not None:
+                payload["crawl"] = {
+                    "stored_urls": [item.url for item in crawl_report.stored],
+                    "errors": [{"url": item.url, "error": item.error} for item in crawl_report.errors],
+                    "remaining": crawl_report.remaining,
+                }
+            _write_audit(args.audit_json_path, payload)
+    except AgentRunError as e:
+        print(f"[ERROR] {e}")
+        if args.audit_json_path:
+            # Keep the attempts and elapsed time of the failed LLM call.
+            _write_audit(
+                args.audit_json_path,
+                {"backend_mode": resolved_backend, "llm_name": llm.name, "error": str(e), "audit": e.audit},
+            )
     except Exception as e:
         print(f"[ERROR] {e}")
 
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure local package import works when running as a script.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.domains import DomainSuffixSet
+from ifc_agent.labels import Lattice
+from ifc_agent.parser import TrustParser
+from ifc_agent.relabel import relabel_store
+from ifc_agent.storage import JSONStorage
+
+
+def _load_config(path: Path) -> dict:
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recompute stored trust labels after editing trusted/blocked domains."
+    )
+    parser.add_argument("config_path", help="Path to config.json")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report label changes without writing the store.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    config = _load_config(Path(args.config_path))
+    tool_cfg = config.get("tools", {})
+    lattice = Lattice.from_config(config["lattice"])
+    parser = TrustParser(
+        trusted_domains=DomainSuffixSet.from_config(tool_cfg, "trusted_domains"),
+        blocked_domains=DomainSuffixSet.from_config(tool_cfg, "blocked_domains"),
+    )
+    storage = JSONStorage(tool_cfg.get("storage_path", "data/store.json"))
+
+    changes = relabel_store(storage, parser, lattice, dry_run=args.dry_run)
+    for change in changes:
+        print(
+            f"{change.document_id} {change.domain}: "
+            f"{change.old_score:.3f} {change.old_label} -> {change.new_score:.3f} {change.new_label}"
+        )
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"[INFO] {verb} {len(changes)} document(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -8,12 +9,15 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from ifc_agent.agent import WebAgent
+from ifc_agent.agent import AgentRunError, WebAgent
 from ifc_agent.labels import Label, Lattice, make_label
-from ifc_agent.llm import BaseLLM, LLMResponse
+from ifc_agent.llm import BaseLLM, LLMHTTPError, LLMResponse, LLMStream
+from ifc_agent.llm_cache import CachedLLM, ResponseCache
+from ifc_agent.llm_resilience import LLMCallError, ResilientLLM
 from ifc_agent.policy import Policy
+from ifc_agent.resilience import RetryPolicy
 from ifc_agent.retrieval import RetrievedDocument
-from ifc_agent.tools import RetrieveResult
+from ifc_agent.tools import RetrieveResult, ScrapeStoreBatch
 
 
 class _FakeLLM(BaseLLM):
@@ -27,14 +31,29 @@ class _FakeLLM(BaseLLM):
         return LLMResponse(text="ok", label=self._response_label)
 
 
+class _StreamingLLM(_FakeLLM):
+    def __init__(self, response_label: Label, chunks: list[str]) -> None:
+        super().__init__(is_external=False, response_label=response_label)
+        self._chunks = chunks
+        self.pulled: list[str] = []
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        def _chunks():
+            for chunk in self._chunks:
+                self.pulled.append(chunk)
+                yield chunk
+
+        return LLMStream(self._response_label, _chunks(), {"tokens": 7})
+
+
 class _FakeTools:
     def __init__(self, docs: list[RetrievedDocument]) -> None:
         self._docs = docs
         self.scrape_calls = 0
 
-    def scrape_parse_store(self, urls, scrape_label=None):
+    def scrape_parse_store_batch(self, urls, scrape_label=None) -> ScrapeStoreBatch:
         self.scrape_calls += 1
-        return []
+        return ScrapeStoreBatch(stored=[], errors=[])
 
     def retrieve_by_query(self, query: str, label_cap=None, top_k: int = 3) -> RetrieveResult:
         return RetrieveResult(documents=self._docs)
@@ -107,6 +126,97 @@ class WebAgentTests(unittest.TestCase):
         with self.assertRaises(PermissionError):
             agent.run("summarize", make_label("Internal"), ["https://x"])
 
+    def _docs(self) -> list[RetrievedDocument]:
+        return [RetrievedDocument(id="1", url="https://x", text_snippet="snippet", label=make_label("Public"), score=0.9)]
+
+    def test_run_streams_chunks_and_records_timing(self) -> None:
+        llm = _StreamingLLM(make_label("Internal"), ["Hel", "lo", " world"])
+        agent = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs()))
+        received: list[str] = []
+
+        result = agent.run("summarize", make_label("Internal"), ["https://x"], on_text=received.append)
+        self.assertEqual(received, ["Hel", "lo", " world"])
+        self.assertEqual(result.text, "Hello world")
+        self.assertEqual(result.audit["llm_response_label"], "Internal")
+        stream_audit = result.audit["llm_stream"]
+        self.assertEqual(stream_audit["tokens"], 7)
+        self.assertGreaterEqual(stream_audit["total_ms"], stream_audit["ttft_ms"])
+        self.assertGreaterEqual(result.audit["llm_elapsed_ms"], 0.0)
+
+    def test_stream_that_cannot_start_raises_agent_run_error(self) -> None:
+        class _UnconfiguredLLM(_FakeLLM):
+            def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+                raise RuntimeError("Missing API key")
+
+        llm = _UnconfiguredLLM(is_external=False, response_label=make_label("Internal"))
+        agent = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs()))
+        with self.assertRaises(AgentRunError) as ctx:
+            agent.run("summarize", make_label("Internal"), ["https://x"], on_text=lambda chunk: None)
+        self.assertEqual(ctx.exception.audit["llm_error"]["error"], "Missing API key")
+        self.assertGreaterEqual(ctx.exception.audit["llm_elapsed_ms"], 0.0)
+
+    def test_stream_is_not_started_when_output_policy_denies(self) -> None:
+        llm = _StreamingLLM(make_label("Secret"), ["classified"])
+        agent = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs()))
+        received: list[str] = []
+
+        with self.assertRaises(PermissionError):
+            agent.run("summarize", make_label("Internal"), ["https://x"], on_text=received.append)
+        self.assertEqual(received, [])
+        self.assertEqual(llm.pulled, [])
+
+    def test_non_streaming_backend_streams_one_chunk(self) -> None:
+        llm = _FakeLLM(is_external=False, response_label=make_label("Internal"))
+        agent = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs()))
+        received: list[str] = []
+
+        result = agent.run("summarize", make_label("Internal"), ["https://x"], on_text=received.append)
+        self.assertEqual(received, ["ok"])
+        self.assertEqual(result.audit["llm_stream"]["tokens"], 1)
+
+    def test_cache_hits_and_misses_are_audited(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ResponseCache(Path(tmpdir) / "cache.sqlite3")
+            backend = _FakeLLM(is_external=False, response_label=make_label("Internal"))
+            agent = WebAgent(self.lattice, self.policy, CachedLLM(backend, cache), _FakeTools(self._docs()))
+
+            first = agent.run("summarize", make_label("Internal"), ["https://x"])
+            second = agent.run("summarize", make_label("Internal"), ["https://x"])
+            cache.close()
+
+        self.assertEqual(first.audit["llm_counters"], {"cache_misses": 1})
+        self.assertEqual(second.audit["llm_counters"], {"cache_hits": 1})
+        self.assertEqual(second.text, "ok")
+        self.assertEqual(backend.calls, 1)
+
+    def test_guarded_call_records_attempts_and_elapsed_time(self) -> None:
+        llm = ResilientLLM(_FakeLLM(is_external=False, response_label=make_label("Internal")))
+        result = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs())).run(
+            "summarize", make_label("Internal"), ["https://x"]
+        )
+        self.assertEqual(result.audit["llm_counters"], {"attempts": 1})
+        self.assertGreaterEqual(result.audit["llm_elapsed_ms"], 0.0)
+        self.assertEqual(result.audit["llm_backend"], "resilient->fake")
+
+    def test_failed_guarded_call_records_attempts_and_elapsed_time(self) -> None:
+        class _FailingLLM(_FakeLLM):
+            def generate(self, prompt: str, label: Label) -> LLMResponse:
+                raise LLMHTTPError("busy", 503)
+
+        llm = ResilientLLM(
+            _FailingLLM(is_external=False, response_label=make_label("Internal")),
+            retry=RetryPolicy(max_attempts=2, base_delay_s=0.0, max_delay_s=0.0),
+        )
+        agent = WebAgent(self.lattice, self.policy, llm, _FakeTools(self._docs()))
+        with self.assertRaises(AgentRunError) as ctx:
+            agent.run("summarize", make_label("Internal"), ["https://x"])
+
+        audit = ctx.exception.audit
+        self.assertIsInstance(ctx.exception.__cause__, LLMCallError)
+        self.assertEqual(audit["llm_counters"], {"attempts": 2, "retries": 1, "errors_server_error": 2})
+        self.assertEqual((audit["llm_error"]["kind"], audit["llm_error"]["attempts"]), ("server_error", 2))
+        self.assertGreaterEqual(audit["llm_elapsed_ms"], 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()
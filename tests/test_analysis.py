@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.analysis import AnalyzedText, content_hash
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.parser import TrustAssessment, TrustParser
+from ifc_agent.retrieval import Retriever
+from ifc_agent.scraper import ScrapedContent
+from ifc_agent.storage import JSONStorage
+
+
+def _content(url: str, text: str) -> ScrapedContent:
+    return ScrapedContent(url, "2026-01-01T00:00:00+00:00", "<html></html>", text)
+
+
+class AnalyzedTextTests(unittest.TestCase):
+    def test_fields_come_from_one_pass(self) -> None:
+        analyzed = AnalyzedText.from_text("Alpha beta, ALPHA! gamma-2")
+        self.assertEqual(analyzed.normalized, "alpha beta, alpha! gamma-2")
+        self.assertEqual(analyzed.terms, {"alpha": 2, "beta": 1, "gamma": 1, "2": 1})
+        self.assertEqual(analyzed.length, 5)
+        self.assertEqual(analyzed.content_hash, content_hash("Alpha beta, ALPHA! gamma-2"))
+
+    def test_parser_results_match_with_and_without_analysis(self) -> None:
+        parser = TrustParser(trusted_domains=["example.com"])
+        text = "By Alice at Acme Inc. Cookie Privacy http://ref1 WWW.ref2"
+        html = "<meta name='author'>"
+        analyzed = AnalyzedText.from_text(text)
+        self.assertEqual(
+            parser.assess("https://example.com/a", text, html, analyzed=analyzed),
+            parser.assess("https://example.com/a", text, html),
+        )
+        self.assertEqual(
+            parser.cache_key("https://example.com/a", text, html, analyzed=analyzed),
+            parser.cache_key("https://example.com/a", text, html),
+        )
+
+    def test_storage_dedups_legacy_rows_and_ranks_from_stored_terms(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "store.json"
+            store = JSONStorage(path)
+            store.store_document(_content("https://a.example/1", "Shared text"), TrustAssessment(0.9, make_label("Public"), {}))
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            for row in payload["documents"]:
+                del row["content_hash"], row["terms"]
+            path.write_text(json.dumps(payload), encoding="utf-8")
+
+            store.store_document(_content("https://b.example/2", "Shared text"), TrustAssessment(0.9, make_label("Public"), {}))
+            docs = store.load_documents()
+            trusts = store.load_trust_assessments()
+
+        self.assertEqual(len(docs), 1)
+        self.assertEqual(docs[0].terms, {"shared": 1, "text": 1})
+        retrieved = Retriever(Lattice(["Public", "Internal"])).retrieve("shared", docs, trusts)
+        self.assertEqual([doc.url for doc in retrieved], ["https://b.example/2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
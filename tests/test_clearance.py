@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import itertools
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent import clearance
+from ifc_agent.clearance import ClearanceIndex
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.parser import TrustAssessment
+from ifc_agent.policy import Policy
+from ifc_agent.scraper import ScrapedContent
+from ifc_agent.storage import JSONStorage, StoredTrustAssessment
+from ifc_agent.tools import AgentTools
+
+LEVELS = ["Public", "Internal", "Confidential", "Secret"]
+CATEGORY_SETS = [[], ["PII"], ["Untrusted"], ["PII", "Untrusted"]]
+
+
+def _all_labels():
+    return [make_label(level, cats) for level, cats in itertools.product(LEVELS, CATEGORY_SETS)]
+
+
+class ClearanceIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lattice = Lattice(LEVELS)
+        self.labels = _all_labels()
+        self.ids = [f"d{idx}" for idx in range(len(self.labels))]
+
+    def _assert_matches_can_flow(self) -> None:
+        index = ClearanceIndex(self.lattice, self.ids, self.labels)
+        for target in self.labels:
+            expected = {
+                doc_id
+                for doc_id, label in zip(self.ids, self.labels)
+                if self.lattice.can_flow(label, target)
+            }
+            self.assertEqual(index.ids_flowing_to(target), expected, f"target={target}")
+
+    def test_fallback_mask_matches_can_flow(self) -> None:
+        with patch.object(clearance, "np", None):
+            self._assert_matches_can_flow()
+
+    @unittest.skipUnless(clearance.HAS_NUMPY, "NumPy is not installed.")
+    def test_numpy_mask_matches_can_flow(self) -> None:
+        self._assert_matches_can_flow()
+
+    def test_policy_masks(self) -> None:
+        policy = Policy(
+            self.lattice,
+            external_llm_allowed=[make_label("Public"), make_label("Internal")],
+            user_output_max=make_label("Confidential", ["PII"]),
+        )
+        index = ClearanceIndex(self.lattice, self.ids, self.labels)
+        external = index.select(index.external_llm_mask(policy))
+        user = index.select(index.user_output_mask(policy))
+        for doc_id, label in zip(self.ids, self.labels):
+            self.assertEqual(doc_id in external, policy.can_send_to_external_llm(label).allowed)
+            self.assertEqual(doc_id in user, policy.can_send_to_user(label).allowed)
+
+    def test_storage_index_tracks_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = JSONStorage(Path(tmpdir) / "store.json")
+            content = ScrapedContent("https://example.com/a", "2026-01-01T00:00:00+00:00", "<html></html>", "alpha")
+            doc, _ = store.store_document(content, TrustAssessment(0.9, make_label("Public"), {}))
+            self.assertEqual(store.load_clearance_index(self.lattice).ids_flowing_to(make_label("Public")), {doc.id})
+
+            store.store_document(content, TrustAssessment(0.9, make_label("Secret"), {}))
+            index = store.load_clearance_index(self.lattice)
+            self.assertEqual(index.ids_flowing_to(make_label("Public")), set())
+
+    def test_relabel_by_another_writer_is_honoured_at_retrieval(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(self.lattice, str(Path(tmpdir) / "store.json"))
+            content = ScrapedContent("https://example.com/a", "2026-01-01T00:00:00+00:00", "<html></html>", "alpha")
+            doc, _ = tools._storage.store_document(content, TrustAssessment(0.9, make_label("Public"), {}))
+            self.assertEqual(len(tools.retrieve_by_query("alpha", label_cap=make_label("Public")).documents), 1)
+            tools._storage.load_clearance_index(self.lattice)
+            # Relabelled through another handle, as another process would.
+            secret = StoredTrustAssessment(document_id=doc.id, score=0.9, label=make_label("Secret"), signals={})
+            JSONStorage(Path(tmpdir) / "store.json").update_trust_assessments([secret])
+            hits = tools.retrieve_by_query("alpha", label_cap=make_label("Public"))
+            self.assertEqual(hits.documents, [])
+
+if __name__ == "__main__":
+    unittest.main()
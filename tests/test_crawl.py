@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.crawl import BloomFilter, CrawlFrontier, Crawler, normalize_url
+from ifc_agent.extract import extract_links
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.tools import AgentTools
+
+MOCK_WEB = PROJECT_ROOT / "mock_web"
+BASE = "http://localhost:8000/"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class CrawlPrimitivesTests(unittest.TestCase):
+    def test_normalize_url(self) -> None:
+        self.assertEqual(normalize_url("HTTP://Example.COM:80#top"), "http://example.com/")
+        self.assertEqual(normalize_url("https://user:pw@example.com:8443/a?b=1"), "https://example.com:8443/a?b=1")
+        self.assertEqual(normalize_url("file:///tmp/a.html"), "file:///tmp/a.html")
+        self.assertIsNone(normalize_url("mailto:someone@example.com"))
+        self.assertIsNone(normalize_url("javascript:void(0)"))
+        self.assertIsNone(normalize_url("http://example.com:notaport/"))
+
+    def test_extract_links_resolves_and_skips_nofollow(self) -> None:
+        html = (
+            "<base href='/docs/'><a href='a.html#s'>a</a><a href='a.html'>again</a>"
+            "<a rel='nofollow' href='b.html'>b</a><area href='https://other.test/'>"
+        )
+        self.assertEqual(
+            extract_links(html, "https://example.com/index.html"),
+            ["https://example.com/docs/a.html", "https://other.test/"],
+        )
+
+    def test_bloom_filter_has_no_false_negatives(self) -> None:
+        seen = BloomFilter(capacity=1000, error_rate=0.01)
+        urls = [f"https://example.com/{idx}" for idx in range(1000)]
+        self.assertTrue(all(seen.add(url) for url in urls[:10]))
+        for url in urls:
+            seen.add(url)
+        self.assertTrue(all(url in seen for url in urls))
+        false_positives = sum(f"https://other.test/{idx}" in seen for idx in range(1000))
+        self.assertLess(false_positives, 50)
+        self.assertFalse(seen.add(urls[0]))
+
+    def test_frontier_replays_journal(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "crawl.jsonl"
+            with CrawlFrontier(path) as frontier:
+                frontier.push("https://a.test/", 0)
+                frontier.push("https://a.test/x", 1, label=make_label("Internal", ["PII"]))
+                frontier.push("https://b.test/", 0)
+                self.assertFalse(frontier.push("https://a.test/", 2))
+                first = frontier.take(limit=5)
+                self.assertEqual([entry.url for entry in first], ["https://a.test/", "https://b.test/"])
+                frontier.mark_done("https://a.test/", ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write('{"event": "pu')
+
+            with CrawlFrontier(path) as resumed:
+                self.assertEqual(resumed.pages_done, 1)
+                self.assertEqual(resumed.seed_hosts, {"a.test", "b.test"})
+                self.assertFalse(resumed.push("https://a.test/x", 1))
+                entries = resumed.take(limit=5, per_host=5)
+
+        self.assertEqual([entry.url for entry in entries], ["https://b.test/", "https://a.test/x"])
+        self.assertEqual(entries[1].label, make_label("Internal", ["PII"]))
+
+
+class CrawlerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.tmpdir = Path(self._tmpdir.name)
+        self.tools = AgentTools(
+            lattice=self.lattice,
+            storage_path=str(self.tmpdir / "store.json"),
+            scraper_backend="local",
+            local_url_map={BASE: str(MOCK_WEB)},
+        )
+        self.clock = _FakeClock()
+
+    def _crawler(self, frontier: CrawlFrontier, **kwargs) -> Crawler:
+        return Crawler(self.tools, frontier, self.lattice, clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_crawls_hub_page_politely(self) -> None:
+        with CrawlFrontier(self.tmpdir / "crawl.jsonl") as frontier:
+            report = self._crawler(frontier, max_depth=1, host_delay_seconds=2.0).crawl(
+                [f"{BASE}index.html", "mailto:nobody@example.com"],
+                scrape_label=make_label("Internal"),
+            )
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.remaining, 0)
+        self.assertEqual(len(report.stored), 9)
+        self.assertEqual(report.stored[0].url, f"{BASE}index.html")
+        self.assertEqual(self.clock.sleeps, [2.0] * 8)
+        hub_label = report.stored[0].label
+        for result in report.stored[1:]:
+            self.assertTrue(self.lattice.can_flow(hub_label, result.label))
+
+    def test_resumes_within_page_budget(self) -> None:
+        path = self.tmpdir / "crawl.jsonl"
+        with CrawlFrontier(path) as frontier:
+            first = self._crawler(frontier, max_pages=3, host_delay_seconds=0).crawl([f"{BASE}index.html"])
+        self.assertEqual(len(first.stored), 3)
+        self.assertEqual(first.remaining, 6)
+
+        with CrawlFrontier(path) as frontier:
+            second = self._crawler(frontier, max_pages=20, host_delay_seconds=0).crawl([f"{BASE}index.html"])
+
+        crawled = [item.url for item in first.stored + second.stored]
+        self.assertEqual(len(crawled), 9)
+        self.assertEqual(len(set(crawled)), 9)
+        self.assertEqual(second.remaining, 0)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_depth_budget_and_host_scope(self) -> None:
+        with CrawlFrontier(self.tmpdir / "crawl.jsonl") as frontier:
+            report = self._crawler(frontier, max_depth=0, host_delay_seconds=0).crawl([f"{BASE}index.html"])
+        self.assertEqual([item.url for item in report.stored], [f"{BASE}index.html"])
+
+        with CrawlFrontier(self.tmpdir / "other.jsonl") as frontier:
+            crawler = self._crawler(frontier, host_delay_seconds=0)
+            report = crawler.crawl([(MOCK_WEB / "index.html").as_uri()])
+        # file:// links within the seed's directory are followed, so the whole hub is crawled.
+        self.assertEqual(len(report.stored), 9)
+
+    def test_file_links_stay_in_the_seed_directory(self) -> None:
+        site = self.tmpdir / "site"
+        site.mkdir()
+        secret = self.tmpdir / "secret.html"
+        secret.write_text("<html><body>private notes</body></html>", encoding="utf-8")
+        (site / "page.html").write_text("<html><body>inside</body></html>", encoding="utf-8")
+        (site / "index.html").write_text(
+            "<html><body><a href='page.html'>in</a><a href='../secret.html'>up</a>"
+            f"<a href='{secret.as_uri()}'>absolute</a>"
+            f"<a href='{(site / 'sub' / '..' / '..' / 'secret.html').as_uri()}'>dotted</a></body></html>",
+            encoding="utf-8",
+        )
+        for same_host_only in (True, False):
+            with self.subTest(same_host_only=same_host_only):
+                with CrawlFrontier(self.tmpdir / f"crawl-{same_host_only}.jsonl") as frontier:
+                    crawler = self._crawler(frontier, host_delay_seconds=0, same_host_only=same_host_only)
+                    report = crawler.crawl([(site / "index.html").as_uri()])
+                self.assertEqual(
+                    sorted(item.url for item in report.stored),
+                    [(site / "index.html").as_uri(), (site / "page.html").as_uri()],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
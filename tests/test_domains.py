@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.domains import DomainSuffixSet
+from ifc_agent.parser import TrustParser
+
+
+class DomainSuffixSetTests(unittest.TestCase):
+    def test_matches_domain_and_subdomains_only(self) -> None:
+        domains = DomainSuffixSet(["wikipedia.org", "Example.COM.", "*.ads.net"])
+        self.assertEqual(domains.match("wikipedia.org"), "wikipedia.org")
+        self.assertEqual(domains.match("en.wikipedia.org"), "wikipedia.org")
+        self.assertEqual(domains.match("a.b.example.com"), "example.com")
+        self.assertEqual(domains.match("tracker.ads.net"), "ads.net")
+        self.assertIsNone(domains.match("notwikipedia.org"))
+        self.assertIsNone(domains.match("wikipedia.org.evil.test"))
+        self.assertIsNone(domains.match("org"))
+        self.assertIsNone(domains.match(""))
+
+    def test_covered_entries_keep_the_most_specific_match(self) -> None:
+        domains = DomainSuffixSet(["wikipedia.org", "wikipedia-foo.org", "de.wikipedia.org", "a.org"])
+        self.assertEqual(domains.match("en.wikipedia.org"), "wikipedia.org")
+        self.assertEqual(domains.match("x.de.wikipedia.org"), "de.wikipedia.org")
+        self.assertEqual(domains.match("x.wikipedia-foo.org"), "wikipedia-foo.org")
+        self.assertEqual(len(domains), 4)
+
+    def test_from_file_skips_comments_and_merges_extra(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "blocked.txt"
+            path.write_text("# blocklist\nbad.test\n\n  worse.test  # trailing\n", encoding="utf-8")
+            domains = DomainSuffixSet.from_file(path, extra=["inline.test"])
+        self.assertIn("x.bad.test", domains)
+        self.assertIn("worse.test", domains)
+        self.assertIn("inline.test", domains)
+        self.assertNotIn("good.test", domains)
+
+    def test_from_config_merges_inline_entries_and_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "blocked.txt"
+            path.write_text("bad.test\n", encoding="utf-8")
+            domains = DomainSuffixSet.from_config(
+                {"blocked_domains": ["inline.test"], "blocked_domains_file": str(path)}, "blocked_domains"
+            )
+        self.assertIn("x.bad.test", domains)
+        self.assertIn("inline.test", domains)
+        self.assertEqual(len(DomainSuffixSet.from_config({}, "render_domains")), 0)
+        self.assertIn("a.b.test", DomainSuffixSet.from_config({"render_domains": ["b.test"]}, "render_domains"))
+
+    def test_parser_prefers_most_specific_entry(self) -> None:
+        parser = TrustParser(trusted_domains=["wikipedia.org"], blocked_domains=["spam.wikipedia.org"])
+        self.assertEqual(parser.assess("https://en.wikipedia.org/a", "", "").signals["domain_signal"], 1.0)
+        self.assertEqual(parser.assess("https://x.spam.wikipedia.org/a", "", "").signals["domain_signal"], 0.0)
+
+    def test_covered_trusted_entry_beats_a_broader_block(self) -> None:
+        parser = TrustParser(
+            trusted_domains=["example.com", "good.bad.example.com"],
+            blocked_domains=["bad.example.com"],
+        )
+        self.assertEqual(parser.domain_signal("good.bad.example.com"), 1.0)
+        self.assertEqual(parser.domain_signal("x.bad.example.com"), 0.0)
+        self.assertEqual(parser.domain_signal("www.example.com"), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
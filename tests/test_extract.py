@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.extract import TRUNCATION_MARKER, extract_from_stream, extract_main_content, extract_text
+
+MOCK_WEB = PROJECT_ROOT / "mock_web"
+
+PAGE = (
+    "<html><head><title>T</title><style>p{}</style></head><body>"
+    "<h1>Hello</h1><p>first   &amp; second</p><script>var x = 1;</script>"
+    "<ul><li>one</li><li>two</li></ul></body></html>"
+)
+
+
+class StreamingExtractionTests(unittest.TestCase):
+    def test_extracts_visible_text_by_block(self) -> None:
+        page = extract_text(PAGE, chunk_size=7)
+        self.assertEqual(page.clean_text, "Hello\nfirst & second\none\ntwo")
+        self.assertEqual(page.raw_html, PAGE)
+        self.assertFalse(page.truncated)
+
+    def test_byte_cap_truncates_html_and_marks_text(self) -> None:
+        cap = PAGE.index("<ul>")
+        page = extract_text(PAGE, max_bytes=cap, chunk_size=16)
+        self.assertTrue(page.truncated)
+        self.assertEqual(page.bytes_read, cap)
+        self.assertEqual(page.raw_html, PAGE[:cap])
+        self.assertTrue(page.clean_text.endswith(TRUNCATION_MARKER))
+        self.assertNotIn("one", page.clean_text)
+
+    def test_stream_decodes_multibyte_across_chunks(self) -> None:
+        body = "<p>café naïve</p>".encode("utf-8")
+        page = extract_from_stream(io.BytesIO(body), chunk_size=5)
+        self.assertEqual(page.clean_text, "café naïve")
+        self.assertEqual(page.bytes_read, len(body))
+
+
+class MainContentTests(unittest.TestCase):
+    def test_drops_navigation_link_lists_and_banners(self) -> None:
+        html = (
+            "<body><nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+            "<div class='cookie-banner'><p>We use cookies to improve your experience.</p></div>"
+            "<article><h1>Title</h1><p>The main article body explains the incident in detail.</p>"
+            "<p><a href='/a'>Related one</a> <a href='/b'>Related two</a></p></article>"
+            "<footer>Copyright 2026 Example Corp</footer></body>"
+        )
+        main = extract_main_content(html)
+        self.assertEqual(main.text, "Title\nThe main article body explains the incident in detail.")
+        self.assertGreater(main.removed_ratio, 0.5)
+
+    def test_layout_wrapper_with_sidebar_class_keeps_the_article(self) -> None:
+        html = (
+            "<body><header><h1>Site Title</h1></header>"
+            "<div id='page' class='layout has-sidebar'><article><h2>Incident report</h2>"
+            "<p>The main article body explains the incident in detail for every reader.</p>"
+            "<p>A second paragraph covers the remediation steps that were taken.</p></article>"
+            "<aside><a href='/x'>Popular</a></aside></div></body>"
+        )
+        main = extract_main_content(html)
+        self.assertIn("The main article body explains the incident", main.text)
+        self.assertIn("remediation steps", main.text)
+        self.assertNotIn("Popular", main.text)
+        self.assertLess(main.removed_ratio, 0.2)
+
+    def test_class_token_containing_hint_words_is_not_boilerplate(self) -> None:
+        html = (
+            "<body><div class='social-share-enabled post'><h1>Title</h1>"
+            "<p>The main article body explains the incident in detail.</p></div>"
+            "<div class='share'><a href='/tw'>Tweet</a></div></body>"
+        )
+        main = extract_main_content(html)
+        self.assertEqual(main.text, "Title\nThe main article body explains the incident in detail.")
+
+    def test_wrapper_flagged_by_hint_is_kept_when_it_holds_the_main_text(self) -> None:
+        html = (
+            "<body><div class='sidebar'><h1>Title</h1>"
+            "<p>The main article body explains the incident in detail.</p>"
+            "<div id='cookie-banner'>We use cookies.</div></div></body>"
+        )
+        main = extract_main_content(html)
+        self.assertEqual(main.text, "Title\nThe main article body explains the incident in detail.")
+
+    def test_boilerplate_token_paragraph_is_removed_from_fixture(self) -> None:
+        html = (MOCK_WEB / "04_low_trust_rumor_blog.html").read_text(encoding="utf-8")
+        main = extract_main_content(html)
+        self.assertNotIn("Cookie policy", main.text)
+        self.assertIn("No verified source was provided.", main.text)
+        self.assertGreater(main.removed_ratio, 0.0)
+
+    def test_clean_article_is_kept_whole(self) -> None:
+        html = (MOCK_WEB / "01_public_research.html").read_text(encoding="utf-8")
+        main = extract_main_content(html)
+        self.assertIn("By Dr. Ana Rivera, Metro University", main.text)
+        self.assertEqual(main.removed_ratio, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
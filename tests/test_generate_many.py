@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.http_pool import HTTPConnectionPool
+from ifc_agent.labels import Label, make_label
+from ifc_agent.llm import BaseLLM, LLMResponse, OllamaLLM
+from ifc_agent.resilience import RetryPolicy
+
+
+class _SlowLLM(BaseLLM):
+    """Sleeps per call and tracks how many calls overlap."""
+
+    def __init__(self, delay_s: float) -> None:
+        super().__init__(name="fake:slow", is_external=False)
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def generate(self, prompt: str, label: Label) -> LLMResponse:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self._delay_s)
+            if prompt == "bad":
+                raise ValueError("model refused")
+            return LLMResponse(text=prompt.upper(), label=label)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))))
+        with self.server.lock:
+            self.server.calls += 1
+            limited = self.server.calls <= self.server.limited_calls
+        if limited:
+            status, body = 429, b'{"error": "slow down"}'
+        else:
+            status, body = 200, json.dumps({"response": f"echo {payload['prompt']}"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if limited:
+            self.send_header("Retry-After", "0.05")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class GenerateManyTests(unittest.TestCase):
+    def test_keeps_order_and_per_item_errors_within_concurrency(self) -> None:
+        llm = _SlowLLM(delay_s=0.05)
+        prompts = ["a", "b", "bad", "c", "d", "e", "f", "g"]
+        start = time.perf_counter()
+        outcomes = llm.generate_many([(p, make_label("Internal")) for p in prompts], max_concurrency=4)
+        elapsed = time.perf_counter() - start
+
+        texts = [o.response.text if o.response else None for o in outcomes]
+        self.assertEqual(texts, ["A", "B", None, "C", "D", "E", "F", "G"])
+        self.assertEqual(outcomes[2].error, "model refused")
+        self.assertEqual(outcomes[0].response.label, make_label("Internal"))
+        self.assertEqual(llm.peak, 4)
+        # Eight 50 ms calls, four at a time: two rounds rather than eight.
+        self.assertLess(elapsed, 0.3)
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        with self.assertRaises(ValueError):
+            _SlowLLM(0.0).generate_many([("a", make_label("Public"))], max_concurrency=0)
+
+    def test_rate_limited_requests_wait_and_retry(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+        server.daemon_threads = True
+        server.lock = threading.Lock()
+        server.calls = 0
+        server.limited_calls = 2
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="m", base_url=f"http://127.0.0.1:{server.server_address[1]}", http_client=pool)
+            outcomes = llm.generate_many([(str(idx), make_label("Public")) for idx in range(4)], max_concurrency=2)
+        self.assertEqual([o.response.text for o in outcomes], [f"echo {idx}" for idx in range(4)])
+        self.assertEqual(sum(o.attempts for o in outcomes), 6)
+        self.assertEqual(server.calls, 6)
+
+        server.calls, server.limited_calls = 0, 100
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="m", base_url=f"http://127.0.0.1:{server.server_address[1]}", http_client=pool)
+            [outcome] = llm.generate_many([("x", make_label("Public"))], rate_limit=RetryPolicy(max_attempts=2))
+        self.assertIsNone(outcome.response)
+        self.assertEqual(outcome.attempts, 2)
+        self.assertIn("429", outcome.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import sys
+import tempfile
+import threading
+import types
+import unittest
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.extract import TRUNCATION_MARKER
+from ifc_agent.http_fetch import HTTPFetcher, decompress_stream
+from ifc_agent.http_pool import HTTPConnectionPool
+from ifc_agent.labels import Lattice
+from ifc_agent.scraper import AsyncWebScraper, WebScraper
+from ifc_agent.tools import AgentTools
+
+ARTICLE = "<html><body><article><p>" + "Static article text about river ecology. " * 20 + "</p></article></body></html>"
+PAGES = {
+    "/static": ARTICLE,
+    "/static2": ARTICLE.replace("river", "estuary"),
+    "/shell": "<html><body><div id='root'></div><script src='/app.js'></script></body></html>",
+    "/noscript": ARTICLE.replace("<body>", "<body><noscript>Please enable JavaScript to continue.</noscript>"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self) -> None:
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/static")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        page = PAGES.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _LocalServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        _Handler.connections = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+class HTTPFetcherTests(_LocalServerTestCase):
+    def test_keep_alive_gzip_and_redirects(self) -> None:
+        with HTTPFetcher() as fetcher:
+            first = fetcher.fetch(f"{self.base}/static")
+            redirected = fetcher.fetch(f"{self.base}/redirect")
+
+        self.assertEqual(first.status, 200)
+        self.assertEqual(first.text(), ARTICLE)
+        self.assertEqual(redirected.url, f"{self.base}/static")
+        self.assertEqual(redirected.text(), ARTICLE)
+        self.assertEqual(_Handler.connections, 1)
+
+    def test_byte_cap_truncates_decoded_body(self) -> None:
+        with HTTPFetcher(max_bytes=100) as fetcher:
+            response = fetcher.fetch(f"{self.base}/static")
+        self.assertTrue(response.truncated)
+        self.assertEqual(response.body, ARTICLE.encode("utf-8")[:100])
+
+    def test_fetches_share_the_given_pool(self) -> None:
+        with HTTPConnectionPool() as pool:
+            fetcher = HTTPFetcher(pool=pool)
+            self.assertEqual(fetcher.fetch(f"{self.base}/static").text(), ARTICLE)
+            for _ in range(2):
+                self.assertEqual(fetcher.fetch(f"{self.base}/missing").status, 404)
+            fetcher.close()
+            # A borrowed pool outlives the fetcher.
+            self.assertEqual(pool.counters, {"opened": 1, "reused": 2})
+            self.assertEqual(pool.request("GET", f"{self.base}/static").status, 200)
+
+
+class DecompressStreamTests(unittest.TestCase):
+    def test_each_step_is_bounded(self) -> None:
+        body = b"a" * (4 << 20)
+        pieces = list(decompress_stream("gzip", [gzip.compress(body)], step=1 << 16))
+        self.assertEqual(b"".join(pieces), body)
+        self.assertLessEqual(max(len(piece) for piece in pieces), 1 << 16)
+
+    def test_raw_deflate_and_identity(self) -> None:
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        deflated = raw.compress(ARTICLE.encode("utf-8")) + raw.flush()
+        self.assertEqual(b"".join(decompress_stream("deflate", [deflated[:5], deflated[5:]])), ARTICLE.encode("utf-8"))
+        self.assertEqual(list(decompress_stream("", [b"a", b"b"])), [b"a", b"b"])
+
+
+class HTTPFirstScraperTests(_LocalServerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.browser_urls: list[str] = []
+
+        scraper_test = self
+
+        class _Page:
+            def goto(self, url: str, timeout: int) -> None:
+                scraper_test.browser_urls.append(url)
+
+            def wait_for_load_state(self, state: str) -> None:
+                pass
+
+            def on(self, event: str, handler) -> None:
+                pass
+
+            def content(self) -> str:
+                return "<html><body>rendered</body></html>"
+
+            def inner_text(self, selector: str) -> str:
+                return "rendered"
+
+        class _Browser:
+            def is_connected(self) -> bool:
+                return True
+
+            def new_context(self, user_agent: str):
+                return types.SimpleNamespace(new_page=_Page, close=lambda: None)
+
+            def close(self) -> None:
+                pass
+
+        class _Manager:
+            def __enter__(self):
+                return types.SimpleNamespace(chromium=types.SimpleNamespace(launch=lambda headless: _Browser()))
+
+            def __exit__(self, exc_type, exc, tb) -> bool:
+                return False
+
+        module = types.SimpleNamespace(sync_playwright=_Manager)
+        patcher = patch.dict(sys.modules, {"playwright.sync_api": module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_static_pages_skip_the_browser(self) -> None:
+        with WebScraper(http_first=True) as scraper:
+            content = scraper.scrape(f"{self.base}/static")
+        self.assertEqual(content.fetch_tier, "http")
+        self.assertIn("river ecology", content.clean_text)
+        self.assertEqual(self.browser_urls, [])
+
+    def test_js_pages_and_render_domains_escalate(self) -> None:
+        with WebScraper(http_first=True, render_domains=["localhost"]) as scraper:
+            tiers = {
+                path: scraper.scrape(f"{self.base}{path}").fetch_tier
+                for path in ("/shell", "/noscript", "/missing")
+            }
+            forced = scraper.scrape(f"http://localhost:{self.server.server_address[1]}/static")
+        self.assertEqual(set(tiers.values()), {"browser"})
+        self.assertEqual(forced.fetch_tier, "browser")
+        self.assertEqual(len(self.browser_urls), 4)
+
+    def test_capped_static_page_is_marked_truncated(self) -> None:
+        with WebScraper(http_first=True, max_page_bytes=400, min_static_text_chars=50) as scraper:
+            content = scraper.scrape(f"{self.base}/static")
+        self.assertEqual(content.fetch_tier, "http")
+        self.assertTrue(content.clean_text.endswith(TRUNCATION_MARKER))
+
+    def test_conditional_scrape_returns_not_modified(self) -> None:
+        with WebScraper() as scraper:
+            content = scraper.scrape(f"{self.base}/static", etag='"v1"')
+            stale = scraper.scrape(f"{self.base}/static", etag='"v0"')
+        self.assertTrue(content.not_modified)
+        self.assertEqual(content.etag, '"v1"')
+        self.assertEqual(self.browser_urls, [f"{self.base}/static"])
+        self.assertFalse(stale.not_modified)
+
+
+class AsyncHTTPFirstScraperTests(_LocalServerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        # Any browser launch fails, so only the HTTP tier can serve these pages.
+        patcher = patch.dict(sys.modules, {"playwright.async_api": None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_static_pages_skip_the_browser(self) -> None:
+        urls = [f"{self.base}/static", f"{self.base}/static2"]
+        scraper = AsyncWebScraper(http_first=True, max_concurrency=2)
+        outcomes = asyncio.run(scraper.scrape_many(urls))
+        self.assertEqual([o.error for o in outcomes], [None, None])
+        self.assertEqual([o.content.fetch_tier for o in outcomes], ["http", "http"])
+        self.assertIn("estuary ecology", outcomes[1].content.clean_text)
+
+    def test_concurrent_rescrape_sends_stored_validators(self) -> None:
+        urls = [f"{self.base}/static", f"{self.base}/static2"]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(
+                lattice=Lattice(["Public", "Internal", "Confidential", "Secret"]),
+                storage_path=str(Path(tmpdir) / "store.json"),
+                scrape_concurrency=2,
+                http_first=True,
+            )
+            first = tools.scrape_parse_store(urls)
+            second = tools.scrape_parse_store(urls)
+        self.assertEqual([item.fetch_tier for item in second], ["not_modified", "not_modified"])
+        self.assertEqual([item.document_id for item in second], [item.document_id for item in first])
+
+    def test_agent_tools_session_serves_static_pages_without_a_browser(self) -> None:
+        # No browser can be launched by either scraper.
+        patcher = patch.dict(sys.modules, {"playwright.sync_api": None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for concurrency in (1, 2):
+                tools = AgentTools(
+                    lattice=Lattice(["Public", "Internal", "Confidential", "Secret"]),
+                    storage_path=str(Path(tmpdir) / f"store-{concurrency}.json"),
+                    scrape_concurrency=concurrency,
+                    http_first=True,
+                )
+                with tools:
+                    single = tools.scrape_parse_store([f"{self.base}/static"])
+                    pair = tools.scrape_parse_store([f"{self.base}/static2", f"{self.base}/static"])
+                self.assertEqual([item.fetch_tier for item in single + pair], ["http", "http", "not_modified"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.http_pool import HTTPConnectionPool, HTTPTimeouts
+from ifc_agent.labels import make_label
+from ifc_agent.llm import OllamaLLM, OpenAICompatibleLLM
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # One send per response; split writes stall keep-alive clients on Nagle/delayed ACK.
+    wbufsize = 1 << 16
+    # Set per test: close the connection after each response.
+    close_after = False
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.ports.add(self.client_address[1])
+        if payload.get("stream"):
+            self._stream(payload)
+            return
+        body = json.dumps({"response": f"echo {payload.get('prompt', '')}"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_after:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        if self.close_after:
+            self.close_connection = True
+
+    def _stream(self, payload: dict) -> None:
+        prompt = payload["messages"][-1]["content"] if "messages" in payload else payload.get("prompt", "")
+        words = prompt.split() or ["hi"]
+        if self.path == "/v1/chat/completions":
+            events = [f"data: {json.dumps({'choices': [{'delta': {'content': word + ' '}}]})}\n\n" for word in words]
+            events.append("data: [DONE]\n\n")
+            content_type = "text/event-stream"
+        else:
+            events = [json.dumps({"response": word + " ", "done": False}) + "\n" for word in words]
+            events.append(json.dumps({"response": "", "done": True, "eval_count": len(words) * 2}) + "\n")
+            content_type = "application/x-ndjson"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = event.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class HTTPConnectionPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.ports = set()
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_sequential_calls_reuse_one_connection(self) -> None:
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="m", base_url=self.base_url, http_client=pool)
+            texts = [llm.generate(f"p{idx}", make_label("Public")).text for idx in range(5)]
+            self.assertEqual(texts, [f"echo p{idx}" for idx in range(5)])
+            self.assertEqual(pool.counters, {"opened": 1, "reused": 4})
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_concurrent_calls_are_pooled_per_origin(self) -> None:
+        with HTTPConnectionPool(max_idle_per_origin=2) as pool:
+            llm = OllamaLLM(model="m", base_url=self.base_url, http_client=pool)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                texts = list(executor.map(lambda idx: llm.generate(str(idx), make_label("Public")).text, range(40)))
+            self.assertEqual(texts, [f"echo {idx}" for idx in range(40)])
+            self.assertEqual(pool.counters["opened"] + pool.counters["reused"], 40)
+            self.assertLessEqual(len(pool._idle[("http", "127.0.0.1", self.server.server_address[1])]), 2)
+
+    def test_server_closed_connection_is_replaced(self) -> None:
+        _Handler.close_after = True
+        self.addCleanup(setattr, _Handler, "close_after", False)
+        with HTTPConnectionPool() as pool:
+            for _ in range(3):
+                response = pool.request("POST", f"{self.base_url}/api/generate", body=b"{}")
+                self.assertEqual(response.status, 200)
+            self.assertEqual(pool.counters, {"opened": 3})
+
+    def test_read_timeout_applies_after_connect(self) -> None:
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        self.addCleanup(listener.close)
+        pool = HTTPConnectionPool(HTTPTimeouts(connect_s=1.0, read_s=0.05))
+        with self.assertRaises(TimeoutError):
+            # Accepted by the kernel backlog but never answered.
+            pool.request("POST", f"http://127.0.0.1:{listener.getsockname()[1]}/api/generate", body=b"{}")
+
+    def test_ollama_stream_reads_ndjson_and_reuses_connection(self) -> None:
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="m", base_url=self.base_url, http_client=pool)
+            for _ in range(2):
+                stream = llm.generate_stream("one two three", make_label("Internal"))
+                self.assertEqual(stream.label, make_label("Internal"))
+                self.assertEqual(list(stream), ["one ", "two ", "three "])
+                self.assertEqual(stream.tokens, 6)
+            self.assertEqual(pool.counters, {"opened": 1, "reused": 1})
+
+    def test_openai_stream_reads_sse(self) -> None:
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "k"}), HTTPConnectionPool() as pool:
+            llm = OpenAICompatibleLLM(model="m", base_url=self.base_url, http_client=pool)
+            stream = llm.generate_stream("alpha beta", make_label("Public"))
+            self.assertEqual("".join(stream), "alpha beta ")
+            self.assertEqual(stream.tokens, 2)
+
+    def test_abandoned_stream_closes_its_connection(self) -> None:
+        with HTTPConnectionPool() as pool:
+            llm = OllamaLLM(model="m", base_url=self.base_url, http_client=pool)
+            chunks = iter(llm.generate_stream("a b c d", make_label("Public")))
+            self.assertEqual(next(chunks), "a ")
+            chunks.close()
+            self.assertEqual(llm.generate("x", make_label("Public")).text, "echo x")
+            self.assertEqual(pool.counters, {"opened": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
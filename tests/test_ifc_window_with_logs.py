@@ -57,7 +57,7 @@ class _SeedScraper:
 
 
 class _AlwaysPublicParser:
-    def assess(self, url: str, clean_text: str, raw_html: str) -> TrustAssessment:
+    def assess(self, url: str, clean_text: str, raw_html: str, analyzed=None) -> TrustAssessment:
         return TrustAssessment(score=0.95, label=make_label("Public"), signals={"seeded": True})
 
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice, join_labels, make_label
+
+
+def _diamond() -> Lattice:
+    return Lattice(
+        ["Public", "HR", "Engineering", "Secret"],
+        flows=[("Public", "HR"), ("Public", "Engineering"), ("HR", "Secret"), ("Engineering", "Secret")],
+    )
+
+
+class LatticeTests(unittest.TestCase):
+    def test_list_config_is_total_order(self) -> None:
+        lattice = Lattice.from_config(["Public", "Internal", "Confidential", "Secret"])
+        self.assertTrue(lattice.level_flows("Public", "Secret"))
+        self.assertFalse(lattice.level_flows("Secret", "Internal"))
+        self.assertEqual(lattice.join_level("Internal", "Confidential"), "Confidential")
+
+    def test_partial_order_compartments_are_incomparable(self) -> None:
+        lattice = _diamond()
+        self.assertTrue(lattice.level_flows("Public", "Secret"))
+        self.assertFalse(lattice.level_flows("HR", "Engineering"))
+        self.assertFalse(lattice.level_flows("Engineering", "HR"))
+        self.assertEqual(lattice.join_level("HR", "Engineering"), "Secret")
+        self.assertEqual(lattice.join_level("Public", "HR"), "HR")
+
+    def test_join_labels_uses_join_table(self) -> None:
+        joined = join_labels(_diamond(), [make_label("HR", ["PII"]), make_label("Engineering")])
+        self.assertEqual(joined, make_label("Secret", ["PII"]))
+
+    def test_dict_config(self) -> None:
+        lattice = Lattice.from_config(
+            {
+                "levels": ["Public", "HR", "Engineering", "Secret"],
+                "flows": [["Public", "HR"], ["Public", "Engineering"], ["HR", "Secret"], ["Engineering", "Secret"]],
+            }
+        )
+        self.assertEqual(lattice.join_level("HR", "Engineering"), "Secret")
+
+    def test_rejects_cycles_and_missing_joins(self) -> None:
+        with self.assertRaises(ValueError):
+            Lattice(["A", "B"], flows=[("A", "B"), ("B", "A")])
+        with self.assertRaises(ValueError):
+            Lattice(["Low", "X", "Y"], flows=[("Low", "X"), ("Low", "Y")])
+
+
+if __name__ == "__main__":
+    unittest.main()
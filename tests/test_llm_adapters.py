@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import io
 import json
 import os
 import sys
 import unittest
-import urllib.error
 from pathlib import Path
 from unittest.mock import patch
 
@@ -13,59 +11,87 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from ifc_agent.http_pool import HTTPConnectionPool
 from ifc_agent.labels import make_label
 from ifc_agent.llm import OllamaLLM, OpenAICompatibleLLM
 
 
 class _FakeHTTPResponse:
-    def __init__(self, payload: dict) -> None:
+    def __init__(self, payload: dict, status: int = 200) -> None:
         self._payload = payload
+        self.status = status
+        self.will_close = False
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb) -> bool:
-        return False
+    def getheaders(self) -> list[tuple[str, str]]:
+        return [("Content-Type", "application/json")]
 
     def read(self) -> bytes:
+        if isinstance(self._payload, bytes):
+            return self._payload
         return json.dumps(self._payload).encode("utf-8")
 
 
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.timeout: float | None = None
+
+    def settimeout(self, timeout: float) -> None:
+        self.timeout = timeout
+
+
+def _fake_connection_class(captured: dict[str, object], response: _FakeHTTPResponse):
+    class _FakeConnection:
+        def __init__(self, host: str, port: int, timeout: float = 0) -> None:
+            captured["host"] = host
+            captured["port"] = port
+            captured["connect_timeout"] = timeout
+            self.sock = _FakeSocket()
+
+        def connect(self) -> None:
+            pass
+
+        def request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> None:
+            captured["path"] = path
+            captured["method"] = method
+            captured["headers"] = headers or {}
+            captured["payload"] = json.loads(body.decode("utf-8"))
+
+        def getresponse(self) -> _FakeHTTPResponse:
+            captured["timeout"] = self.sock.timeout
+            return response
+
+        def close(self) -> None:
+            pass
+
+    return _FakeConnection
+
+
 class LLMAdaptersTests(unittest.TestCase):
     def test_ollama_generate_maps_response_text(self) -> None:
         captured: dict[str, object] = {}
+        fake = _fake_connection_class(captured, _FakeHTTPResponse({"response": "hello from ollama"}))
 
-        def _fake_urlopen(req, timeout=0):
-            captured["url"] = req.full_url
-            captured["method"] = req.get_method()
-            captured["timeout"] = timeout
-            captured["payload"] = json.loads(req.data.decode("utf-8"))
-            return _FakeHTTPResponse({"response": "hello from ollama"})
-
-        with patch("urllib.request.urlopen", side_effect=_fake_urlopen):
-            llm = OllamaLLM(model="qwen2.5:7b-instruct", base_url="http://127.0.0.1:11434")
+        with patch("http.client.HTTPConnection", fake):
+            llm = OllamaLLM(
+                model="qwen2.5:7b-instruct",
+                base_url="http://127.0.0.1:11434",
+                http_client=HTTPConnectionPool(),
+            )
             label = make_label("Internal")
             response = llm.generate("summarize", label)
 
         self.assertEqual(response.text, "hello from ollama")
         self.assertEqual(response.label, label)
-        self.assertEqual(captured["url"], "http://127.0.0.1:11434/api/generate")
+        self.assertEqual((captured["host"], captured["port"], captured["path"]), ("127.0.0.1", 11434, "/api/generate"))
         self.assertEqual(captured["method"], "POST")
         self.assertEqual(captured["timeout"], 120)
         self.assertEqual(captured["payload"], {"model": "qwen2.5:7b-instruct", "prompt": "summarize", "stream": False})
 
     def test_ollama_generate_surfaces_http_error_body(self) -> None:
-        def _fake_urlopen(req, timeout=0):
-            raise urllib.error.HTTPError(
-                url=req.full_url,
-                code=500,
-                msg="Internal Server Error",
-                hdrs=None,
-                fp=io.BytesIO(b'{"error":"backend exploded"}'),
-            )
+        fake = _fake_connection_class({}, _FakeHTTPResponse(b'{"error":"backend exploded"}', status=500))
 
-        with patch("urllib.request.urlopen", side_effect=_fake_urlopen):
-            llm = OllamaLLM(model="qwen2.5:7b-instruct")
+        with patch("http.client.HTTPConnection", fake):
+            llm = OllamaLLM(model="qwen2.5:7b-instruct", http_client=HTTPConnectionPool())
             with self.assertRaises(RuntimeError) as exc:
                 llm.generate("ping", make_label("Public"))
 
@@ -81,31 +107,26 @@ class LLMAdaptersTests(unittest.TestCase):
 
     def test_openai_compatible_maps_chat_response(self) -> None:
         captured: dict[str, object] = {}
-
-        def _fake_urlopen(req, timeout=0):
-            captured["url"] = req.full_url
-            captured["method"] = req.get_method()
-            captured["auth"] = req.headers.get("Authorization")
-            captured["payload"] = json.loads(req.data.decode("utf-8"))
-            captured["timeout"] = timeout
-            return _FakeHTTPResponse(
-                {"choices": [{"message": {"content": "hello from api"}}]}
-            )
+        fake = _fake_connection_class(
+            captured,
+            _FakeHTTPResponse({"choices": [{"message": {"content": "hello from api"}}]}),
+        )
 
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}, clear=True):
-            with patch("urllib.request.urlopen", side_effect=_fake_urlopen):
+            with patch("http.client.HTTPSConnection", fake):
                 llm = OpenAICompatibleLLM(
                     model="gpt-4o-mini",
                     base_url="https://api.openai.com",
+                    http_client=HTTPConnectionPool(),
                 )
                 label = make_label("Internal")
                 response = llm.generate("give summary", label)
 
         self.assertEqual(response.text, "hello from api")
         self.assertEqual(response.label, label)
-        self.assertEqual(captured["url"], "https://api.openai.com/v1/chat/completions")
+        self.assertEqual((captured["host"], captured["port"], captured["path"]), ("api.openai.com", 443, "/v1/chat/completions"))
         self.assertEqual(captured["method"], "POST")
-        self.assertEqual(captured["auth"], "Bearer test-key")
+        self.assertEqual(captured["headers"]["Authorization"], "Bearer test-key")
         self.assertEqual(captured["timeout"], 120)
         self.assertEqual(
             captured["payload"],
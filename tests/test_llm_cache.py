@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Label, make_label
+from ifc_agent.llm import BaseLLM, LLMResponse, LLMStream
+from ifc_agent.llm_cache import CachedLLM, ResponseCache
+
+
+class _CountingLLM(BaseLLM):
+    def __init__(self, name: str = "fake:model") -> None:
+        super().__init__(name=name, is_external=False)
+        self.calls = 0
+
+    def generate(self, prompt: str, label: Label) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(text=f"answer {self.calls} to {prompt}", label=label)
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        self.calls += 1
+        return LLMStream(label, iter(["streamed ", "answer"]))
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = Path(self._tmpdir.name) / "cache.sqlite3"
+        self.clock = _FakeClock()
+
+    def _cache(self, **kwargs) -> ResponseCache:
+        cache = ResponseCache(self.path, clock=self.clock, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_hits_persist_across_instances(self) -> None:
+        backend = _CountingLLM()
+        llm = CachedLLM(backend, self._cache())
+        first = llm.generate("p", make_label("Internal"))
+        self.assertEqual(llm.generate("p", make_label("Internal")), first)
+        self.assertEqual(backend.calls, 1)
+
+        reopened = CachedLLM(backend, self._cache())
+        self.assertEqual(reopened.generate("p", make_label("Internal")), first)
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(llm.counters(), {"cache_misses": 1, "cache_hits": 1})
+
+    def test_entries_are_partitioned_by_label_and_backend(self) -> None:
+        cache = self._cache()
+        backend = _CountingLLM()
+        llm = CachedLLM(backend, cache)
+        secret = llm.generate("p", make_label("Secret", ["PII"]))
+        public = llm.generate("p", make_label("Public"))
+        also_pii = llm.generate("p", make_label("Secret", ["PII", "Untrusted"]))
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(public.label, make_label("Public"))
+        self.assertNotEqual(public.text, secret.text)
+        self.assertNotEqual(also_pii.text, secret.text)
+
+        other = CachedLLM(_CountingLLM(name="fake:other-model"), cache)
+        other.generate("p", make_label("Public"))
+        self.assertEqual(len(cache), 4)
+
+    def test_ttl_and_lru_eviction(self) -> None:
+        cache = self._cache(max_bytes=60, ttl_seconds=100)
+        label = make_label("Public")
+        for prompt in ("a", "b", "c"):
+            cache.put("m", prompt, label, LLMResponse(text="x" * 25, label=label))
+            self.clock.now += 1
+            cache.get("m", "a", label)
+        # "b" was least recently used once "c" pushed the total past 60 bytes.
+        self.assertIsNone(cache.get("m", "b", label))
+        self.assertIsNotNone(cache.get("m", "a", label))
+        self.assertEqual(cache.counters["evictions"], 1)
+
+        self.clock.now += 101
+        self.assertIsNone(cache.get("m", "c", label))
+        self.assertEqual(cache.counters["expired"], 1)
+
+    def test_streamed_miss_is_cached_after_completion(self) -> None:
+        backend = _CountingLLM()
+        llm = CachedLLM(backend, self._cache())
+        stream = llm.generate_stream("p", make_label("Internal"))
+        self.assertEqual("".join(stream), "streamed answer")
+        self.assertEqual(stream.tokens, 2)
+        again = llm.generate_stream("p", make_label("Internal"))
+        self.assertEqual(list(again), ["streamed answer"])
+        self.assertEqual(again.label, make_label("Internal"))
+        self.assertEqual(backend.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
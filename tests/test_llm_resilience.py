@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Label, make_label
+from ifc_agent.llm import BaseLLM, LLMHTTPError, LLMResponse, LLMStream
+from ifc_agent.llm_resilience import LLMCallError, ResilientLLM, classify_llm_error
+from ifc_agent.resilience import RetryPolicy
+
+
+class _ScriptedLLM(BaseLLM):
+    """Raises the scripted errors in order, then answers."""
+
+    def __init__(self, errors: list[Exception]) -> None:
+        super().__init__(name="fake:scripted", is_external=False)
+        self._errors = list(errors)
+        self.calls = 0
+
+    def generate(self, prompt: str, label: Label) -> LLMResponse:
+        self.calls += 1
+        if self._errors:
+            raise self._errors.pop(0)
+        return LLMResponse(text="ok", label=label)
+
+    def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+        def _chunks():
+            self.calls += 1
+            if self._errors:
+                raise self._errors.pop(0)
+            yield "o"
+            yield "k"
+
+        return LLMStream(label, _chunks())
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ResilientLLMTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+
+    def _guard(self, backend: BaseLLM, **kwargs) -> ResilientLLM:
+        kwargs.setdefault("retry", RetryPolicy(max_attempts=3, base_delay_s=0.5, max_delay_s=4.0))
+        return ResilientLLM(
+            backend,
+            deadline_s=None,
+            clock=self.clock,
+            sleep=self.clock.sleep,
+            rng=random.Random(7),
+            **kwargs,
+        )
+
+    def test_transient_errors_are_retried_with_retry_after(self) -> None:
+        backend = _ScriptedLLM(
+            [LLMHTTPError("Ollama API error: 503 - busy", 503), LLMHTTPError("slow down", 429, retry_after=2.0)]
+        )
+        llm = self._guard(backend)
+        self.assertEqual(llm.generate("p", make_label("Public")).text, "ok")
+        self.assertEqual(backend.calls, 3)
+        self.assertLessEqual(self.clock.sleeps[0], 0.5)
+        self.assertGreaterEqual(self.clock.sleeps[1], 2.0)
+        self.assertEqual(
+            llm.counters(),
+            {"attempts": 3, "retries": 2, "errors_server_error": 1, "errors_rate_limited": 1},
+        )
+
+    def test_client_errors_fail_at_once_with_classification(self) -> None:
+        backend = _ScriptedLLM([LLMHTTPError("OpenAI-compatible API error: 400 - bad", 400)])
+        llm = self._guard(backend)
+        with self.assertRaises(LLMCallError) as ctx:
+            llm.generate("p", make_label("Public"))
+        self.assertEqual((ctx.exception.kind, ctx.exception.attempts, ctx.exception.status), ("client_error", 1, 400))
+        self.assertIsNone(ctx.exception.retry_after)
+        self.assertIsInstance(ctx.exception.__cause__, LLMHTTPError)
+        self.assertEqual(backend.calls, 1)
+
+    def test_breaker_opens_and_recovers_after_reset(self) -> None:
+        backend = _ScriptedLLM([ConnectionRefusedError("refused")] * 4)
+        llm = self._guard(backend, retry=RetryPolicy(max_attempts=2), failure_threshold=2, reset_timeout_s=30.0)
+        with self.assertRaises(LLMCallError) as ctx:
+            llm.generate("p", make_label("Public"))
+        self.assertEqual((ctx.exception.kind, ctx.exception.attempts), ("connection", 2))
+        self.assertEqual(llm.circuit_state, "open")
+
+        with self.assertRaises(LLMCallError) as ctx:
+            llm.generate("p", make_label("Public"))
+        self.assertEqual(ctx.exception.kind, "circuit_open")
+        self.assertEqual(backend.calls, 2)
+
+        self.clock.now += 31
+        with self.assertRaises(LLMCallError):
+            llm.generate("p", make_label("Public"))
+        # The half-open trial failed, so the breaker opened again without a retry.
+        self.assertEqual(backend.calls, 3)
+        self.clock.now += 31
+        backend._errors.clear()
+        self.assertEqual(llm.generate("p", make_label("Public")).text, "ok")
+        self.assertEqual(llm.circuit_state, "closed")
+        self.assertEqual(llm.counters()["short_circuited"], 1)
+
+    def test_deadline_bounds_a_stalled_call(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        class _StalledLLM(BaseLLM):
+            def generate(self, prompt: str, label: Label) -> LLMResponse:
+                release.wait(5)
+                return LLMResponse(text="late", label=label)
+
+        llm = ResilientLLM(_StalledLLM(name="fake:stalled", is_external=False), deadline_s=0.05)
+        start = time.perf_counter()
+        with self.assertRaises(LLMCallError) as ctx:
+            llm.generate("p", make_label("Public"))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual((ctx.exception.kind, ctx.exception.attempts), ("deadline", 1))
+        self.assertEqual(llm.counters()["errors_deadline"], 1)
+
+    def test_deadline_bounds_a_stream_that_stalls_mid_answer(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        class _StallingLLM(BaseLLM):
+            def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+                def _chunks():
+                    yield "partial"
+                    release.wait(5)
+                    yield "late"
+
+                return LLMStream(label, _chunks())
+
+        llm = ResilientLLM(_StallingLLM(name="fake:stalling", is_external=False), deadline_s=0.1)
+        received: list[str] = []
+        start = time.perf_counter()
+        with self.assertRaises(LLMCallError) as ctx:
+            for chunk in llm.generate_stream("p", make_label("Public")):
+                received.append(chunk)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(received, ["partial"])
+        self.assertEqual((ctx.exception.kind, ctx.exception.attempts), ("deadline", 1))
+
+    def test_final_rate_limit_keeps_status_for_generate_many(self) -> None:
+        backend = _ScriptedLLM([LLMHTTPError("slow down", 429, retry_after=0.01)])
+        llm = ResilientLLM(backend, retry=RetryPolicy(max_attempts=1), deadline_s=None)
+        [outcome] = llm.generate_many([("p", make_label("Public"))], rate_limit=RetryPolicy(max_attempts=2))
+        self.assertEqual(outcome.response.text, "ok")
+        self.assertEqual(outcome.attempts, 2)
+
+    def test_stream_is_retried_before_its_first_chunk(self) -> None:
+        backend = _ScriptedLLM([TimeoutError("read timed out")])
+        llm = self._guard(backend)
+        stream = llm.generate_stream("p", make_label("Internal"))
+        self.assertEqual(backend.calls, 0)
+        self.assertEqual(stream.label, make_label("Internal"))
+        self.assertEqual(list(stream), ["o", "k"])
+        self.assertEqual(stream.tokens, 2)
+        self.assertEqual(llm.counters()["retries"], 1)
+
+    def test_error_after_first_chunk_is_classified_and_trips_the_breaker(self) -> None:
+        class _BreakingLLM(BaseLLM):
+            def generate_stream(self, prompt: str, label: Label) -> LLMStream:
+                def _chunks():
+                    yield "partial"
+                    raise ConnectionResetError("reset by peer")
+
+                return LLMStream(label, _chunks())
+
+        for deadline_s in (None, 5.0):
+            llm = ResilientLLM(
+                _BreakingLLM(name="fake:breaking", is_external=False),
+                deadline_s=deadline_s,
+                failure_threshold=1,
+                reset_timeout_s=30.0,
+            )
+            received: list[str] = []
+            with self.assertRaises(LLMCallError) as ctx:
+                for chunk in llm.generate_stream("p", make_label("Public")):
+                    received.append(chunk)
+            self.assertEqual(received, ["partial"])
+            self.assertEqual((ctx.exception.kind, ctx.exception.attempts), ("connection", 1))
+            self.assertIsInstance(ctx.exception.__cause__, ConnectionResetError)
+            self.assertEqual(llm.counters()["errors_connection"], 1)
+            self.assertEqual(llm.circuit_state, "open")
+
+    def test_classification(self) -> None:
+        cases = [
+            (LLMHTTPError("x", 429), "rate_limited"),
+            (LLMHTTPError("x", 502), "server_error"),
+            (LLMHTTPError("x", 401), "client_error"),
+            (TimeoutError(), "timeout"),
+            (ConnectionResetError(), "connection"),
+            (json.JSONDecodeError("x", "", 0), "bad_response"),
+            (RuntimeError("Missing API key for external LLM."), "other"),
+        ]
+        for error, kind in cases:
+            with self.subTest(kind=kind):
+                self.assertEqual(classify_llm_error(error), kind)
+
+
+if __name__ == "__main__":
+    unittest.main()
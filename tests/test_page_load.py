@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.page_load import LoadStrategies, LoadStrategy, ResourceFilter, response_size
+from ifc_agent.scraper import WebScraper
+
+
+class LoadStrategyTests(unittest.TestCase):
+    def test_validates_wait(self) -> None:
+        with self.assertRaises(ValueError):
+            LoadStrategy(wait="eventually")
+        with self.assertRaises(ValueError):
+            LoadStrategy(wait="selector")
+
+    def test_most_specific_domain_wins(self) -> None:
+        strategies = LoadStrategies.from_config(
+            {"wait": "load", "timeout_ms": 500},
+            {
+                "example.com": {"wait": "domcontentloaded"},
+                "docs.example.com": {"wait": "selector", "selector": "main"},
+            },
+        )
+        self.assertEqual(strategies.for_url("https://other.test/").wait, "load")
+        self.assertEqual(strategies.for_url("https://other.test/").timeout_ms, 500)
+        self.assertEqual(strategies.for_url("https://www.example.com/").wait, "domcontentloaded")
+        self.assertEqual(strategies.for_url("https://a.docs.example.com/").selector, "main")
+        self.assertEqual(LoadStrategies().for_url("https://x.test/"), LoadStrategy())
+
+
+class ResourceFilterTests(unittest.TestCase):
+    def test_blocks_types_and_domains_but_not_navigation(self) -> None:
+        resource_filter = ResourceFilter(["Image", "font"], ["ads.test"])
+        self.assertTrue(resource_filter)
+        self.assertTrue(resource_filter.blocks("image", "https://example.com/a.png"))
+        self.assertTrue(resource_filter.blocks("script", "https://cdn.ads.test/t.js"))
+        self.assertFalse(resource_filter.blocks("script", "https://example.com/app.js"))
+        self.assertFalse(resource_filter.blocks("document", "https://ads.test/", is_navigation=True))
+        self.assertFalse(ResourceFilter())
+
+    def test_response_size_reads_content_length(self) -> None:
+        self.assertEqual(response_size(types.SimpleNamespace(headers={"content-length": "42"})), 42)
+        self.assertEqual(response_size(types.SimpleNamespace(headers={})), 0)
+        self.assertEqual(response_size(None), 0)
+
+
+# Stands in for playwright's TimeoutError, which the scraper matches by name.
+_PlaywrightTimeoutError = type("TimeoutError", (Exception,), {})
+
+
+class _Request:
+    def __init__(self, resource_type: str, url: str, navigation: bool = False) -> None:
+        self.resource_type = resource_type
+        self.url = url
+        self._navigation = navigation
+
+    def is_navigation_request(self) -> bool:
+        return self._navigation
+
+
+class _Route:
+    def __init__(self, request: _Request, log: list[tuple[str, str]]) -> None:
+        self.request = request
+        self._log = log
+
+    def abort(self) -> None:
+        self._log.append(("abort", self.request.url))
+
+    def continue_(self) -> None:
+        self._log.append(("continue", self.request.url))
+
+
+class _Page:
+    def __init__(self, context: "_Context") -> None:
+        self._context = context
+        self._handlers: list = []
+        self.goto_kwargs: list[dict] = []
+        self.waits: list[tuple[str, str, dict]] = []
+
+    def on(self, event: str, handler) -> None:
+        self._handlers.append(handler)
+
+    def goto(self, url: str, **kwargs):
+        self.goto_kwargs.append(kwargs)
+        requests = [
+            _Request("document", url, navigation=True),
+            _Request("image", f"{url}/hero.png"),
+            _Request("script", "https://tracker.ads.test/t.js"),
+            _Request("stylesheet", f"{url}/site.css"),
+        ]
+        for request in requests:
+            self._context.handler(_Route(request, self._context.routed))
+        allowed = {url for action, url in self._context.routed if action == "continue"}
+        for size, request in zip((1000, 50000, 700, 300), requests):
+            if request.url in allowed:
+                for handler in self._handlers:
+                    handler(types.SimpleNamespace(headers={"content-length": str(size)}))
+        return types.SimpleNamespace(headers={"content-length": "1000"})
+
+    def wait_for_load_state(self, state: str, **kwargs) -> None:
+        self.waits.append(("load_state", state, kwargs))
+
+    def wait_for_selector(self, selector: str, **kwargs) -> None:
+        self.waits.append(("selector", selector, kwargs))
+        raise _PlaywrightTimeoutError("selector did not appear")
+
+    def content(self) -> str:
+        return "<html><body>loaded</body></html>"
+
+    def inner_text(self, selector: str) -> str:
+        return "loaded"
+
+
+class _Context:
+    def __init__(self) -> None:
+        self.routed: list[tuple[str, str]] = []
+        self.handler = lambda route: route.continue_()
+        self.pages: list[_Page] = []
+
+    def route(self, pattern: str, handler) -> None:
+        self.handler = handler
+
+    def new_page(self) -> _Page:
+        self.pages.append(_Page(self))
+        return self.pages[-1]
+
+    def close(self) -> None:
+        pass
+
+
+class BrowserPageLoadTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.contexts: list[_Context] = []
+
+        def _new_context(user_agent: str) -> _Context:
+            self.contexts.append(_Context())
+            return self.contexts[-1]
+
+        browser = types.SimpleNamespace(is_connected=lambda: True, new_context=_new_context, close=lambda: None)
+        playwright = types.SimpleNamespace(chromium=types.SimpleNamespace(launch=lambda headless: browser))
+        manager = types.SimpleNamespace(__enter__=lambda: playwright, __exit__=lambda *args: False)
+        module = types.SimpleNamespace(sync_playwright=lambda: manager)
+        patcher = patch.dict(sys.modules, {"playwright.sync_api": module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_blocks_subresources_and_records_load_metrics(self) -> None:
+        scraper = WebScraper(resource_filter=ResourceFilter(["image"], ["ads.test"]))
+        with scraper:
+            content = scraper.scrape("https://example.com/a")
+
+        routed = self.contexts[0].routed
+        self.assertIn(("abort", "https://example.com/a/hero.png"), routed)
+        self.assertIn(("abort", "https://tracker.ads.test/t.js"), routed)
+        self.assertIn(("continue", "https://example.com/a"), routed)
+        self.assertEqual(content.bytes_transferred, 1300)
+        self.assertIsNotNone(content.load_ms)
+        page = self.contexts[0].pages[0]
+        self.assertEqual(page.goto_kwargs, [{"timeout": 60000}])
+        self.assertEqual(page.waits, [("load_state", "networkidle", {})])
+
+    def test_selector_wait_is_capped_per_domain(self) -> None:
+        strategies = LoadStrategies(
+            by_domain={"docs.test": LoadStrategy(wait="selector", selector="main", timeout_ms=250)},
+        )
+        with WebScraper(load_strategies=strategies) as scraper:
+            content = scraper.scrape("https://docs.test/guide")
+
+        self.assertEqual(content.clean_text, "loaded")
+        page = self.contexts[0].pages[0]
+        self.assertEqual(page.goto_kwargs, [{"timeout": 60000, "wait_until": "domcontentloaded"}])
+        self.assertEqual(page.waits, [("selector", "main", {"timeout": 250})])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import re
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from ifc_agent import parser as parser_module
 from ifc_agent.parser import TrustParser
+from ifc_agent.storage import JSONAssessmentCache
+
+MOCK_WEB = PROJECT_ROOT / "mock_web"
 
 
 class TrustParserTests(unittest.TestCase):
@@ -28,6 +35,106 @@ class TrustParserTests(unittest.TestCase):
         self.assertGreaterEqual(assessment.score, 0.8)
         self.assertEqual(assessment.label.level, "Public")
 
+    def test_signals_match_case_insensitive_substring_semantics(self) -> None:
+        parser = TrustParser()
+        clean_text = "Posted BY staff of Acme CORP. See HTTP://a and WWW.b. (Cookie), Privacy! cookies login's"
+        raw_html = "<META NAME='Author'><TIME DATETIME='2025-01-01'>"
+        signals = parser.assess("http://unknown.example/", clean_text, raw_html).signals
+        self.assertTrue(signals["author_present"])
+        self.assertTrue(signals["date_present"])
+        self.assertTrue(signals["org_present"])
+        self.assertEqual(signals["reference_count"], 2)
+        # "(Cookie)," and "Privacy!" count; "cookies" and "login's" do not.
+        self.assertEqual(signals["boilerplate_ratio"], round(2 / 14, 4))
+
+    def test_chunked_scan_is_boundary_independent(self) -> None:
+        parser = TrustParser(trusted_domains=["localhost"])
+        for path in sorted(MOCK_WEB.glob("*.html")):
+            raw_html = path.read_text(encoding="utf-8")
+            clean_text = re.sub(r"<[^>]+>", " ", raw_html)
+            url = f"http://localhost:8000/{path.name}"
+            expected = parser.assess(url, clean_text, raw_html)
+            with patch.object(parser_module, "_SCAN_CHUNK_CHARS", 7):
+                chunked = parser.assess(url, clean_text, raw_html)
+            self.assertEqual(chunked, expected, path.name)
+
+    def test_assess_many_matches_inline_order_across_pool(self) -> None:
+        parser = TrustParser(trusted_domains=["localhost"])
+        items = []
+        for path in sorted(MOCK_WEB.glob("*.html")):
+            raw_html = path.read_text(encoding="utf-8")
+            items.append((f"http://localhost:8000/{path.name}", re.sub(r"<[^>]+>", " ", raw_html), raw_html))
+        expected = [parser.assess(*item) for item in items]
+        self.assertEqual(parser.assess_many(items, workers=2, chunksize=2), expected)
+        self.assertEqual(parser.assess_many(items), expected)
+        self.assertEqual(parser.assess_many([], workers=4), [])
+
+    def test_assess_many_reuses_a_given_pool(self) -> None:
+        parser = TrustParser(trusted_domains=["localhost"])
+        items = [(f"http://localhost:8000/{idx}.html", f"text {idx} by author", "<html></html>") for idx in range(4)]
+        expected = [parser.assess(*item) for item in items]
+        with parser.worker_pool(2) as pool, patch.object(TrustParser, "worker_pool", side_effect=AssertionError):
+            first = parser.assess_many(items[:2], workers=2, executor=pool)
+            second = parser.assess_many(items[2:], workers=2, executor=pool)
+        self.assertEqual(first + second, expected)
+
+
+class AssessmentCacheTests(unittest.TestCase):
+    def _parser(self, cache_path: Path, trusted: list[str]) -> TrustParser:
+        return TrustParser(trusted_domains=trusted, cache=JSONAssessmentCache(cache_path))
+
+    def test_repeat_ingest_skips_parsing_after_reload(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "store.assessments.json"
+            first = self._parser(cache_path, ["example.com"])
+            expected = first.assess("https://example.com/a", "By Alice", "<meta name='author'>")
+            first._cache.flush()
+
+            second = self._parser(cache_path, ["example.com"])
+            with patch.object(TrustParser, "_assess", side_effect=AssertionError("re-parsed")):
+                cached = second.assess("https://example.com/a", "By Alice", "<meta name='author'>")
+        self.assertEqual(cached, expected)
+
+    def test_config_change_invalidates_only_affected_hosts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "store.assessments.json"
+            before = self._parser(cache_path, ["example.com"])
+            for url in ("https://example.com/a", "https://other.example/a"):
+                before.assess(url, "text", "<html></html>")
+            before._cache.flush()
+
+            after = self._parser(cache_path, ["example.com", "other.example"])
+            calls: list[str] = []
+            original = TrustParser._assess
+
+            def _counting(parser, url, *args):
+                calls.append(url)
+                return original(parser, url, *args)
+
+            with patch.object(TrustParser, "_assess", _counting):
+                after.assess("https://example.com/a", "text", "<html></html>")
+                refreshed = after.assess("https://other.example/a", "text", "<html></html>")
+        self.assertEqual(calls, ["https://other.example/a"])
+        self.assertEqual(refreshed.signals["domain_signal"], 1.0)
+
+    def test_cache_drops_oldest_entries_past_its_bound(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "store.assessments.json"
+            parser = TrustParser(cache=JSONAssessmentCache(cache_path, max_entries=3))
+            for idx in range(5):
+                parser.assess(f"https://example.com/{idx}", f"text {idx}", "<html></html>")
+            parser._cache.flush()
+            self.assertEqual(len(parser._cache), 3)
+            # The file is replaced in one rename; no partial file is left behind.
+            self.assertEqual([path.name for path in Path(tmpdir).iterdir()], ["store.assessments.json"])
+
+            reloaded = TrustParser(cache=JSONAssessmentCache(cache_path, max_entries=3))
+            with patch.object(TrustParser, "_assess", side_effect=AssertionError("re-parsed")):
+                reloaded.assess("https://example.com/4", "text 4", "<html></html>")
+            with self.assertRaises(AssertionError):
+                with patch.object(TrustParser, "_assess", side_effect=AssertionError("re-parsed")):
+                    reloaded.assess("https://example.com/0", "text 0", "<html></html>")
+
 
 if __name__ == "__main__":
     unittest.main()
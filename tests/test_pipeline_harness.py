@@ -60,7 +60,7 @@ class _FactScraper:
 
 
 class _AlwaysPublicParser:
-    def assess(self, url: str, clean_text: str, raw_html: str) -> TrustAssessment:
+    def assess(self, url: str, clean_text: str, raw_html: str, analyzed=None) -> TrustAssessment:
         return TrustAssessment(
             score=0.9,
             label=make_label("Public"),
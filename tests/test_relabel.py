@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent import relabel
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.parser import TrustParser
+from ifc_agent.relabel import relabel_store
+from ifc_agent.scraper import ScrapedContent
+from ifc_agent.storage import JSONStorage
+from ifc_agent.tools import AgentTools
+
+TEXT = "Report by staff. See http://a http://b http://c"
+HTML = "<html><meta name='author'></html>"
+
+
+class _FakeScraper:
+    def scrape(self, url: str) -> ScrapedContent:
+        return ScrapedContent(url=url, fetched_at="2026-01-01T00:00:00+00:00", raw_html=HTML, clean_text=f"{TEXT} {url.split('://')[1]}")
+
+
+class RelabelTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+
+    def _ingest(self, store_path: str) -> None:
+        tools = AgentTools(lattice=self.lattice, storage_path=store_path)
+        tools._scraper = _FakeScraper()
+        tools.scrape_parse_store(["https://docs.example/a", "https://docs.example/b"])
+        tools.scrape_parse_store(["https://other.example/a"], scrape_label=make_label("Internal"))
+
+    def _check_relabel(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store_path = str(Path(tmpdir) / "store.json")
+            self._ingest(store_path)
+            storage = JSONStorage(store_path)
+            before = {item.document_id: item for item in storage.load_trust_assessments()}
+            self.assertTrue(all(item.label.level == "Internal" for item in before.values()))
+
+            parser = TrustParser(trusted_domains=["example"])
+            changes = relabel_store(storage, parser, self.lattice)
+            after = {item.document_id: item for item in storage.load_trust_assessments()}
+
+        self.assertEqual(len(changes), 3)
+        fresh = parser.assess("https://docs.example/a", f"{TEXT} docs.example/a", HTML)
+        by_domain = {change.domain: change for change in changes}
+        self.assertAlmostEqual(by_domain["docs.example"].new_score, fresh.score)
+        self.assertEqual(by_domain["docs.example"].new_label, make_label("Public"))
+        # The Internal scrape label is a floor for the other host.
+        self.assertEqual(by_domain["other.example"].new_label, make_label("Internal"))
+        for change in changes:
+            self.assertEqual(after[change.document_id].label, change.new_label)
+            self.assertEqual(after[change.document_id].signals["domain_signal"], 1.0)
+
+    def test_relabel_shifts_affected_scores_and_keeps_scrape_floor(self) -> None:
+        self._check_relabel()
+
+    def test_relabel_without_numpy(self) -> None:
+        with patch.object(relabel, "np", None):
+            self._check_relabel()
+
+    def test_unchanged_config_touches_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store_path = str(Path(tmpdir) / "store.json")
+            self._ingest(store_path)
+            changes = relabel_store(JSONStorage(store_path), TrustParser(), self.lattice)
+        self.assertEqual(changes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
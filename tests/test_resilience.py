@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice
+from ifc_agent.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, ScrapeGuard
+from ifc_agent.scraper import ScrapedContent, WebScraper
+from ifc_agent.tools import AgentTools
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _Flaky:
+    def __init__(self, failures: int, error: Exception | None = None) -> None:
+        self.failures = failures
+        self.calls = 0
+        self._error = error or TimeoutError("navigation timed out")
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self._error
+        return "page"
+
+
+class RetryAndBreakerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+
+    def _guard(self, **kwargs) -> ScrapeGuard:
+        return ScrapeGuard(clock=self.clock, sleep=self.clock.sleep, rng=random.Random(3), **kwargs)
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(max_attempts=8, base_delay_s=0.5, max_delay_s=2.0)
+        rng = random.Random(1)
+        delays = [policy.delay(retry, rng) for retry in range(8)]
+        self.assertTrue(all(0.0 <= delay <= min(2.0, 0.5 * 2**retry) for retry, delay in enumerate(delays)))
+        self.assertEqual(len(set(delays)), len(delays))
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_retries_until_success(self) -> None:
+        guard = self._guard(retry=RetryPolicy(max_attempts=3))
+        attempt = _Flaky(failures=2)
+        self.assertEqual(guard.run("https://slow.test/a", attempt), "page")
+        self.assertEqual(attempt.calls, 3)
+        self.assertEqual(len(self.clock.sleeps), 2)
+        self.assertLessEqual(self.clock.sleeps[1], 1.0)
+        self.assertEqual(guard.counters, {"retried": 2, "succeeded": 1})
+
+    def test_gives_up_and_skips_non_retryable_errors(self) -> None:
+        guard = self._guard(retry=RetryPolicy(max_attempts=2))
+        with self.assertRaises(TimeoutError):
+            guard.run("https://slow.test/a", _Flaky(failures=5))
+        missing = _Flaky(failures=1, error=ModuleNotFoundError("playwright"))
+        with self.assertRaises(ModuleNotFoundError):
+            guard.run("https://slow.test/b", missing)
+        self.assertEqual(missing.calls, 1)
+        self.assertEqual(guard.counters, {"retried": 1, "failed": 2})
+
+    def test_breaker_opens_per_host_and_half_opens_after_timeout(self) -> None:
+        guard = self._guard(retry=RetryPolicy(max_attempts=5), failure_threshold=2, reset_timeout_s=30.0)
+        attempt = _Flaky(failures=10)
+        with self.assertRaises(TimeoutError):
+            guard.run("https://down.test/a", attempt)
+        # The breaker opened on the second failure, cutting the retries short.
+        self.assertEqual(attempt.calls, 2)
+        self.assertEqual(guard.open_hosts(), ["down.test"])
+        with self.assertRaises(CircuitOpenError):
+            guard.run("https://down.test/b", attempt)
+        self.assertEqual(attempt.calls, 2)
+        self.assertEqual(guard.run("https://up.test/", _Flaky(failures=0)), "page")
+
+        self.clock.now += 30.0
+        self.assertEqual(guard.run("https://down.test/c", _Flaky(failures=0)), "page")
+        self.assertEqual(guard.open_hosts(), [])
+        self.assertEqual(guard.counters["short_circuited"], 1)
+
+    def test_failed_trial_reopens_breaker(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10.0, clock=self.clock)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+        self.clock.now = 10.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+    def test_async_retries(self) -> None:
+        guard = ScrapeGuard(retry=RetryPolicy(max_attempts=2, base_delay_s=0.001))
+        flaky = _Flaky(failures=1)
+
+        async def _attempt() -> str:
+            return flaky()
+
+        self.assertEqual(asyncio.run(guard.run_async("https://slow.test/", _attempt)), "page")
+        self.assertEqual(guard.counters, {"retried": 1, "succeeded": 1})
+
+
+class ToolsCircuitTests(unittest.TestCase):
+    def test_batch_fails_fast_for_a_dead_host(self) -> None:
+        calls: list[str] = []
+
+        def _scrape_once(scraper, url: str, etag, last_modified) -> ScrapedContent:
+            calls.append(url)
+            if "dead.test" in url:
+                raise TimeoutError("Timeout 20000ms exceeded")
+            return ScrapedContent(url=url, fetched_at="2026-01-01T00:00:00+00:00", raw_html="<p>ok</p>", clean_text="ok page")
+
+        urls = [f"https://dead.test/{idx}" for idx in range(4)] + ["https://live.test/a"]
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(WebScraper, "_scrape_once", _scrape_once):
+            tools = AgentTools(
+                lattice=Lattice(["Public", "Internal", "Confidential", "Secret"]),
+                storage_path=str(Path(tmpdir) / "store.json"),
+                scrape_attempts=2,
+                retry_base_delay_seconds=0.0,
+                circuit_failure_threshold=3,
+            )
+            batch = tools.scrape_parse_store_batch(urls)
+
+        self.assertEqual([item.url for item in batch.stored], ["https://live.test/a"])
+        self.assertEqual([item.url for item in batch.errors], urls[:4])
+        self.assertIn("circuit open for dead.test", batch.errors[3].error)
+        # Two attempts for the first URL, one before the breaker opens, then none.
+        self.assertEqual(calls.count("https://dead.test/0"), 2)
+        self.assertEqual(len([url for url in calls if "dead.test" in url]), 3)
+        self.assertEqual(batch.scrape_counts, {"retried": 1, "failed": 2, "short_circuited": 2, "succeeded": 1})
+        self.assertEqual(batch.open_circuits, ["dead.test"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice
+from ifc_agent.scraper import AsyncWebScraper, LocalFileScraper, WebScraper
+from ifc_agent.tools import AgentTools
+
+MOCK_WEB = PROJECT_ROOT / "mock_web"
+MOCK_BASE = "http://localhost:8000/"
+
+
+class _FakePage:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self._browser = browser
+        self._url = ""
+
+    def goto(self, url: str, timeout: int) -> None:
+        if "fail" in url:
+            raise ValueError("navigation failed")
+        self._url = url
+
+    def wait_for_load_state(self, state: str) -> None:
+        pass
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    def content(self) -> str:
+        return f"<html><body>{self._url}</body></html>"
+
+    def inner_text(self, selector: str) -> str:
+        return self._url
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.closed = False
+        self._browser = browser
+
+    def new_page(self) -> _FakePage:
+        return _FakePage(self._browser)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[_FakeContext] = []
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def new_context(self, user_agent: str) -> _FakeContext:
+        context = _FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.headless: list[bool] = []
+        self.chromium = self
+
+    def launch(self, headless: bool) -> _FakeBrowser:
+        self.headless.append(headless)
+        self.browsers.append(_FakeBrowser())
+        return self.browsers[-1]
+
+
+class _FakeManager:
+    def __init__(self, playwright: _FakePlaywright) -> None:
+        self._playwright = playwright
+        self.exited = False
+
+    def __enter__(self) -> _FakePlaywright:
+        return self._playwright
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.exited = True
+        return False
+
+
+class BrowserPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.playwright = _FakePlaywright()
+        self.managers: list[_FakeManager] = []
+
+        def _sync_playwright() -> _FakeManager:
+            self.managers.append(_FakeManager(self.playwright))
+            return self.managers[-1]
+
+        module = types.SimpleNamespace(sync_playwright=_sync_playwright)
+        patcher = patch.dict(sys.modules, {"playwright.sync_api": module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_open_scraper_launches_once_and_recycles_contexts(self) -> None:
+        with WebScraper(max_navigations=2) as scraper:
+            texts = [scraper.scrape(f"https://example.com/{idx}").clean_text for idx in range(5)]
+
+        self.assertEqual(texts, [f"https://example.com/{idx}" for idx in range(5)])
+        self.assertEqual(len(self.playwright.browsers), 1)
+        self.assertEqual(self.playwright.headless, [True])
+        browser = self.playwright.browsers[0]
+        self.assertEqual(len(browser.contexts), 3)
+        self.assertTrue(all(context.closed for context in browser.contexts))
+        self.assertTrue(browser.closed)
+        self.assertTrue(self.managers[0].exited)
+
+    def test_open_scraper_launches_on_first_browser_page(self) -> None:
+        with WebScraper() as scraper:
+            self.assertTrue(scraper.is_open)
+            self.assertEqual(self.playwright.browsers, [])
+            scraper.scrape("https://example.com/a")
+            scraper.scrape("https://example.com/b")
+            self.assertEqual(len(self.playwright.browsers), 1)
+        self.assertFalse(scraper.is_open)
+        self.assertTrue(self.playwright.browsers[0].closed)
+
+    def test_failed_navigation_discards_context(self) -> None:
+        with WebScraper() as scraper:
+            with self.assertRaises(RuntimeError) as exc:
+                scraper.scrape("https://example.com/fail")
+            scraper.scrape("https://example.com/ok")
+
+        self.assertIn("Failed to scrape https://example.com/fail", str(exc.exception))
+        first, second = self.playwright.browsers[0].contexts
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, second)
+
+    def test_disconnected_browser_is_relaunched(self) -> None:
+        with WebScraper(headless=False) as scraper:
+            scraper.scrape("https://example.com/a")
+            self.playwright.browsers[0].connected = False
+            scraper.scrape("https://example.com/b")
+
+        self.assertEqual(self.playwright.headless, [False, False])
+        self.assertEqual(len(self.managers), 1)
+
+    def test_scrape_without_open_launches_per_call(self) -> None:
+        scraper = WebScraper()
+        scraper.scrape("https://example.com/a")
+        scraper.scrape("https://example.com/b")
+
+        self.assertFalse(scraper.is_open)
+        self.assertEqual(len(self.playwright.browsers), 2)
+        self.assertTrue(all(manager.exited for manager in self.managers))
+
+
+class _AsyncFakePage:
+    def __init__(self, tracker: "_AsyncFakePlaywright") -> None:
+        self._tracker = tracker
+        self._url = ""
+
+    async def goto(self, url: str, timeout: int) -> None:
+        host = url.split("/")[2]
+        self._tracker.enter(host)
+        try:
+            await asyncio.sleep(0.01)
+            if "fail" in url:
+                raise ValueError("navigation failed")
+            self._url = url
+        finally:
+            self._tracker.leave(host)
+
+    async def wait_for_load_state(self, state: str) -> None:
+        pass
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    async def content(self) -> str:
+        return f"<html><body>{self._url}</body></html>"
+
+    async def inner_text(self, selector: str) -> str:
+        return self._url
+
+
+class _AsyncFakeContext:
+    def __init__(self, tracker: "_AsyncFakePlaywright") -> None:
+        self._tracker = tracker
+
+    async def new_page(self) -> _AsyncFakePage:
+        return _AsyncFakePage(self._tracker)
+
+    async def close(self) -> None:
+        pass
+
+
+class _AsyncFakeBrowser:
+    def __init__(self, tracker: "_AsyncFakePlaywright") -> None:
+        self._tracker = tracker
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def new_context(self, user_agent: str) -> _AsyncFakeContext:
+        return _AsyncFakeContext(self._tracker)
+
+    async def close(self) -> None:
+        pass
+
+
+class _AsyncFakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = self
+        self.launches = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.per_host: dict[str, int] = {}
+        self.max_per_host: dict[str, int] = {}
+
+    def enter(self, host: str) -> None:
+        self.in_flight += 1
+        self.per_host[host] = self.per_host.get(host, 0) + 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_per_host[host] = max(self.max_per_host.get(host, 0), self.per_host[host])
+
+    def leave(self, host: str) -> None:
+        self.in_flight -= 1
+        self.per_host[host] -= 1
+
+    async def launch(self, headless: bool) -> _AsyncFakeBrowser:
+        self.launches += 1
+        return _AsyncFakeBrowser(self)
+
+    async def __aenter__(self) -> "_AsyncFakePlaywright":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+class AsyncScraperTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.playwright = _AsyncFakePlaywright()
+        module = types.SimpleNamespace(async_playwright=lambda: self.playwright)
+        patcher = patch.dict(sys.modules, {"playwright.async_api": module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scrape_many_respects_limits_and_keeps_order(self) -> None:
+        urls = [f"https://a.example/{idx}" for idx in range(6)] + [f"https://b.example/{idx}" for idx in range(6)]
+        urls.insert(3, "https://b.example/fail")
+        scraper = AsyncWebScraper(max_concurrency=3, per_host_limit=2)
+        outcomes = asyncio.run(scraper.scrape_many(urls))
+
+        self.assertEqual([outcome.url for outcome in outcomes], urls)
+        failed = [outcome for outcome in outcomes if outcome.error]
+        self.assertEqual([outcome.url for outcome in failed], ["https://b.example/fail"])
+        self.assertIn("navigation failed", failed[0].error)
+        self.assertTrue(all(o.content.clean_text == o.url for o in outcomes if o.content is not None))
+        self.assertEqual(self.playwright.max_in_flight, 3)
+        self.assertLessEqual(max(self.playwright.max_per_host.values()), 2)
+        self.assertEqual(self.playwright.launches, 1)
+        self.assertFalse(scraper.is_open)
+
+
+class LocalFileScraperTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scraper = LocalFileScraper(url_map={MOCK_BASE: MOCK_WEB})
+
+    def test_mapped_and_file_urls_read_the_same_page(self) -> None:
+        mapped = self.scraper.scrape(f"{MOCK_BASE}01_public_research.html?x=1#top")
+        direct = self.scraper.scrape((MOCK_WEB / "01_public_research.html").as_uri())
+
+        self.assertEqual(mapped.fetch_tier, "file")
+        self.assertEqual(mapped.clean_text, direct.clean_text)
+        self.assertIn("<html", mapped.raw_html.lower())
+        self.assertGreater(mapped.bytes_transferred, 0)
+        self.assertIsNotNone(mapped.etag)
+        self.assertEqual(self.scraper.scrape(MOCK_BASE).clean_text, self.scraper.scrape(f"{MOCK_BASE}index.html").clean_text)
+
+    def test_directory_urls_use_the_mapping(self) -> None:
+        urls = self.scraper.directory_urls(MOCK_WEB)
+        self.assertIn(f"{MOCK_BASE}01_public_research.html", urls)
+        self.assertEqual(urls, sorted(urls))
+        unmapped = LocalFileScraper().directory_urls(MOCK_WEB)
+        self.assertEqual(unmapped[0], (MOCK_WEB / "01_public_research.html").as_uri())
+
+    def test_unmapped_missing_and_escaping_urls_fail(self) -> None:
+        for url in (
+            "https://example.com/page.html",
+            f"{MOCK_BASE}missing.html",
+            f"{MOCK_BASE}../README.md",
+        ):
+            with self.assertRaises(RuntimeError) as exc:
+                self.scraper.scrape(url)
+            self.assertIn(f"Failed to scrape {url}", str(exc.exception))
+
+    def test_unchanged_file_revalidates_without_reading(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "page.html"
+            path.write_text("<html><body><p>first</p></body></html>", encoding="utf-8")
+            first = self.scraper.scrape(path.as_uri())
+            again = self.scraper.scrape(path.as_uri(), etag=first.etag)
+            path.write_text("<html><body><p>second version</p></body></html>", encoding="utf-8")
+            changed = self.scraper.scrape(path.as_uri(), etag=first.etag)
+
+        self.assertTrue(again.not_modified)
+        self.assertEqual(again.clean_text, "")
+        self.assertFalse(changed.not_modified)
+        self.assertEqual(changed.clean_text, "second version")
+
+    def test_agent_tools_ingest_with_local_backend(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(
+                lattice=Lattice(["Public", "Internal", "Confidential", "Secret"]),
+                storage_path=str(Path(tmpdir) / "store.json"),
+                scraper_backend="local",
+                local_url_map={MOCK_BASE: str(MOCK_WEB)},
+                scrape_concurrency=4,
+            )
+            urls = self.scraper.directory_urls(MOCK_WEB)
+            with tools:
+                batch = tools.scrape_parse_store_batch(urls)
+
+        self.assertEqual(batch.errors, [])
+        self.assertEqual([item.url for item in batch.stored], urls)
+        self.assertTrue(all(item.fetch_tier == "file" for item in batch.stored))
+
+
+if __name__ == "__main__":
+    unittest.main()
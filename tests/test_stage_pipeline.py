@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.parser import TrustParser
+from ifc_agent.pipeline import Stage, StagePipeline
+from ifc_agent.scraper import ScrapedContent
+from ifc_agent.storage import JSONAssessmentCache
+from ifc_agent.tools import AgentTools
+
+
+class StagePipelineTests(unittest.TestCase):
+    def test_items_flow_in_order_with_batches(self) -> None:
+        batch_sizes: list[int] = []
+
+        def _double(batch: list[int]) -> list[int]:
+            batch_sizes.append(len(batch))
+            return [item * 2 for item in batch]
+
+        pipeline = StagePipeline([Stage("double", _double, batch_size=4), Stage("inc", lambda batch: [i + 1 for i in batch])])
+
+        def _produce(emit) -> None:
+            for item in range(10):
+                emit(item)
+
+        outputs, stats = pipeline.run(_produce, source_name="numbers")
+        self.assertEqual(outputs, [item * 2 + 1 for item in range(10)])
+        self.assertTrue(all(size <= 4 for size in batch_sizes))
+        self.assertEqual(sum(batch_sizes), 10)
+        self.assertEqual(list(stats), ["numbers", "double", "inc"])
+        self.assertEqual(stats["inc"]["items"], 10)
+
+    def test_slow_stage_applies_backpressure(self) -> None:
+        def _slow(batch: list[int]) -> list[int]:
+            time.sleep(0.002)
+            return batch
+
+        pipeline = StagePipeline([Stage("slow", _slow)], queue_size=2)
+        outputs, stats = pipeline.run(lambda emit: [emit(item) for item in range(20)])
+        self.assertEqual(outputs, list(range(20)))
+        # The producer filled the queue and then waited on it, never past the bound.
+        self.assertEqual(stats["slow"]["max_queue_depth"], 2)
+
+    def test_stage_error_stops_the_run(self) -> None:
+        def _fail(batch: list[int]) -> list[int]:
+            if 3 in batch:
+                raise ValueError("bad item")
+            return batch
+
+        emitted: list[int] = []
+
+        def _produce(emit) -> None:
+            for item in range(1000):
+                emit(item)
+                emitted.append(item)
+
+        with self.assertRaisesRegex(ValueError, "bad item"):
+            StagePipeline([Stage("fail", _fail)], queue_size=1).run(_produce)
+        self.assertLess(len(emitted), 1000)
+
+
+class _CountingScraper:
+    def __init__(self) -> None:
+        self.threads: set[str] = set()
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def scrape(self, url: str) -> ScrapedContent:
+        self.threads.add(threading.current_thread().name)
+        page = url.rsplit("/", 1)[-1]
+        return ScrapedContent(
+            url=url,
+            fetched_at="2026-01-01T00:00:00+00:00",
+            raw_html=f"<html><body><p>page {page} text</p></body></html>",
+            clean_text=f"page {page} distinct words {page * 3}",
+        )
+
+
+class PipelinedBatchTests(unittest.TestCase):
+    def test_batch_runs_through_stages_and_keeps_scrape_label(self) -> None:
+        lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(
+                lattice=lattice,
+                storage_path=str(Path(tmpdir) / "store.json"),
+                trusted_domains=["example.com"],
+                pipeline_queue_size=2,
+                parse_batch_size=3,
+                store_batch_size=4,
+            )
+            scraper = tools._scraper = _CountingScraper()
+            urls = [f"https://example.com/{idx}" for idx in range(10)]
+            batch = tools.scrape_parse_store_batch(urls, scrape_label=make_label("Confidential", ["PII"]))
+
+            self.assertEqual([item.url for item in batch.stored], urls)
+            self.assertEqual(batch.errors, [])
+            for item in batch.stored:
+                self.assertTrue(lattice.can_flow(make_label("Confidential", ["PII"]), item.label))
+            # Fetching never leaves the calling thread.
+            self.assertEqual(scraper.threads, {threading.current_thread().name})
+            self.assertEqual(set(batch.stage_stats), {"fetch", "parse", "store"})
+            self.assertEqual(batch.stage_stats["store"]["items"], 10)
+            self.assertLessEqual(batch.stage_stats["parse"]["max_queue_depth"], 2)
+
+            # Without an ETag the pages are fetched again and update the same rows.
+            again = tools.scrape_parse_store_batch(urls, scrape_label=make_label("Confidential", ["PII"]))
+            self.assertEqual([item.document_id for item in again.stored], [item.document_id for item in batch.stored])
+
+    def test_parse_pool_and_cache_flush_span_the_whole_batch(self) -> None:
+        lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(
+                lattice=lattice,
+                storage_path=str(Path(tmpdir) / "store.json"),
+                parse_workers=2,
+                parse_batch_size=2,
+            )
+            tools._scraper = _CountingScraper()
+            pools: list[object] = []
+            original_pool = TrustParser.worker_pool
+
+            def _counting_pool(parser, workers):
+                pools.append(original_pool(parser, workers))
+                return pools[-1]
+
+            with patch.object(TrustParser, "worker_pool", _counting_pool), patch.object(
+                JSONAssessmentCache, "flush", autospec=True
+            ) as flush:
+                with tools:
+                    for round_ in range(2):
+                        urls = [f"https://example.com/{round_}-{idx}" for idx in range(6)]
+                        self.assertEqual(len(tools.scrape_parse_store_batch(urls).stored), 6)
+                    self.assertEqual(flush.call_count, 2)
+                self.assertIsNone(tools._parse_pool)
+        self.assertEqual(len(pools), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
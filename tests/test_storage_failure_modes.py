@@ -16,7 +16,7 @@ from ifc_agent.labels import Lattice, make_label
 from ifc_agent.parser import TrustAssessment, TrustParser
 from ifc_agent.retrieval import Retriever
 from ifc_agent.scraper import ScrapedContent, WebScraper
-from ifc_agent.storage import Document, JSONStorage, StoredTrustAssessment
+from ifc_agent.storage import Document, JSONStorage, StoreItem, StoredTrustAssessment
 
 
 def _content(url: str, text: str, html: str = "<html><body>x</body></html>") -> ScrapedContent:
@@ -100,6 +100,45 @@ class JSONStorageSemanticsTests(unittest.TestCase):
             with self.assertRaises(json.JSONDecodeError):
                 store.load_documents()
 
+    def test_store_documents_saves_once_and_dedups_within_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = JSONStorage(str(Path(tmpdir) / "store.json"))
+            store.store_document(_content("https://example.com/a", "alpha"), _assessment("Public"))
+            items = [
+                StoreItem(_content("https://example.com/a", "alpha v2"), _assessment("Internal")),
+                StoreItem(_content("https://example.com/b", "beta"), _assessment("Public")),
+                StoreItem(_content("https://example.com/c", "beta"), _assessment("Secret")),
+            ]
+            with patch.object(JSONStorage, "_save", autospec=True, side_effect=JSONStorage._save) as save:
+                stored = store.store_documents(items)
+            self.assertEqual(save.call_count, 1)
+
+            self.assertEqual([doc.url for doc, _ in stored], ["https://example.com/a", "https://example.com/b", "https://example.com/c"])
+            # The third item shares the second one's content, so it updates that row.
+            self.assertEqual(stored[1][0].id, stored[2][0].id)
+            self.assertEqual(stored[2][1].label.level, "Secret")
+            payload = json.loads((Path(tmpdir) / "store.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(payload["documents"]), 2)
+            self.assertEqual(len(payload["trust_assessments"]), 2)
+
+    def test_deferred_batches_keep_lookups_and_domain_index_current(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "store.json"
+            store = JSONStorage(str(path))
+            with store.deferred_save():
+                (first, _), = store.store_documents([StoreItem(_content("https://a.example/1", "one"), _assessment("Public"))])
+                (second, _), = store.store_documents([StoreItem(_content("https://a.example/2", "two"), _assessment("Public"))])
+                # The same content from another host moves the row between hosts.
+                (moved, _), = store.store_documents([StoreItem(_content("https://b.example/1", "one"), _assessment("Public"))])
+                self.assertEqual(moved.id, first.id)
+                self.assertEqual(store.load_domain_index(), {"a.example": [second.id], "b.example": [first.id]})
+                (updated, _), = store.store_documents([StoreItem(_content("https://a.example/2", "two v2"), _assessment("Internal"))])
+                self.assertEqual(updated.id, second.id)
+
+            reloaded = JSONStorage(str(path))
+            self.assertEqual([doc.url for doc in reloaded.load_documents()], ["https://b.example/1", "https://a.example/2"])
+            self.assertEqual(reloaded.load_domain_index(), {"a.example": [second.id], "b.example": [first.id]})
+
 
 class FailureModeTests(unittest.TestCase):
     def test_parser_empty_content_maps_to_confidential_untrusted(self) -> None:
@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys
 import tempfile
 import unittest
+from dataclasses import replace
+from datetime import datetime, timezone
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -48,6 +50,105 @@ class AgentToolsTests(unittest.TestCase):
             retrieved = tools.retrieve_by_query("alpha", label_cap=make_label("Internal"))
             self.assertEqual(len(retrieved.documents), 0)
 
+    def test_main_content_only_stores_article_text(self) -> None:
+        class _ChromeScraper:
+            def scrape(self, url: str) -> ScrapedContent:
+                html = (
+                    "<html><body><nav><a href='/'>Home</a> <a href='/x'>Login</a></nav>"
+                    "<p>alpha beta gamma article text</p><footer>footer links</footer></body></html>"
+                )
+                text = "Home Login\nalpha beta gamma article text\nfooter links"
+                return ScrapedContent(url=url, fetched_at="2026-01-01T00:00:00+00:00", raw_html=html, clean_text=text)
+
+        lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(
+                lattice=lattice,
+                storage_path=str(Path(tmpdir) / "store.json"),
+                main_content_only=True,
+            )
+            tools._scraper = _ChromeScraper()
+            stored = tools.scrape_parse_store(["https://example.com/a"])
+            docs = tools._storage.load_documents()
+
+        self.assertEqual(docs[0].clean_text, "alpha beta gamma article text")
+        self.assertGreater(stored[0].signals["main_content_removed_ratio"], 0.0)
+
+    def test_batch_stores_successes_and_reports_failed_urls(self) -> None:
+        class _FlakyScraper(_FakeScraper):
+            def scrape(self, url: str) -> ScrapedContent:
+                if url.endswith("/down"):
+                    raise RuntimeError(f"Failed to scrape {url}: timeout")
+                return replace(super().scrape(url), clean_text=f"alpha {url.rsplit('/', 1)[-1]}")
+
+        lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tools = AgentTools(lattice=lattice, storage_path=str(Path(tmpdir) / "store.json"))
+            tools._scraper = _FlakyScraper()
+            urls = ["https://example.com/a", "https://example.com/down", "https://example.com/b"]
+            batch = tools.scrape_parse_store_batch(urls)
+            with self.assertRaises(RuntimeError):
+                tools.scrape_parse_store(urls)
+
+        self.assertEqual([item.url for item in batch.stored], ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual([item.url for item in batch.errors], ["https://example.com/down"])
+        self.assertIn("timeout", batch.errors[0].error)
+
+
+class _ValidatingScraper:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str | None]] = []
+
+    def scrape(self, url: str, etag: str | None = None, last_modified: str | None = None) -> ScrapedContent:
+        self.calls.append((url, etag))
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        if etag == '"v1"':
+            return ScrapedContent(url, fetched_at, "", "", etag=etag, not_modified=True)
+        text = f"alpha {url.rsplit('/', 1)[-1]} by author"
+        return ScrapedContent(url, fetched_at, "<html></html>", text, etag='"v1"')
+
+
+class FreshnessTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.store_path = Path(tmpdir.name) / "store.json"
+
+    def _tools(self, **kwargs) -> tuple[AgentTools, _ValidatingScraper]:
+        tools = AgentTools(lattice=self.lattice, storage_path=str(self.store_path), **kwargs)
+        tools._scraper = _ValidatingScraper()
+        return tools, tools._scraper
+
+    def test_not_modified_reuses_row_without_rewriting_store(self) -> None:
+        tools, scraper = self._tools()
+        first = tools.scrape_parse_store(["https://example.com/a"])
+        before = self.store_path.read_bytes()
+        second = tools.scrape_parse_store(["https://example.com/a"])
+
+        self.assertEqual(scraper.calls, [("https://example.com/a", None), ("https://example.com/a", '"v1"')])
+        self.assertEqual(second[0].fetch_tier, "not_modified")
+        self.assertEqual((second[0].document_id, second[0].label), (first[0].document_id, first[0].label))
+        self.assertEqual(self.store_path.read_bytes(), before)
+
+    def test_ttl_skips_fetch_per_domain(self) -> None:
+        tools, scraper = self._tools(freshness_ttl_by_domain={"example.com": 3600})
+        urls = ["https://news.example.com/a", "https://other.example/b"]
+        tools.scrape_parse_store(urls)
+        scraper.calls.clear()
+        results = tools.scrape_parse_store(urls)
+
+        self.assertEqual([item.fetch_tier for item in results], ["fresh", "not_modified"])
+        self.assertEqual(scraper.calls, [("https://other.example/b", '"v1"')])
+
+    def test_higher_scrape_label_is_not_served_from_reuse(self) -> None:
+        tools, scraper = self._tools(freshness_ttl_seconds=3600)
+        tools.scrape_parse_store(["https://example.com/a"], scrape_label=make_label("Public"))
+        results = tools.scrape_parse_store(["https://example.com/a"], scrape_label=make_label("Secret"))
+
+        self.assertEqual(scraper.calls, [("https://example.com/a", None), ("https://example.com/a", None)])
+        self.assertEqual(results[0].label.level, "Secret")
+
 
 if __name__ == "__main__":
     unittest.main()
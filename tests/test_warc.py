@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ifc_agent.labels import Lattice, make_label
+from ifc_agent.storage import JSONStorage
+from ifc_agent.tools import AgentTools
+from ifc_agent.warc import WarcReader, iter_records
+
+
+def _record(warc_type: str, uri: str, block: bytes, content_type: str = "application/http; msgtype=response") -> bytes:
+    headers = (
+        "WARC/1.1\r\n"
+        f"WARC-Type: {warc_type}\r\n"
+        f"WARC-Target-URI: {uri}\r\n"
+        "WARC-Date: 2024-03-01T12:00:00Z\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(block)}\r\n"
+        "\r\n"
+    )
+    return headers.encode("latin-1") + block + b"\r\n\r\n"
+
+
+def _response(body: bytes, status: str = "200 OK", headers: str = "Content-Type: text/html; charset=utf-8") -> bytes:
+    return f"HTTP/1.1 {status}\r\n{headers}\r\n\r\n".encode("latin-1") + body
+
+
+def _chunked(body: bytes, size: int = 7) -> bytes:
+    parts = [b"%x\r\n%s\r\n" % (len(body[i : i + size]), body[i : i + size]) for i in range(0, len(body), size)]
+    return b"".join(parts) + b"0\r\n\r\n"
+
+
+class WarcReaderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.tmpdir = Path(self._tmpdir.name)
+        html = "<html><body><p>café archive page</p></body></html>".encode("utf-8")
+        self.records = [
+            _record("warcinfo", "", b"software: test\r\n", content_type="application/warc-fields"),
+            _record("request", "https://a.test/", b"GET / HTTP/1.1\r\nHost: a.test\r\n\r\n"),
+            _record("response", "https://a.test/", _response(html, headers='Content-Type: text/html\r\nETag: "v1"')),
+            _record(
+                "response",
+                "https://a.test/zipped",
+                _response(
+                    _chunked(gzip.compress(b"<p>zipped and chunked</p>")),
+                    headers="Content-Type: text/html\r\nContent-Encoding: gzip\r\nTransfer-Encoding: chunked",
+                ),
+            ),
+            _record("response", "https://a.test/missing", _response(b"<p>nope</p>", status="404 Not Found")),
+            _record("response", "https://a.test/logo.png", _response(b"\x89PNG", headers="Content-Type: image/png")),
+            _record("response", "https://a.test/broken", b"not an http response\r\n"),
+        ]
+
+    def test_plain_and_multi_member_gzip_files(self) -> None:
+        plain = self.tmpdir / "crawl.warc"
+        plain.write_bytes(b"".join(self.records))
+        zipped = self.tmpdir / "crawl.warc.gz"
+        zipped.write_bytes(b"".join(gzip.compress(record) for record in self.records))
+
+        for path in (plain, zipped):
+            reader = WarcReader(path)
+            pages = list(reader.pages())
+            self.assertEqual([page.url for page in pages], ["https://a.test/", "https://a.test/zipped"])
+            self.assertEqual(pages[0].clean_text, "café archive page")
+            self.assertEqual(pages[0].etag, '"v1"')
+            self.assertEqual(pages[0].fetched_at, "2024-03-01T12:00:00+00:00")
+            self.assertEqual(pages[0].fetch_tier, "warc")
+            self.assertEqual(pages[1].clean_text, "zipped and chunked")
+            self.assertEqual(reader.records, 7)
+            self.assertEqual(
+                reader.skipped,
+                {"warcinfo": 1, "request": 1, "status_404": 1, "not_html": 1, "malformed": 1},
+            )
+
+    def test_unread_blocks_are_skipped(self) -> None:
+        stream = io.BytesIO(b"".join(self.records))
+        uris = [record.target_uri for record in iter_records(stream)]
+        self.assertEqual(len(uris), 7)
+        with self.assertRaises(ValueError):
+            list(iter_records(io.BytesIO(b"HTTP/1.1 200 OK\r\n")))
+
+    def test_page_cap_truncates(self) -> None:
+        path = self.tmpdir / "big.warc"
+        body = b"<p>" + b"word " * 2000 + b"</p>"
+        path.write_bytes(_record("response", "https://a.test/big", _response(body)) + self.records[2])
+        pages = list(WarcReader(path, max_page_bytes=100).pages())
+        self.assertEqual(len(pages), 2)
+        self.assertLessEqual(len(pages[0].raw_html), 100)
+
+    def test_compressed_body_inflates_only_up_to_the_cap(self) -> None:
+        path = self.tmpdir / "bomb.warc"
+        bomb = gzip.compress(b"<p>" + b"a" * (64 << 20) + b"</p>")
+        headers = "Content-Type: text/html\r\nContent-Encoding: gzip"
+        path.write_bytes(_record("response", "https://a.test/bomb", _response(bomb, headers=headers)))
+        tracemalloc.start()
+        try:
+            pages = list(WarcReader(path, max_page_bytes=1000).pages())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(pages), 1)
+        self.assertLessEqual(len(pages[0].raw_html), 1000)
+        self.assertLess(peak, 8 << 20)
+
+
+class IngestPagesTests(unittest.TestCase):
+    def test_warc_pages_are_stored_with_scrape_label(self) -> None:
+        lattice = Lattice(["Public", "Internal", "Confidential", "Secret"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "crawl.warc.gz"
+            records = [
+                _record("response", f"https://a.test/{idx}", _response(f"<p>archived page number {idx}</p>".encode()))
+                for idx in range(25)
+            ]
+            path.write_bytes(b"".join(gzip.compress(record) for record in records))
+            store_path = Path(tmpdir) / "store.json"
+            tools = AgentTools(
+                lattice=lattice,
+                storage_path=str(store_path),
+                trusted_domains=["a.test"],
+                store_batch_size=10,
+            )
+            label = make_label("Confidential", ["Archive"])
+            with patch("ifc_agent.storage.json.dump", wraps=json.dump) as dump:
+                report = tools.ingest_pages(WarcReader(path).pages(), scrape_label=label)
+
+            # Three store batches, one write of the store file.
+            self.assertEqual(sum("documents" in call.args[0] for call in dump.call_args_list), 1)
+            self.assertEqual(len(tools._fetch_cache), 0)
+            self.assertEqual(report.stored, 25)
+            self.assertEqual(report.stage_stats["read"]["items"], 25)
+            trust = JSONStorage(str(store_path)).load_trust_assessments()
+            self.assertEqual(len(trust), 25)
+            for row in trust:
+                self.assertTrue(lattice.can_flow(label, row.label))
+            with self.assertRaises(ValueError):
+                tools.ingest_pages([], scrape_label=make_label("TopSecret"))
+
+
+if __name__ == "__main__":
+    unittest.main()